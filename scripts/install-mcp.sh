@@ -94,7 +94,7 @@ if [[ ! -d ".venv" ]]; then
 fi
 
 # Install base dependencies
-uv pip install flask litellm
+uv pip install flask litellm python-dotenv
 
 # Install semantic search dependencies if requested
 if [[ "$INSTALL_SEMANTIC" == "true" ]]; then
@@ -6,16 +6,32 @@ partial content is preserved and returned via ``LlmTimeoutError.partial_content`
 so no work is lost when Anthropic hangs up on us.
 """
 
+import atexit
+import contextlib
+import copy
+import functools
+import hashlib
+import importlib.util
+import json
 import logging
 import os
+import threading
 import time
 import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Iterator
 
+import httpx
 import litellm
 from litellm import completion
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is the fallback
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # Maximum seconds to wait for a single LLM completion before giving up.
@@ -40,6 +56,52 @@ SCRATCH_DIR = Path.home() / ".ludolph" / "scratch"
 # Delete scratch files older than this many hours.
 SCRATCH_RETENTION_HOURS = 48
 
+# Exact-match response cache for chat(). Only requests that opt in
+# with temperature=0 are cached: at the provider's default sampling the
+# same question can rightly get a different answer. Identical
+# (model, messages, tools) requests are then served from memory instead of
+# round-tripping to the provider.
+LLM_CACHE_TTL = 7 * 24 * 3600
+LLM_CACHE_MAX_ENTRIES = 256
+
+# Mark the stable system prompt and tool definitions as cacheable for
+# Anthropic models so repeated requests reuse the cached prefix instead of
+# paying full input-token cost for it every turn.
+LLM_PROMPT_CACHE = True
+ANTHROPIC_MODEL_PREFIXES = ("claude", "anthropic/")
+_CACHE_CONTROL = {"type": "ephemeral"}
+
+# Connection pool limits for the shared provider client. Keep-alive
+# connections are reused across /chat requests so warm calls skip the
+# TCP+TLS handshake entirely.
+HTTP_POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=100,
+    keepalive_expiry=30.0,
+)
+HTTP_POOL_TIMEOUT = httpx.Timeout(LLM_REQUEST_TIMEOUT, connect=10.0)
+
+# HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 without it.
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_HTTP_CLIENT = httpx.Client(
+    limits=HTTP_POOL_LIMITS, timeout=HTTP_POOL_TIMEOUT, http2=_HTTP2_AVAILABLE
+)
+
+# LiteLLM hands this session to the providers it drives through the OpenAI
+# SDK (OpenAI, Azure OpenAI and OpenAI-compatible endpoints such as vLLM or
+# LM Studio). Anthropic and other native handlers keep their own clients.
+litellm.client_session = _HTTP_CLIENT
+
+
+def _close_http_client() -> None:
+    """Close the shared HTTP client on interpreter shutdown."""
+    with contextlib.suppress(Exception):
+        _HTTP_CLIENT.close()
+
+
+atexit.register(_close_http_client)
+
 
 class LlmError(Exception):
     """Base class for LLM errors."""
@@ -97,6 +159,18 @@ class LlmApiError(LlmError):
         self.scratch_path = scratch_path
 
 
+@dataclass(slots=True)
+class StreamDelta:
+    """One chunk yielded by ``chat_stream()``.
+
+    Slotted to keep per-token allocations small; orjson serializes it
+    natively, so SSE framing needs no intermediate dict.
+    """
+
+    content: str | None
+    tool_calls: list | None = None
+
+
 def _ensure_scratch_dir() -> Path:
     """Create the scratch directory if missing and prune old files."""
     SCRATCH_DIR.mkdir(parents=True, exist_ok=True)
@@ -122,6 +196,99 @@ def _new_scratch_path() -> Path:
     return SCRATCH_DIR / f"chat-{int(time.time())}-{uuid.uuid4().hex[:8]}.txt"
 
 
+class _StreamCollector:
+    """Accumulate streamed chunks into content, tool calls, and usage.
+
+    Reassembles tool-call deltas, captures usage, and detects stalls.
+    Text is written to the scratch file as it arrives.
+    """
+
+    def __init__(self, model: str, scratch_file):
+        self.model = model
+        self.scratch_file = scratch_file
+        self.content_parts: list[str] = []
+        self.tool_calls_by_index: dict[int, dict[str, Any]] = {}
+        self.usage: dict[str, Any] = {}
+        self.last_chunk_time = time.time()
+
+    def feed(self, chunk: Any) -> None:
+        """Process a single streamed chunk."""
+        # Stall detection: if too long passes between chunks, treat as timeout
+        now = time.time()
+        if now - self.last_chunk_time > LLM_STREAM_STALL_TIMEOUT:
+            raise litellm.Timeout(
+                message=f"No chunks received for {LLM_STREAM_STALL_TIMEOUT}s",
+                model=self.model,
+                llm_provider="anthropic",
+            )
+        self.last_chunk_time = now
+
+        # Capture usage from the final chunk when LiteLLM surfaces it
+        chunk_usage = getattr(chunk, "usage", None)
+        if chunk_usage is not None:
+            try:
+                self.usage = dict(chunk_usage) if hasattr(chunk_usage, "_asdict") else {
+                    "prompt_tokens": getattr(chunk_usage, "prompt_tokens", 0),
+                    "completion_tokens": getattr(chunk_usage, "completion_tokens", 0),
+                    "total_tokens": getattr(chunk_usage, "total_tokens", 0),
+                }
+            except Exception:  # noqa: BLE001
+                self.usage = {}
+
+        if not chunk.choices:
+            return
+
+        delta = chunk.choices[0].delta
+
+        # Text content chunk. flush() after every chunk so the scratch
+        # file is usable if the process dies.
+        if delta.content:
+            self.content_parts.append(delta.content)
+            self.scratch_file.write(delta.content)
+            self.scratch_file.flush()
+
+        # Tool call deltas — these arrive incrementally and must be
+        # reassembled per index
+        delta_tool_calls = getattr(delta, "tool_calls", None) or []
+        for tc_delta in delta_tool_calls:
+            index = getattr(tc_delta, "index", 0) or 0
+            existing = self.tool_calls_by_index.setdefault(
+                index,
+                {
+                    "id": None,
+                    "type": "function",
+                    "function": {"name": "", "arguments": ""},
+                },
+            )
+            if getattr(tc_delta, "id", None):
+                existing["id"] = tc_delta.id
+            fn_delta = getattr(tc_delta, "function", None)
+            if fn_delta is not None:
+                if getattr(fn_delta, "name", None):
+                    existing["function"]["name"] = fn_delta.name
+                if getattr(fn_delta, "arguments", None):
+                    existing["function"]["arguments"] += fn_delta.arguments
+
+    def result(self) -> dict[str, Any]:
+        """Return the assembled result dict."""
+        content = "".join(self.content_parts) if self.content_parts else None
+        tool_calls = (
+            [self.tool_calls_by_index[i] for i in sorted(self.tool_calls_by_index.keys())]
+            if self.tool_calls_by_index
+            else None
+        )
+        return {"content": content, "tool_calls": tool_calls, "usage": self.usage}
+
+
+def _streaming_kwargs(kwargs: dict[str, Any]) -> dict[str, Any]:
+    """Copy completion kwargs with streaming and usage reporting enabled."""
+    stream_kwargs = dict(kwargs)
+    stream_kwargs["stream"] = True
+    # Ask LiteLLM for usage in the stream final chunk (OpenAI-compatible option)
+    stream_kwargs["stream_options"] = {"include_usage": True}
+    return stream_kwargs
+
+
 def _stream_to_scratch(
     kwargs: dict[str, Any],
     scratch_path: Path,
@@ -132,98 +299,237 @@ def _stream_to_scratch(
     LlmTimeoutError with partial_content populated if the stream stalls
     or the overall timeout fires.
     """
-    content_parts: list[str] = []
-    tool_calls_by_index: dict[int, dict[str, Any]] = {}
-    usage: dict[str, Any] = {}
+    scratch_file = scratch_path.open("w", encoding="utf-8")
+    collector = _StreamCollector(kwargs["model"], scratch_file)
 
-    # Open scratch file and stream tokens into it as they arrive.
-    # flush() after every chunk so the file is usable if the process dies.
-    stream_kwargs = dict(kwargs)
-    stream_kwargs["stream"] = True
-    # Ask LiteLLM for usage in the stream final chunk (OpenAI-compatible option)
-    stream_kwargs["stream_options"] = {"include_usage": True}
+    try:
+        response = completion(**_streaming_kwargs(kwargs))
+        for chunk in response:
+            collector.feed(chunk)
+        return collector.result()
+    finally:
+        with contextlib.suppress(Exception):
+            scratch_file.close()
 
-    scratch_file = scratch_path.open("w", encoding="utf-8")
-    last_chunk_time = time.time()
 
+# LiteLLM exceptions that chat() translates into LlmError subclasses.
+_LITELLM_ERRORS = (
+    litellm.AuthenticationError,
+    litellm.BudgetExceededError,
+    litellm.RateLimitError,
+    litellm.BadRequestError,
+    litellm.Timeout,
+    litellm.APIConnectionError,
+    litellm.APIError,
+)
+
+
+def _build_chat_kwargs(
+    model: str,
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+    temperature: float | None = None,
+) -> dict[str, Any]:
+    """Validate credentials and build the completion kwargs for a chat call."""
+    api_key = os.environ.get("ANTHROPIC_API_KEY", "")
+    if not api_key:
+        raise LlmKeyMissingError("ANTHROPIC_API_KEY not set. Run `lu setup mcp` to configure.")
+
+    if LLM_PROMPT_CACHE and model.startswith(ANTHROPIC_MODEL_PREFIXES):
+        messages, tools = _mark_cacheable_prefix(messages, tools)
+
+    kwargs: dict[str, Any] = {
+        "model": model,
+        "messages": messages,
+        "timeout": LLM_REQUEST_TIMEOUT,
+    }
+    if tools:
+        kwargs["tools"] = tools
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    if LLM_PROMPT_CACHE and model.startswith(ANTHROPIC_MODEL_PREFIXES):
+        kwargs["extra_headers"] = {"anthropic-beta": "prompt-caching-2024-07-31"}
+    return kwargs
+
+
+def _mark_cacheable_prefix(
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]] | None]:
+    """Add Anthropic cache_control breakpoints to the system prompt and tools.
+
+    The breakpoint goes on the last content block of the first system
+    message and on the last tool definition. Inputs are copied, never
+    mutated, so callers (and the response cache key) see the original.
+    """
+    marked = list(messages)
+    for i, msg in enumerate(marked):
+        if msg.get("role") != "system":
+            continue
+        content = msg.get("content")
+        if isinstance(content, str) and content:
+            blocks = [{"type": "text", "text": content, "cache_control": _CACHE_CONTROL}]
+        elif isinstance(content, list) and content and isinstance(content[-1], dict):
+            blocks = [*content[:-1], {**content[-1], "cache_control": _CACHE_CONTROL}]
+        else:
+            break
+        marked[i] = {**msg, "content": blocks}
+        break
+
+    if tools:
+        tools = [*tools[:-1], {**tools[-1], "cache_control": _CACHE_CONTROL}]
+
+    return marked, tools
+
+
+def _finish_chat(result: dict[str, Any], scratch_path: Path) -> dict[str, Any]:
+    """Remove the scratch file after a successful stream."""
     try:
-        response = completion(**stream_kwargs)
+        scratch_path.unlink(missing_ok=True)
+    except OSError:
+        pass
+    result["scratch_path"] = None
+    return result
 
-        for chunk in response:
-            # Stall detection: if too long passes between chunks, treat as timeout
-            now = time.time()
-            if now - last_chunk_time > LLM_STREAM_STALL_TIMEOUT:
-                raise litellm.Timeout(
-                    message=f"No chunks received for {LLM_STREAM_STALL_TIMEOUT}s",
-                    model=kwargs["model"],
-                    llm_provider="anthropic",
-                )
-            last_chunk_time = now
-
-            # Capture usage from the final chunk when LiteLLM surfaces it
-            chunk_usage = getattr(chunk, "usage", None)
-            if chunk_usage is not None:
-                try:
-                    usage = dict(chunk_usage) if hasattr(chunk_usage, "_asdict") else {
-                        "prompt_tokens": getattr(chunk_usage, "prompt_tokens", 0),
-                        "completion_tokens": getattr(chunk_usage, "completion_tokens", 0),
-                        "total_tokens": getattr(chunk_usage, "total_tokens", 0),
-                    }
-                except Exception:  # noqa: BLE001
-                    usage = {}
-
-            if not chunk.choices:
-                continue
 
-            delta = chunk.choices[0].delta
-
-            # Text content chunk
-            if delta.content:
-                content_parts.append(delta.content)
-                scratch_file.write(delta.content)
-                scratch_file.flush()
-
-            # Tool call deltas — these arrive incrementally and must be
-            # reassembled per index
-            delta_tool_calls = getattr(delta, "tool_calls", None) or []
-            for tc_delta in delta_tool_calls:
-                index = getattr(tc_delta, "index", 0) or 0
-                existing = tool_calls_by_index.setdefault(
-                    index,
-                    {
-                        "id": None,
-                        "type": "function",
-                        "function": {"name": "", "arguments": ""},
-                    },
-                )
-                if getattr(tc_delta, "id", None):
-                    existing["id"] = tc_delta.id
-                fn_delta = getattr(tc_delta, "function", None)
-                if fn_delta is not None:
-                    if getattr(fn_delta, "name", None):
-                        existing["function"]["name"] = fn_delta.name
-                    if getattr(fn_delta, "arguments", None):
-                        existing["function"]["arguments"] += fn_delta.arguments
-
-        content = "".join(content_parts) if content_parts else None
-        tool_calls = (
-            [tool_calls_by_index[i] for i in sorted(tool_calls_by_index.keys())]
-            if tool_calls_by_index
-            else None
+def _classify_failure(error: Exception, scratch_path: Path, attempt: int) -> LlmError | None:
+    """Translate a LiteLLM exception from one chat attempt.
+
+    Returns the LlmError to raise, or None when the attempt should be
+    retried. Auth/budget/rate-limit errors are never retried — they won't
+    succeed on retry. Timeouts and connection errors are retried only if
+    no content was captured yet; partial output is worth preserving rather
+    than starting over.
+    """
+    if isinstance(error, litellm.AuthenticationError):
+        return LlmAuthError(str(error))
+    if isinstance(error, litellm.BudgetExceededError):
+        return LlmBudgetError(str(error))
+    if isinstance(error, litellm.RateLimitError):
+        return LlmRateLimitError(str(error))
+    if isinstance(error, litellm.BadRequestError):
+        return LlmApiError(f"Invalid request: {error}")
+
+    partial = _read_scratch(scratch_path)
+    retryable = attempt < LLM_MAX_RETRIES and not partial
+    kept_path = str(scratch_path) if partial else None
+
+    if isinstance(error, litellm.Timeout):
+        logger.warning(
+            "LLM stream timed out (attempt %d/%d, captured %d chars)",
+            attempt + 1, LLM_MAX_RETRIES + 1, len(partial),
+        )
+        if retryable:
+            return None
+        return LlmTimeoutError(
+            f"LLM stream stalled after {LLM_REQUEST_TIMEOUT}s. "
+            f"{'Partial content was recovered.' if partial else 'No content was generated.'}",
+            partial_content=partial,
+            scratch_path=kept_path,
+        )
+    if isinstance(error, litellm.APIConnectionError):
+        logger.warning(
+            "LLM connection error (attempt %d/%d): %s",
+            attempt + 1, LLM_MAX_RETRIES + 1, error,
         )
+        if retryable:
+            return None
+        return LlmApiError(
+            f"Connection error: {error}",
+            partial_content=partial,
+            scratch_path=kept_path,
+        )
+    return LlmApiError(str(error), partial_content=partial, scratch_path=kept_path)
 
-        return {"content": content, "tool_calls": tool_calls, "usage": usage}
-    finally:
-        try:
-            scratch_file.close()
-        except Exception:  # noqa: BLE001
-            pass
+
+_response_cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def _cache_key(model: str, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None) -> str:
+    """Hash a chat request into a stable cache key."""
+    payload = (model, messages, tools)
+    if orjson is not None:
+        encoded = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS, default=str)
+    else:
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _cache_get(key: str, ttl: float) -> dict[str, Any] | None:
+    """
+    Return a copy of a cached response if present and not expired.
+
+    No tokens were spent on it, so its usage is zeroed and it's flagged
+    with "cached": True.
+    """
+    with _response_cache_lock:
+        entry = _response_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.time() - stored_at > ttl:
+            del _response_cache[key]
+            return None
+        _response_cache.move_to_end(key)
+    hit = copy.deepcopy(result)
+    hit["usage"] = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    hit["cached"] = True
+    return hit
+
+
+def _cache_put(key: str, result: dict[str, Any], max_entries: int) -> None:
+    """Store a copy of a response, evicting the least recently used entries."""
+    # Deep, so a caller editing its result (e.g. its tool_calls list)
+    # can't change what later hits get
+    stored = copy.deepcopy(result)
+    with _response_cache_lock:
+        _response_cache[key] = (time.time(), stored)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > max_entries:
+            _response_cache.popitem(last=False)
+
+
+def clear_response_cache() -> None:
+    """Drop all cached chat responses."""
+    with _response_cache_lock:
+        _response_cache.clear()
+
+
+def cached_llm(ttl: float = LLM_CACHE_TTL, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+    """
+    Cache successful chat responses keyed on (model, messages, tools).
+
+    Caching is opt-in: only calls passing temperature=0 are looked up or
+    stored, so the default sampling always reaches the provider. Errors
+    are never cached.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(model, messages, tools=None, *, temperature=None):
+            if temperature != 0:
+                return func(model, messages, tools, temperature=temperature)
+            key = _cache_key(model, messages, tools)
+            cached = _cache_get(key, ttl)
+            if cached is not None:
+                return cached
+            result = func(model, messages, tools, temperature=temperature)
+            _cache_put(key, result, max_entries)
+            return result
+
+        return wrapper
+
+    return decorator
 
 
+@cached_llm()
 def chat(
     model: str,
     messages: list[dict[str, Any]],
     tools: list[dict[str, Any]] | None = None,
+    *,
+    temperature: float | None = None,
 ) -> dict[str, Any]:
     """
     Send a chat request to an LLM provider via LiteLLM.
@@ -235,6 +541,8 @@ def chat(
         model: Model identifier (e.g., "claude-sonnet-4", "gpt-4o", "ollama/llama3")
         messages: List of message dicts with "role" and "content"
         tools: Optional list of tool definitions
+        temperature: Sampling temperature (default: the provider's). With
+            0, identical requests are answered from the response cache
 
     Returns:
         Dict with "content", "tool_calls", "usage", and "scratch_path" keys.
@@ -250,94 +558,22 @@ def chat(
             whatever was generated before the timeout
         LlmApiError: Other API errors
     """
-    api_key = os.environ.get("ANTHROPIC_API_KEY", "")
-    if not api_key:
-        raise LlmKeyMissingError("ANTHROPIC_API_KEY not set. Run `lu setup mcp` to configure.")
+    kwargs = _build_chat_kwargs(model, messages, tools, temperature)
 
-    kwargs: dict[str, Any] = {
-        "model": model,
-        "messages": messages,
-        "timeout": LLM_REQUEST_TIMEOUT,
-    }
-    if tools:
-        kwargs["tools"] = tools
-
-    # Retry loop for transient failures. Auth/budget/rate-limit errors are
-    # not retried — they won't succeed on retry.
     last_error: Exception | None = None
-    last_partial = ""
-    last_scratch_path: Path | None = None
-
     for attempt in range(LLM_MAX_RETRIES + 1):
         scratch_path = _new_scratch_path()
-        last_scratch_path = scratch_path
-
         try:
-            result = _stream_to_scratch(kwargs, scratch_path)
-            # Success — remove the scratch file to keep the dir clean
-            try:
-                scratch_path.unlink(missing_ok=True)
-            except OSError:
-                pass
-            result["scratch_path"] = None
-            return result
-
-        except litellm.AuthenticationError as e:
-            raise LlmAuthError(str(e)) from e
-        except litellm.BudgetExceededError as e:
-            raise LlmBudgetError(str(e)) from e
-        except litellm.RateLimitError as e:
-            raise LlmRateLimitError(str(e)) from e
-        except litellm.BadRequestError as e:
-            raise LlmApiError(f"Invalid request: {e}") from e
-        except litellm.Timeout as e:
+            return _finish_chat(_stream_to_scratch(kwargs, scratch_path), scratch_path)
+        except _LITELLM_ERRORS as e:
+            error = _classify_failure(e, scratch_path, attempt)
+            if error is not None:
+                raise error from e
             last_error = e
-            last_partial = _read_scratch(scratch_path)
-            logger.warning(
-                "LLM stream timed out (attempt %d/%d, captured %d chars)",
-                attempt + 1, LLM_MAX_RETRIES + 1, len(last_partial),
-            )
-            # Retry only if we haven't captured ANY content. If we already
-            # got partial output, treat it as worth preserving rather than
-            # starting over.
-            if attempt < LLM_MAX_RETRIES and not last_partial:
-                time.sleep(1)
-                continue
-            raise LlmTimeoutError(
-                f"LLM stream stalled after {LLM_REQUEST_TIMEOUT}s. "
-                f"{'Partial content was recovered.' if last_partial else 'No content was generated.'}",
-                partial_content=last_partial,
-                scratch_path=str(scratch_path) if last_partial else None,
-            ) from e
-        except litellm.APIConnectionError as e:
-            last_error = e
-            last_partial = _read_scratch(scratch_path)
-            logger.warning(
-                "LLM connection error (attempt %d/%d): %s",
-                attempt + 1, LLM_MAX_RETRIES + 1, e,
-            )
-            if attempt < LLM_MAX_RETRIES and not last_partial:
-                time.sleep(1)
-                continue
-            raise LlmApiError(
-                f"Connection error: {e}",
-                partial_content=last_partial,
-                scratch_path=str(scratch_path) if last_partial else None,
-            ) from e
-        except litellm.APIError as e:
-            partial = _read_scratch(scratch_path)
-            raise LlmApiError(
-                str(e),
-                partial_content=partial,
-                scratch_path=str(scratch_path) if partial else None,
-            ) from e
+            time.sleep(1)
 
     # Unreachable but keeps type checkers happy
-    raise LlmApiError(
-        f"Exhausted retries: {last_error}",
-        partial_content=last_partial,
-        scratch_path=str(last_scratch_path) if last_partial else None,
-    )
+    raise LlmApiError(f"Exhausted retries: {last_error}")
 
 
 def _read_scratch(path: Path) -> str:
@@ -352,7 +588,7 @@ def chat_stream(
     model: str,
     messages: list[dict[str, Any]],
     tools: list[dict[str, Any]] | None = None,
-) -> Iterator[dict[str, Any]]:
+) -> Iterator[StreamDelta]:
     """
     Stream a chat request, yielding chunks as they arrive.
 
@@ -362,7 +598,7 @@ def chat_stream(
         tools: Optional list of tool definitions
 
     Yields:
-        Dict with "content" and/or "tool_calls" for each chunk
+        StreamDelta with "content" and/or "tool_calls" for each chunk
 
     Raises:
         LlmAuthError: Invalid API key or OAuth token
@@ -383,15 +619,18 @@ def chat_stream(
         response = completion(**kwargs)
 
         for chunk in response:
-            if not chunk.choices:
+            choices = chunk.choices
+            if not choices:
                 continue
 
-            delta = chunk.choices[0].delta
+            delta = choices[0].delta
+            content = delta.content
+
+            # Drop empty keep-alive chunks rather than framing them downstream
+            if content is None and not getattr(delta, "tool_calls", None):
+                continue
 
-            yield {
-                "content": delta.content,
-                "tool_calls": None,
-            }
+            yield StreamDelta(content)
 
     except litellm.AuthenticationError as e:
         raise LlmAuthError(str(e)) from e
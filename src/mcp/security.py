@@ -1,20 +1,80 @@
 """Security utilities for path validation and authentication."""
 
-from functools import wraps
+import hmac
+import inspect
+import os
+import subprocess
+import threading
+from functools import lru_cache, wraps
 from pathlib import Path
+from typing import Any
 
 from flask import jsonify, request
 
+try:
+    import pygit2
+except ImportError:  # Optional speedup; pathspec or `git check-ignore` is the fallback
+    pygit2 = None
+
+try:
+    import pathspec
+except ImportError:  # Optional speedup; falls back to `git check-ignore`
+    pathspec = None
+
 # Global vault path - set by server initialization
 _VAULT_PATH: Path | None = None
 _AUTH_TOKEN: str = ""
+# Expected Authorization header, precomputed so requests don't format it
+_AUTH_PREFIXED: bytes = b"Bearer "
+# Vault path plus separator, for cheap lexical containment checks
+_VAULT_PREFIX: str = ""
+
+# Compiled ignore-file matchers as (base_dir, PathSpec) pairs, lowest
+# precedence first, plus the mtime of each source file so edits trigger a
+# rebuild. None = not loaded.
+_GITIGNORE_SPECS: list[tuple[Path, Any]] | None = None
+_GITIGNORE_MTIMES: dict[Path, float] = {}
+
+# Max distinct vault-relative paths whose lexical check safe_path() memoizes
+PATH_CACHE_SIZE = 1024
+
+# Whether the vault sits inside a git repo, computed once per init/reload
+_IS_GIT_REPO: bool = False
+
+# libgit2 handle for the enclosing repo and its resolved workdir, when
+# pygit2 is installed. Repository objects aren't safe to share across
+# threads, so lookups hold _GIT_REPO_LOCK.
+_GIT_REPO: Any = None
+_GIT_WORKDIR: Path | None = None
+_GIT_REPO_LOCK = threading.Lock()
 
 
 def init_security(vault_path: Path, auth_token: str) -> None:
     """Initialize security module with vault path and auth token."""
-    global _VAULT_PATH, _AUTH_TOKEN
+    global _VAULT_PATH, _AUTH_TOKEN, _AUTH_PREFIXED, _VAULT_PREFIX
     _VAULT_PATH = vault_path.resolve()
+    _VAULT_PREFIX = os.path.join(str(_VAULT_PATH), "")
     _AUTH_TOKEN = auth_token
+    _AUTH_PREFIXED = f"Bearer {auth_token}".encode()
+    refresh_vault_state()
+
+
+def refresh_vault_state() -> None:
+    """Recompute cached facts about the vault (git repo, .gitignore rules)."""
+    global _IS_GIT_REPO, _GIT_REPO, _GIT_WORKDIR
+    vault = get_vault_path()
+    _IS_GIT_REPO = (vault / ".git").is_dir() or any((p / ".git").is_dir() for p in vault.parents)
+    _reset_gitignore_cache()
+
+    _GIT_REPO, _GIT_WORKDIR = None, None
+    if pygit2 is not None and _IS_GIT_REPO:
+        try:
+            repo_path = pygit2.discover_repository(str(vault))
+            repo = pygit2.Repository(repo_path) if repo_path else None
+        except (pygit2.GitError, OSError):
+            repo = None
+        if repo is not None and repo.workdir:
+            _GIT_REPO, _GIT_WORKDIR = repo, Path(repo.workdir).resolve()
 
 
 def get_vault_path() -> Path:
@@ -44,8 +104,15 @@ def safe_path(relative: str) -> Path | None:
     if not relative or relative == ".":
         return vault
 
-    # Resolve and verify containment
-    full = (vault / relative).resolve()
+    # Lexical check first so paths clearly outside the vault cost no syscalls
+    candidate = _lexical_candidate(vault, relative)
+    if candidate is None:
+        return None
+
+    # Resolve and verify containment; a symlink inside the vault can still
+    # point outside it, which only resolve() catches. Not memoized: users,
+    # git checkouts and sync clients can add such a symlink at any time
+    full = Path(candidate).resolve()
 
     try:
         full.relative_to(vault)
@@ -54,27 +121,205 @@ def safe_path(relative: str) -> Path | None:
         return None
 
 
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def _lexical_candidate(vault: Path, relative: str) -> str | None:
+    """Normalize relative under vault, or None if it lexically leaves the vault.
+
+    Pure string work, so unlike resolve() it's safe to memoize: nothing on
+    disk can change the answer. _VAULT_PREFIX always belongs to vault.
+    """
+    candidate = os.path.normpath(os.path.join(vault, relative))
+    if candidate != str(vault) and not candidate.startswith(_VAULT_PREFIX):
+        return None
+    return candidate
+
+
+def stat_path(path: Path) -> os.stat_result | None:
+    """
+    stat() a resolved path once, following symlinks as Path.exists() does.
+
+    Handlers check existence and type on the one result instead of calling
+    exists(), is_file() and is_dir(), each of which is its own stat().
+
+    Returns:
+        The stat result, or None if nothing exists at path
+    """
+    try:
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _is_authorized() -> bool:
+    """Check the request's Bearer token against the configured token.
+
+    Uses a constant-time comparison so response timing doesn't leak how
+    much of the token matched. Reads the WSGI environ directly rather than
+    going through Werkzeug's EnvironHeaders wrapper.
+    """
+    auth = request.environ.get("HTTP_AUTHORIZATION", "").encode()
+    return len(auth) == len(_AUTH_PREFIXED) and hmac.compare_digest(auth, _AUTH_PREFIXED)
+
+
 def require_auth(f):
-    """Decorator to require Bearer token authentication."""
+    """Decorator to require Bearer token authentication.
+
+    Works for both sync and async views; async views stay coroutines so
+    Flask awaits them.
+    """
+    if inspect.iscoroutinefunction(f):
+
+        @wraps(f)
+        async def decorated_async(*args, **kwargs):
+            if not _is_authorized():
+                return jsonify({"error": "Unauthorized"}), 401
+            return await f(*args, **kwargs)
+
+        return decorated_async
 
     @wraps(f)
     def decorated(*args, **kwargs):
-        auth = request.headers.get("Authorization", "")
-        if auth != f"Bearer {_AUTH_TOKEN}":
+        if not _is_authorized():
             return jsonify({"error": "Unauthorized"}), 401
         return f(*args, **kwargs)
 
     return decorated
 
 
-def is_git_ignored(path: Path) -> bool:
+def _reset_gitignore_cache() -> None:
+    """Forget compiled .gitignore matchers so they are rebuilt on next use."""
+    global _GITIGNORE_SPECS
+    _GITIGNORE_SPECS = None
+    _GITIGNORE_MTIMES.clear()
+
+
+def _find_git_root(vault: Path) -> Path | None:
+    """Return the vault or nearest parent holding a .git directory, if any."""
+    for candidate in (vault, *vault.parents):
+        if (candidate / ".git").is_dir():
+            return candidate
+    return None
+
+
+def _global_excludes_file() -> Path:
+    """Locate core.excludesFile, or git's default $XDG_CONFIG_HOME/git/ignore."""
+    try:
+        result = subprocess.run(
+            ["git", "config", "--path", "--get", "core.excludesFile"],
+            cwd=get_vault_path(),
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        if result.returncode == 0 and result.stdout.strip():
+            return Path(result.stdout.strip()).expanduser()
+    except (subprocess.SubprocessError, FileNotFoundError):
+        pass
+    config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return Path(config_home) / "git" / "ignore"
+
+
+def _find_ignore_files(vault: Path) -> list[tuple[Path, Path]]:
     """
-    Check if a path is git-ignored.
+    Find the ignore files that apply to the vault, lowest precedence first.
 
-    Returns False if not in a git repo or if git is not available.
+    That is core.excludesFile, then .git/info/exclude (both rooted at the
+    repo root), then each .gitignore from the repo root down to the
+    deepest directory in the vault.
+
+    Returns:
+        List of (base_dir, ignore_file) pairs
+    """
+    git_root = _find_git_root(vault)
+    if git_root is None:
+        return []
+
+    found = [
+        (git_root, _global_excludes_file()),
+        (git_root, git_root / ".git" / "info" / "exclude"),
+    ]
+
+    # Parents contribute patterns when the vault lives inside a larger repo
+    for parent in reversed(vault.parents):
+        if parent.is_relative_to(git_root) and (parent / ".gitignore").is_file():
+            found.append((parent, parent / ".gitignore"))
+
+    # os.walk is top-down, so parent directories come before their children
+    for root, dirs, files in os.walk(vault):
+        dirs[:] = [d for d in dirs if d != ".git"]
+        if ".gitignore" in files:
+            found.append((Path(root), Path(root) / ".gitignore"))
+
+    return found
+
+
+def _load_gitignore() -> list[tuple[Path, Any]] | None:
+    """
+    Compile the vault's ignore files into in-process matchers.
+
+    Matchers are cached and rebuilt when any source file's mtime changes.
+    New .gitignore files are picked up on the next init_security().
+
+    Returns:
+        List of (base_dir, PathSpec) pairs, lowest precedence first, or
+        None if pathspec isn't installed
+    """
+    global _GITIGNORE_SPECS
+    if pathspec is None:
+        return None
+
+    if _GITIGNORE_SPECS is not None:
+        try:
+            stale = any(p.stat().st_mtime != m for p, m in _GITIGNORE_MTIMES.items())
+        except OSError:
+            stale = True
+        if not stale:
+            return _GITIGNORE_SPECS
+
+    specs = []
+    mtimes = {}
+    for base, ignore_file in _find_ignore_files(get_vault_path()):
+        try:
+            lines = ignore_file.read_text(encoding="utf-8", errors="replace").splitlines()
+            mtimes[ignore_file] = ignore_file.stat().st_mtime
+        except OSError:
+            continue
+        specs.append((base, pathspec.GitIgnoreSpec.from_lines(lines)))
+
+    _GITIGNORE_SPECS = specs
+    _GITIGNORE_MTIMES.clear()
+    _GITIGNORE_MTIMES.update(mtimes)
+    return specs
+
+
+def _spec_ignores(specs: list[tuple[Path, Any]], path: Path, is_dir: bool) -> bool | None:
+    """
+    Apply compiled ignore files to one path as git does.
+
+    Each file's last matching pattern decides for that file, and deeper
+    files override shallower ones, so a nested "!keep.log" re-includes what
+    a root "*.log" excluded.
+
+    Returns:
+        True if ignored, False if re-included by a negation, None if no
+        pattern matches
     """
-    import subprocess
+    ignored = None
+    for base, spec in specs:
+        try:
+            rel = path.relative_to(base).as_posix()
+        except ValueError:
+            continue
+        if is_dir:
+            rel += "/"
+        result = spec.check_file(rel).include
+        if result is not None:
+            ignored = result
+    return ignored
 
+
+def _git_check_ignore(path: Path) -> bool:
+    """Ask git whether a path is ignored (slow: one subprocess per call)."""
     try:
         result = subprocess.run(
             ["git", "check-ignore", "-q", str(path)],
@@ -87,7 +332,52 @@ def is_git_ignored(path: Path) -> bool:
         return False
 
 
+def is_git_ignored(path: Path, is_dir: bool | None = None) -> bool:
+    """
+    Check if a path is git-ignored.
+
+    Asks libgit2 in-process when pygit2 is installed, which honours every
+    ignore source git does. Otherwise matches the compiled ignore files
+    (see _find_ignore_files) with pathspec, and falls back to
+    `git check-ignore` when neither is installed or no ignore file exists.
+
+    Args:
+        path: Path to check
+        is_dir: Whether path is a directory, if the caller already stat'd
+            it; looked up otherwise
+
+    Returns False if not in a git repo or if git is not available.
+    """
+    if not is_git_repo():
+        return False
+
+    if _GIT_REPO is not None:
+        try:
+            rel = path.relative_to(_GIT_WORKDIR).as_posix()
+        except ValueError:
+            return False
+        if path.is_dir() if is_dir is None else is_dir:
+            rel += "/"
+        with _GIT_REPO_LOCK:
+            return _GIT_REPO.path_is_ignored(rel)
+
+    specs = _load_gitignore()
+    if specs:
+        if is_dir is None:
+            is_dir = path.is_dir()
+        # git can't re-include a file whose parent directory is excluded.
+        # The first spec has the shallowest base; nothing applies above it.
+        root = specs[0][0]
+        for parent in reversed(path.parents):
+            inside = parent != root and parent.is_relative_to(root)
+            if inside and _spec_ignores(specs, parent, True):
+                return True
+        return bool(_spec_ignores(specs, path, is_dir))
+
+    return _git_check_ignore(path)
+
+
 def is_git_repo() -> bool:
-    """Check if the vault is inside a git repository."""
-    vault = get_vault_path()
-    return (vault / ".git").is_dir() or any((p / ".git").is_dir() for p in vault.parents)
+    """Check if the vault is inside a git repository (cached; see refresh_vault_state)."""
+    get_vault_path()
+    return _IS_GIT_REPO
@@ -12,20 +12,39 @@ Environment Variables:
     VAULT_PATH: Root directory for file operations (required)
     AUTH_TOKEN: Bearer token for authentication (required for security)
     PORT: Server port (default: 8200)
+    MCP_WORKERS: Gunicorn worker processes (default: 1)
+    MCP_THREADS: Threads per worker (default: LLM keep-alive pool size)
 """
 
 import asyncio
+import dataclasses
+import hashlib
 import json
 import logging
 import os
 import signal
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from dotenv import load_dotenv
 from flask import Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is the fallback
+    orjson = None
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # Optional; the Werkzeug dev server is the fallback
+    BaseApplication = None
 
 from llm import (
+    HTTP_POOL_LIMITS,
+    StreamDelta,
     LlmApiError,
     LlmAuthError,
     LlmBudgetError,
@@ -40,13 +59,69 @@ from llm import (
 from process_manager import get_process_manager
 from registry import Registry
 from context import inject_principles
-from security import get_vault_path, init_security, is_git_repo, require_auth
+from security import (
+    get_vault_path,
+    init_security,
+    is_git_repo,
+    refresh_vault_state,
+    require_auth,
+)
 from tools import call_tool, get_tool_definitions, reload_tools
+from tools.files import stream_large_file
 
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    Used for jsonify() and request.get_json() when orjson is installed.
+    Types orjson can't handle natively fall back to Flask's default hook.
+    """
+
+    option = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default, option=self.option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self.option)
+        return self._app.response_class(body, mimetype="application/json")
+
+
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+
+# SSE framing, pre-encoded so each streamed event is a single bytes concat
+SSE_PREFIX = b"data: "
+SSE_SUFFIX = b"\n\n"
+SSE_DONE = SSE_PREFIX + b"[DONE]" + SSE_SUFFIX
+
+
+def _json_default(obj):
+    """Encode dataclasses (e.g. StreamDelta) for the stdlib json fallback."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_bytes(obj) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+def _sse_event(payload) -> bytes:
+    """Encode a payload as a single Server-Sent Events data frame."""
+    return SSE_PREFIX + _json_bytes(payload) + SSE_SUFFIX
+
 # MCP Registry paths
 MCPS_PATH = Path.home() / ".ludolph" / "mcps"
 REGISTRY_PATH = MCPS_PATH / "registry.toml"
@@ -205,26 +280,76 @@ async def _call_external_tool(
 
 
 def _handle_sighup(signum, frame):
-    """Handle SIGHUP to hot-reload custom tools."""
+    """Handle SIGHUP to hot-reload custom tools and cached vault state."""
     reload_tools()
+    invalidate_tools_cache()
+    refresh_vault_state()
+
+
+# Serialized /tools payload and its ETag, rebuilt only after reload_tools()
+_tools_cache: tuple[bytes, str] | None = None
+
+
+def _get_tools_payload() -> tuple[bytes, str]:
+    """Return the encoded tool definitions and ETag, building them once."""
+    global _tools_cache
+    if _tools_cache is None:
+        body = _json_bytes({"tools": get_tool_definitions()})
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        _tools_cache = (body, etag)
+    return _tools_cache
+
+
+# Serialized /status payload; its tool summary only changes on reload too
+_status_cache: bytes | None = None
+
+
+def _get_status_payload() -> bytes:
+    """Return the encoded /status body, building it on first use."""
+    global _status_cache
+    if _status_cache is None:
+        tools_summary = [
+            {"name": t["name"], "description": t.get("description", "")}
+            for t in get_tool_definitions()
+        ]
+        _status_cache = _json_bytes({"status": "ok", "tools": tools_summary, "version": VERSION})
+    return _status_cache
+
+
+def invalidate_tools_cache() -> None:
+    """Drop the cached /tools and /status payloads so the next request re-serializes."""
+    global _tools_cache, _status_cache
+    _tools_cache = None
+    _status_cache = None
+
 
 # Read version from VERSION file (populated during release)
 VERSION_FILE = Path(__file__).parent / "VERSION"
 VERSION = VERSION_FILE.read_text().strip() if VERSION_FILE.exists() else "dev"
 
+# Static / payload, encoded once; health pingers hit it at high rates
+_ROOT_RESPONSE = _json_bytes({"name": "Ludolph MCP Server", "version": VERSION, "status": "running"})
+
+# Encoded /health payload, keyed on the (vault, git_repo) it was built for
+_health_cache: tuple[tuple[str, bool], bytes] | None = None
+
 
 @app.route("/")
 def root():
     """Server info (no auth required)."""
-    return jsonify({"name": "Ludolph MCP Server", "version": VERSION, "status": "running"})
+    return Response(_ROOT_RESPONSE, mimetype="application/json")
 
 
 @app.route("/health")
 @require_auth
 def health():
     """Health check endpoint."""
-    vault = get_vault_path()
-    return jsonify({"status": "ok", "vault": str(vault), "git_repo": is_git_repo()})
+    global _health_cache
+    key = (str(get_vault_path()), is_git_repo())
+    if _health_cache is None or _health_cache[0] != key:
+        vault, git_repo = key
+        _health_cache = (key, _json_bytes({"status": "ok", "vault": vault, "git_repo": git_repo}))
+    return Response(_health_cache[1], mimetype="application/json")
 
 
 @app.route("/events")
@@ -250,7 +375,7 @@ def events():
                     _event_subscribers[subscriber] = []
 
                 for event in events_to_send:
-                    yield f"data: {json.dumps(event)}\n\n"
+                    yield _sse_event(event)
 
                 # Send heartbeat every 30 seconds
                 if time.time() - last_heartbeat >= 30:
@@ -262,7 +387,7 @@ def events():
                         ),
                         "data": {},
                     }
-                    yield f"data: {json.dumps(heartbeat)}\n\n"
+                    yield _sse_event(heartbeat)
                     last_heartbeat = time.time()
 
                 time.sleep(0.5)
@@ -317,16 +442,7 @@ def channel_send():
 @require_auth
 def status():
     """Return server status with simplified tool list."""
-    tool_defs = get_tool_definitions()
-    tools_summary = [
-        {"name": t["name"], "description": t.get("description", "")}
-        for t in tool_defs
-    ]
-    return jsonify({
-        "status": "ok",
-        "tools": tools_summary,
-        "version": VERSION,
-    })
+    return Response(_get_status_payload(), mimetype="application/json")
 
 
 @app.route("/observations/recent")
@@ -376,8 +492,15 @@ def schedule_runs_record():
 @app.route("/tools")
 @require_auth
 def tools():
-    """Return available tool definitions."""
-    return jsonify({"tools": get_tool_definitions()})
+    """Return available tool definitions.
+
+    The payload is serialized once and served with an ETag, so polling
+    clients sending If-None-Match get a 304 until tools are reloaded.
+    """
+    body, etag = _get_tools_payload()
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    return response.make_conditional(request)
 
 
 @app.route("/tools/call", methods=["POST"])
@@ -405,10 +528,76 @@ def tools_call():
         # Use asyncio.run() to bridge sync Flask with async ProcessManager
         result = asyncio.run(_call_external_tool(mcp_name, tool_name, arguments, user_id))
     else:
+        # Large files stream through instead of being read into memory
+        if name == "read_file" and isinstance(arguments, dict):
+            chunks = stream_large_file(arguments)
+            if chunks is not None:
+                return Response(_stream_tool_content(chunks), mimetype="application/json")
+
         # Builtin tool
         result = call_tool(name, arguments)
 
-    return jsonify(result)
+    # Tool results can carry whole file contents; encode straight to bytes
+    return Response(_json_bytes(result), mimetype="application/json")
+
+
+def _stream_tool_content(chunks):
+    """Frame streamed text chunks as a {"content": ..., "error": null} body."""
+    yield b'{"content":"'
+    for chunk in chunks:
+        # Encode as a JSON string and drop the surrounding quotes
+        yield _json_bytes(chunk)[1:-1]
+    yield b'","error":null}'
+
+
+# Builtin tools in a batch run on this pool; they block on file I/O
+TOOL_CALL_TIMEOUT = 60
+_TOOL_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) * 4), thread_name_prefix="tool-call"
+)
+
+
+async def _run_batch_call(call: dict, user_id: int | None) -> dict:
+    """Run one call from a /tools/call_batch request with a timeout."""
+    name = call.get("name", "")
+    arguments = call.get("arguments", {})
+
+    external_parts = parse_external_tool_name(name)
+    if external_parts:
+        mcp_name, tool_name = external_parts
+        pending = _call_external_tool(mcp_name, tool_name, arguments, user_id)
+    else:
+        loop = asyncio.get_running_loop()
+        pending = loop.run_in_executor(_TOOL_EXECUTOR, call_tool, name, arguments)
+
+    try:
+        return await asyncio.wait_for(pending, timeout=TOOL_CALL_TIMEOUT)
+    except TimeoutError:
+        return {"content": "", "error": f"Tool '{name}' timed out after {TOOL_CALL_TIMEOUT}s"}
+
+
+@app.route("/tools/call_batch", methods=["POST"])
+@require_auth
+async def tools_call_batch():
+    """
+    Execute several independent tools concurrently.
+
+    Body: {"calls": [{"name": ..., "arguments": {...}}, ...], "user_id": ...}
+
+    Builtin tools run on a thread pool and external MCP tools are awaited
+    together, so a multi-tool LLM turn costs roughly its slowest call.
+    Calls must not depend on each other; there is no ordering between them.
+    Results come back in request order, each shaped like /tools/call.
+    """
+    data = request.json or {}
+    calls = data.get("calls")
+    user_id = data.get("user_id")
+
+    if not isinstance(calls, list) or not all(isinstance(c, dict) for c in calls):
+        return jsonify({"error": "calls must be a list of {name, arguments} objects"}), 400
+
+    results = await asyncio.gather(*(_run_batch_call(c, user_id) for c in calls))
+    return Response(_json_bytes({"results": results}), mimetype="application/json")
 
 
 def transform_messages_for_openai(messages: list) -> list:
@@ -471,11 +660,18 @@ def transform_messages_for_openai(messages: list) -> list:
 @app.route("/chat", methods=["POST"])
 @require_auth
 def chat():
-    """Proxy chat request to LLM provider via LiteLLM."""
+    """Proxy chat request to LLM provider via LiteLLM.
+
+    A sync view on purpose: llm.chat() reuses the pooled httpx.Client,
+    whereas an async view runs on a new event loop per request, which
+    can't reuse connections pooled on an earlier one.
+    """
     data = request.json or {}
     model = data.get("model", "claude-sonnet-4-20250514")
     messages = data.get("messages", [])
     tools = data.get("tools")
+    # Optional; temperature 0 also opts in to the response cache
+    temperature = data.get("temperature")
 
     # Validate required fields
     if not messages or not isinstance(messages, list):
@@ -491,7 +687,9 @@ def chat():
     )
 
     try:
-        result = llm_chat(model=model, messages=transformed_messages, tools=tools)
+        result = llm_chat(
+            model=model, messages=transformed_messages, tools=tools, temperature=temperature
+        )
         return jsonify(result)
     except LlmKeyMissingError as e:
         return jsonify({"error": "api_key_missing", "message": str(e)}), 401
@@ -520,6 +718,55 @@ def chat():
         return jsonify({"error": "internal_error", "message": str(e)}), 500
 
 
+# Streaming chunks are coalesced until this many characters are buffered
+# or this many seconds pass since the last flush. The first chunk is always
+# sent immediately so time-to-first-token is unaffected.
+STREAM_FLUSH_CHARS = 64
+STREAM_FLUSH_INTERVAL = 0.05
+
+
+def coalesce_stream(chunks):
+    """
+    Merge consecutive content chunks into fewer, larger chunks.
+
+    LiteLLM yields roughly one token per chunk; framing each as its own SSE
+    event multiplies serialization and socket writes. Content is buffered
+    and emitted when the buffer reaches STREAM_FLUSH_CHARS or
+    STREAM_FLUSH_INTERVAL elapses. Chunks carrying tool calls flush the
+    buffer and pass through unchanged.
+    """
+    buf: list[str] = []
+    buf_chars = 0
+    first = True
+    last_flush = time.monotonic()
+
+    for chunk in chunks:
+        if chunk.tool_calls:
+            if buf:
+                yield StreamDelta("".join(buf))
+                buf, buf_chars = [], 0
+            yield chunk
+            last_flush = time.monotonic()
+            continue
+
+        content = chunk.content
+        if not content:
+            continue
+
+        buf.append(content)
+        buf_chars += len(content)
+
+        now = time.monotonic()
+        if first or buf_chars >= STREAM_FLUSH_CHARS or now - last_flush >= STREAM_FLUSH_INTERVAL:
+            yield StreamDelta("".join(buf))
+            buf, buf_chars = [], 0
+            first = False
+            last_flush = now
+
+    if buf:
+        yield StreamDelta("".join(buf))
+
+
 @app.route("/chat/stream", methods=["POST"])
 @require_auth
 def chat_stream():
@@ -534,21 +781,28 @@ def chat_stream():
 
     def generate():
         try:
-            for chunk in llm_chat_stream(model=model, messages=messages, tools=tools):
-                yield f"data: {json.dumps(chunk)}\n\n"
-            yield "data: [DONE]\n\n"
+            stream = llm_chat_stream(model=model, messages=messages, tools=tools)
+            for chunk in coalesce_stream(stream):
+                yield _sse_event(chunk)
+            yield SSE_DONE
         except LlmKeyMissingError as e:
-            yield f"data: {json.dumps({'error': 'api_key_missing', 'message': str(e)})}\n\n"
+            yield _sse_event({"error": "api_key_missing", "message": str(e)})
         except LlmAuthError as e:
-            yield f"data: {json.dumps({'error': 'auth_failed', 'message': str(e)})}\n\n"
+            yield _sse_event({"error": "auth_failed", "message": str(e)})
         except LlmBudgetError as e:
-            yield f"data: {json.dumps({'error': 'budget_exceeded', 'message': str(e)})}\n\n"
+            yield _sse_event({"error": "budget_exceeded", "message": str(e)})
         except LlmRateLimitError as e:
-            yield f"data: {json.dumps({'error': 'rate_limit', 'message': str(e)})}\n\n"
+            yield _sse_event({"error": "rate_limit", "message": str(e)})
         except LlmApiError as e:
-            yield f"data: {json.dumps({'error': 'api_error', 'message': str(e)})}\n\n"
-
-    return Response(generate(), mimetype="text/event-stream")
+            yield _sse_event({"error": "api_error", "message": str(e)})
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        direct_passthrough=True,
+        # Disable reverse-proxy buffering so tokens reach the client immediately
+        headers={"X-Accel-Buffering": "no"},
+    )
 
 
 # -----------------------------------------------------------------------------
@@ -1028,17 +1282,8 @@ def plugin_logs_endpoint(name: str):
 
 
 def _load_env_file():
-    """Load .env file if it exists."""
-    env_file = Path(__file__).parent / ".env"
-    if env_file.exists():
-        for line in env_file.read_text().splitlines():
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, value = line.split("=", 1)
-                key = key.strip()
-                value = value.strip().strip('"').strip("'")
-                if key not in os.environ:  # Don't override existing env vars
-                    os.environ[key] = value
+    """Load .env file if it exists, without overriding existing env vars."""
+    load_dotenv(dotenv_path=Path(__file__).parent / ".env", override=False)
 
 
 def main():
@@ -1077,7 +1322,56 @@ def main():
     print(f"Port: {port}")
     print(f"Git repo: {is_git_repo()}")
 
-    app.run(host="0.0.0.0", port=port)
+    serve(port)
+
+
+# Gunicorn settings. A single worker by default: SSE subscribers, cached
+# tool definitions and spawned MCP processes all live in process memory,
+# so concurrency comes from threads. Threads match the LLM keep-alive pool
+# so concurrent /chat calls don't queue for a connection.
+SERVER_KEEPALIVE = 30
+SERVER_TIMEOUT = 300
+
+
+def _post_fork(server, worker):
+    """Refresh tools and vault state in each new worker.
+
+    Gunicorn handles SIGHUP itself by forking fresh workers, so this is
+    where hot-reloading happens under gunicorn.
+    """
+    _handle_sighup(signal.SIGHUP, None)
+
+
+def serve(port: int) -> None:
+    """Serve the app with gunicorn if installed, else the dev server."""
+    if BaseApplication is None:
+        logger.warning("gunicorn not installed; using the single-process dev server")
+        app.run(host="0.0.0.0", port=port, threaded=True)
+        return
+
+    class StandaloneApplication(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    options = {
+        "bind": f"0.0.0.0:{port}",
+        "workers": int(os.environ.get("MCP_WORKERS", 1)),
+        "threads": int(os.environ.get("MCP_THREADS", HTTP_POOL_LIMITS.max_keepalive_connections)),
+        "worker_class": "gthread",
+        "keepalive": SERVER_KEEPALIVE,
+        "timeout": SERVER_TIMEOUT,
+        "post_fork": _post_fork,
+    }
+    StandaloneApplication(app, options).run()
 
 
 if __name__ == "__main__":
@@ -11,19 +11,14 @@ import subprocess
 import sys
 from pathlib import Path
 
+from dotenv import dotenv_values
+
 ENV_FILE = Path(__file__).parent / ".env"
 
 
 def load_env():
     """Load existing .env file if it exists."""
-    env = {}
-    if ENV_FILE.exists():
-        for line in ENV_FILE.read_text().splitlines():
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, value = line.split("=", 1)
-                env[key.strip()] = value.strip().strip('"').strip("'")
-    return env
+    return {key: value for key, value in dotenv_values(ENV_FILE).items() if value is not None}
 
 
 def save_env(env: dict):
@@ -1,28 +1,21 @@
 """Pytest configuration for MCP tests.
 
-Ensures consistent module imports by adding the MCP directory to sys.path
-and creating module aliases so that both `mcp.security` and `security`
-refer to the same module instance.
+The MCP directory and its parent are put on sys.path by the `pythonpath`
+setting in pyproject.toml. This module creates module aliases so that both
+`mcp.security` and `security` refer to the same module instance.
 """
 
 import sys
-from pathlib import Path
 
 import pytest
 
-# Add the MCP source directory to sys.path so imports work correctly
-mcp_dir = Path(__file__).parent.parent
-if str(mcp_dir) not in sys.path:
-    sys.path.insert(0, str(mcp_dir))
-
-# Also add parent for mcp.* imports to work
-src_dir = mcp_dir.parent
-if str(src_dir) not in sys.path:
-    sys.path.insert(0, str(src_dir))
-
 # Import the modules to ensure they're loaded with consistent names
 import security
 import tools
+import tools.notes
+import tools.tags
+import tools.tasks
+import tools.text
 import tools.semantic
 import llm
 import server
@@ -31,7 +24,14 @@ import server
 # This prevents the dual-module-instance bug where init_security()
 # called on mcp.security doesn't affect code importing from security.
 # It also ensures @patch decorators using mcp.* work correctly.
-sys.modules["mcp"] = type(sys)("mcp")
+# Submodules are also set as attributes so dotted-string lookups such as
+# monkeypatch.setattr("mcp.server.llm_chat", ...) resolve.
+mcp_pkg = type(sys)("mcp")
+mcp_pkg.security = security
+mcp_pkg.tools = tools
+mcp_pkg.llm = llm
+mcp_pkg.server = server
+sys.modules["mcp"] = mcp_pkg
 sys.modules["mcp.security"] = security
 sys.modules["mcp.tools"] = tools
 sys.modules["mcp.tools.semantic"] = tools.semantic
@@ -50,3 +50,20 @@ def reset_semantic_model():
     yield
     # Reset after each test
     tools.semantic._model = None
+
+
+@pytest.fixture(autouse=True)
+def reset_llm_response_cache():
+    """Clear the LLM response cache so cached results don't leak between tests."""
+    yield
+    llm.clear_response_cache()
+
+
+@pytest.fixture(autouse=True)
+def reset_note_cache():
+    """Clear parsed note metadata, tags and extractions so one test's vault doesn't serve another's."""
+    yield
+    tools.notes.clear_note_cache()
+    tools.tags.clear_tag_cache()
+    tools.tasks.clear_task_cache()
+    tools.text.clear_extract_cache()
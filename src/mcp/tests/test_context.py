@@ -1,15 +1,10 @@
 """Tests for context loading module."""
 
 import json
-import sys
-from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-# Add mcp directory to path so imports match server.py's import style
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 
 def test_load_philosophy_returns_file_content(tmp_path):
     """load_philosophy returns content from .lu/philosophy.md."""
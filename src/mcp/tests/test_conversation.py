@@ -2,15 +2,10 @@
 """Tests for conversation scope tool."""
 
 import json
-import os
-import sys
 import pytest
 from datetime import datetime, timezone, timedelta
-from pathlib import Path
 from unittest.mock import patch
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 
 def test_expire_stale_topics_moves_old_topics(tmp_path):
     """expire_stale_topics moves topics older than max_age to stale."""
@@ -2,18 +2,13 @@
 
 import json
 import os
-import sys
 import tempfile
 import unittest
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
-_mcp_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(_mcp_dir))
-sys.path.insert(0, str(_mcp_dir.parent))
-
-from security import init_security  # noqa: E402
-from tools import index as index_tool  # noqa: E402
+from security import init_security
+from tools import index as index_tool
 
 
 class IndexFreshnessTests(unittest.TestCase):
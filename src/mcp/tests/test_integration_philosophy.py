@@ -8,15 +8,10 @@ conversation behavior.
 
 import json
 import os
-import sys
-from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 import pytest
 
-# Add mcp directory to path so imports match server.py's import style
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 
 @pytest.fixture
 def app_client_with_philosophy(tmp_path):
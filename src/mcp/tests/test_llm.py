@@ -159,5 +159,95 @@ def test_chat_stream_yields_chunks():
         )
 
     assert len(chunks) == 2
-    assert chunks[0]["content"] == "Hello"
-    assert chunks[1]["content"] == " world!"
+    assert chunks[0].content == "Hello"
+    assert chunks[1].content == " world!"
+
+
+def _stream_chunk(content):
+    """Build a mock streaming chunk carrying a text delta."""
+    chunk = MagicMock()
+    chunk.usage = None
+    chunk.choices = [MagicMock()]
+    chunk.choices[0].delta.content = content
+    chunk.choices[0].delta.tool_calls = None
+    return chunk
+
+
+def test_chat_stream_skips_empty_chunks():
+    """Streaming chat drops chunks that carry neither content nor tool calls."""
+    from llm import chat_stream
+
+    chunks = [_stream_chunk("Hello"), _stream_chunk(None), _stream_chunk(" world!")]
+
+    with patch("llm.completion", return_value=iter(chunks)):
+        result = list(
+            chat_stream(model="claude-sonnet-4", messages=[{"role": "user", "content": "Hi"}])
+        )
+
+    assert [c.content for c in result] == ["Hello", " world!"]
+
+
+def test_chat_caches_identical_requests(monkeypatch, tmp_path):
+    """Identical temperature=0 chat requests are served from the response cache."""
+    import llm
+
+    calls = []
+
+    def fake_completion(**kwargs):
+        calls.append(kwargs)
+        return iter([_stream_chunk("Hello")])
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+    monkeypatch.setattr(llm, "SCRATCH_DIR", tmp_path)
+    monkeypatch.setattr(llm, "completion", fake_completion)
+    messages = [{"role": "user", "content": "Hi"}]
+
+    first = llm.chat(model="claude-sonnet-4", messages=messages, temperature=0)
+    first["content"] = "edited"
+    second = llm.chat(model="claude-sonnet-4", messages=messages, temperature=0)
+    llm.chat(model="claude-sonnet-4", messages=messages)
+    llm.chat(model="claude-sonnet-4", messages=messages)
+
+    assert second["content"] == "Hello"
+    assert second["cached"] is True
+    assert second["usage"]["total_tokens"] == 0
+    assert calls[0]["temperature"] == 0
+    # Without temperature=0 every call reaches the provider
+    assert len(calls) == 3
+
+
+def test_prompt_caching_marks_system_and_tools(monkeypatch):
+    """Anthropic requests mark the system prompt and last tool as cacheable."""
+    import llm
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+    messages = [
+        {"role": "system", "content": "You are Lu."},
+        {"role": "user", "content": "Hi"},
+    ]
+    tools = [{"name": "read_file"}, {"name": "search"}]
+
+    kwargs = llm._build_chat_kwargs("claude-sonnet-4", messages, tools)
+
+    system = kwargs["messages"][0]["content"]
+    assert system == [
+        {"type": "text", "text": "You are Lu.", "cache_control": {"type": "ephemeral"}}
+    ]
+    assert kwargs["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in kwargs["tools"][0]
+    # Caller's objects are left untouched
+    assert messages[0]["content"] == "You are Lu."
+    assert "cache_control" not in tools[-1]
+
+
+def test_prompt_caching_skips_non_anthropic_models(monkeypatch):
+    """Non-Anthropic models get the messages unchanged."""
+    import llm
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+    messages = [{"role": "system", "content": "You are Lu."}]
+
+    kwargs = llm._build_chat_kwargs("gpt-4o", messages, None)
+
+    assert kwargs["messages"][0]["content"] == "You are Lu."
+    assert "extra_headers" not in kwargs
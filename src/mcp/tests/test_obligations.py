@@ -1,17 +1,12 @@
 """Tests for the obligations MCP tool."""
 
-import sys
 import tempfile
 import unittest
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
-_mcp_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(_mcp_dir))
-sys.path.insert(0, str(_mcp_dir.parent))
-
-from security import init_security  # noqa: E402
-from tools import obligations as obligations_tool  # noqa: E402
+from security import init_security
+from tools import obligations as obligations_tool
 
 
 def _task_md(
@@ -2,15 +2,10 @@
 
 import asyncio
 import json
-import sys
 import time
 import unittest
-from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
-# Add parent to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-
 from mcp.process_manager import (
     KEEP_WARM_SECONDS,
     McpProcess,
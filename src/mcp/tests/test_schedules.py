@@ -3,17 +3,12 @@
 from __future__ import annotations
 
 import sqlite3
-import sys
 import tempfile
 import unittest
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
-_mcp_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(_mcp_dir))
-sys.path.insert(0, str(_mcp_dir.parent))
-
-from tools import schedules as sched_tool  # noqa: E402
+from tools import schedules as sched_tool
 
 
 def _init_db(path: Path) -> sqlite3.Connection:
@@ -2,14 +2,11 @@
 
 import json
 import shutil
-import sys
 import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-
 from mcp.security import init_security
 from mcp.tools import call_tool
 from mcp.tools.semantic import INDEX_PATH, _check_numpy
@@ -1,154 +1,148 @@
 """Tests for /chat endpoint."""
 
-import os
-import sys
-from pathlib import Path
-from unittest.mock import patch
-
 import pytest
 
-# Add parent to path for package imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from mcp.llm import (
+    LlmApiError,
+    LlmAuthError,
+    LlmBudgetError,
+    LlmRateLimitError,
+    StreamDelta,
+)
+from mcp.security import init_security
+from mcp.server import app, coalesce_stream
 
 
-@pytest.fixture
-def client():
-    """Create test client with auth configured."""
-    os.environ["VAULT_PATH"] = "/tmp/test-vault"
-    os.environ["AUTH_TOKEN"] = "test-token"
+@pytest.fixture(scope="session")
+def chat_app(tmp_path_factory):
+    """Configure the Flask app and its vault once for the whole session."""
+    vault = tmp_path_factory.mktemp("chat_vault")
+
+    app.config["TESTING"] = True
+    return app, vault
+
 
-    from mcp.security import init_security
-    from mcp.server import app
+@pytest.fixture
+def chat_env(chat_app, monkeypatch):
+    """Point env and security at the chat vault with auth configured."""
+    app, vault = chat_app
+    monkeypatch.setenv("VAULT_PATH", str(vault))
+    monkeypatch.setenv("AUTH_TOKEN", "test-token")
+    # Other test modules re-point the security globals, so re-init per test
+    init_security(vault, "test-token")
+    return app
 
-    Path("/tmp/test-vault").mkdir(exist_ok=True)
-    init_security(Path("/tmp/test-vault"), "test-token")
 
-    app.config["TESTING"] = True
-    with app.test_client() as client:
+@pytest.fixture
+def client(chat_env):
+    """Create test client with auth configured."""
+    with chat_env.test_client() as client:
         yield client
 
 
-def test_chat_requires_auth(client):
-    """Chat endpoint requires authentication."""
-    response = client.post(
-        "/chat",
-        json={
-            "model": "claude-sonnet-4",
-            "messages": [{"role": "user", "content": "Hi"}],
-        },
-    )
-    assert response.status_code == 401
+@pytest.fixture
+def post_chat(chat_env):
+    """Call the /chat view directly inside a test request context.
 
+    Skips the test client's WSGI round-trip, routing and cookie jar, which
+    is all tests that only check status and JSON body need.
+    """
+    view = chat_env.ensure_sync(chat_env.view_functions["chat"])
 
-def test_chat_returns_response(client):
-    """Chat endpoint returns LLM response."""
-    with patch(
-        "mcp.server.llm_chat",
-        return_value={
-            "content": "Hello!",
-            "tool_calls": None,
-            "usage": {"prompt_tokens": 10, "completion_tokens": 5},
-        },
-    ):
-        response = client.post(
-            "/chat",
-            json={
-                "model": "claude-sonnet-4",
-                "messages": [{"role": "user", "content": "Hi"}],
-            },
-            headers={"Authorization": "Bearer test-token"},
-        )
+    def post(payload, token="test-token"):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        with chat_env.test_request_context("/chat", method="POST", json=payload, headers=headers):
+            return chat_env.make_response(view())
 
-    assert response.status_code == 200
-    data = response.get_json()
-    assert data["content"] == "Hello!"
+    return post
 
 
-def test_chat_returns_401_on_auth_error(client):
-    """Chat returns 401 on authentication error."""
-    from mcp.llm import LlmAuthError
+def _chat_returning(result):
+    """Stand-in for llm_chat that returns a canned result."""
 
-    with patch("mcp.server.llm_chat", side_effect=LlmAuthError("Invalid key")):
-        response = client.post(
-            "/chat",
-            json={
-                "model": "claude-sonnet-4",
-                "messages": [{"role": "user", "content": "Hi"}],
-            },
-            headers={"Authorization": "Bearer test-token"},
-        )
+    def fake_chat(**kwargs):
+        return result
 
-    assert response.status_code == 401
-    data = response.get_json()
-    assert data["error"] == "auth_failed"
+    return fake_chat
 
 
-def test_chat_returns_402_on_budget_error(client):
-    """Chat returns 402 when credits exhausted."""
-    from mcp.llm import LlmBudgetError
+def _chat_raising(error):
+    """Stand-in for llm_chat that raises the given error."""
 
-    with patch("mcp.server.llm_chat", side_effect=LlmBudgetError("Credits exhausted")):
-        response = client.post(
-            "/chat",
-            json={
-                "model": "claude-sonnet-4",
-                "messages": [{"role": "user", "content": "Hi"}],
-            },
-            headers={"Authorization": "Bearer test-token"},
-        )
+    def fake_chat(**kwargs):
+        raise error
+
+    return fake_chat
 
-    assert response.status_code == 402
-    data = response.get_json()
-    assert data["error"] == "budget_exceeded"
 
+def test_chat_requires_auth(post_chat):
+    """Chat endpoint requires authentication."""
+    response = post_chat(
+        {
+            "model": "claude-sonnet-4",
+            "messages": [{"role": "user", "content": "Hi"}],
+        },
+        token=None,
+    )
+    assert response.status_code == 401
 
-def test_chat_returns_429_on_rate_limit(client):
-    """Chat returns 429 on rate limit."""
-    from mcp.llm import LlmRateLimitError
 
-    with patch("mcp.server.llm_chat", side_effect=LlmRateLimitError("Rate limited")):
-        response = client.post(
-            "/chat",
-            json={
-                "model": "claude-sonnet-4",
-                "messages": [{"role": "user", "content": "Hi"}],
-            },
-            headers={"Authorization": "Bearer test-token"},
-        )
+def test_chat_returns_response(post_chat, monkeypatch):
+    """Chat endpoint returns LLM response."""
+    monkeypatch.setattr(
+        "mcp.server.llm_chat",
+        _chat_returning(
+            {
+                "content": "Hello!",
+                "tool_calls": None,
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5},
+            }
+        ),
+    )
+    response = post_chat(
+        {
+            "model": "claude-sonnet-4",
+            "messages": [{"role": "user", "content": "Hi"}],
+        }
+    )
 
-    assert response.status_code == 429
+    assert response.status_code == 200
     data = response.get_json()
-    assert data["error"] == "rate_limit"
-
+    assert data["content"] == "Hello!"
 
-def test_chat_returns_502_on_api_error(client):
-    """Chat returns 502 on generic API error."""
-    from mcp.llm import LlmApiError
 
-    with patch("mcp.server.llm_chat", side_effect=LlmApiError("API error")):
-        response = client.post(
-            "/chat",
-            json={
-                "model": "claude-sonnet-4",
-                "messages": [{"role": "user", "content": "Hi"}],
-            },
-            headers={"Authorization": "Bearer test-token"},
-        )
+@pytest.mark.parametrize(
+    "error,status,key",
+    [
+        (LlmAuthError("Invalid key"), 401, "auth_failed"),
+        (LlmBudgetError("Credits exhausted"), 402, "budget_exceeded"),
+        (LlmRateLimitError("Rate limited"), 429, "rate_limit"),
+        (LlmApiError("API error"), 502, "api_error"),
+    ],
+    ids=["auth", "budget", "rate_limit", "api"],
+)
+def test_chat_maps_llm_errors_to_status(post_chat, monkeypatch, error, status, key):
+    """Chat maps each LLM error to its HTTP status and error key."""
+    monkeypatch.setattr("mcp.server.llm_chat", _chat_raising(error))
+    response = post_chat(
+        {
+            "model": "claude-sonnet-4",
+            "messages": [{"role": "user", "content": "Hi"}],
+        }
+    )
 
-    assert response.status_code == 502
+    assert response.status_code == status
     data = response.get_json()
-    assert data["error"] == "api_error"
+    assert data["error"] == key
 
 
-def test_chat_rejects_empty_messages(client):
+def test_chat_rejects_empty_messages(post_chat):
     """Chat returns 400 when messages is empty."""
-    response = client.post(
-        "/chat",
-        json={
+    response = post_chat(
+        {
             "model": "claude-sonnet-4",
             "messages": [],
-        },
-        headers={"Authorization": "Bearer test-token"},
+        }
     )
 
     assert response.status_code == 400
@@ -156,14 +150,12 @@ def test_chat_rejects_empty_messages(client):
     assert data["error"] == "invalid_input"
 
 
-def test_chat_rejects_missing_messages(client):
+def test_chat_rejects_missing_messages(post_chat):
     """Chat returns 400 when messages is missing."""
-    response = client.post(
-        "/chat",
-        json={
+    response = post_chat(
+        {
             "model": "claude-sonnet-4",
-        },
-        headers={"Authorization": "Bearer test-token"},
+        }
     )
 
     assert response.status_code == 400
@@ -171,25 +163,39 @@ def test_chat_rejects_missing_messages(client):
     assert data["error"] == "invalid_input"
 
 
-def test_chat_stream_returns_sse(client):
+def test_chat_stream_returns_sse(client, monkeypatch):
     """Chat stream returns Server-Sent Events."""
-    with patch(
+    monkeypatch.setattr(
         "mcp.server.llm_chat_stream",
-        return_value=iter(
-            [
-                {"content": "Hello", "tool_calls": None},
-                {"content": " world", "tool_calls": None},
-            ]
-        ),
-    ):
-        response = client.post(
-            "/chat/stream",
-            json={"model": "claude-sonnet-4", "messages": [{"role": "user", "content": "Hi"}]},
-            headers={"Authorization": "Bearer test-token"},
-        )
+        lambda **kwargs: iter([StreamDelta("Hello"), StreamDelta(" world")]),
+    )
+    response = client.post(
+        "/chat/stream",
+        json={"model": "claude-sonnet-4", "messages": [{"role": "user", "content": "Hi"}]},
+        headers={"Authorization": "Bearer test-token"},
+    )
 
     assert response.status_code == 200
     assert response.content_type == "text/event-stream; charset=utf-8"
-    data = response.data.decode("utf-8")
-    assert 'data: {"content": "Hello"' in data
-    assert "[DONE]" in data
+    data = response.data
+    assert b'data: {"content":"Hello"' in data
+    assert b"[DONE]" in data
+
+
+def test_coalesce_stream_merges_small_chunks():
+    """Small content chunks are merged after the first is flushed."""
+    chunks = [StreamDelta(c) for c in ["Hel", "lo", " ", "world"]]
+    merged = list(coalesce_stream(iter(chunks)))
+
+    assert merged[0].content == "Hel"
+    assert [m.content for m in merged[1:]] == ["lo world"]
+
+
+def test_coalesce_stream_passes_tool_calls_through():
+    """Tool-call chunks flush pending content and are emitted unchanged."""
+    tool_chunk = StreamDelta(None, [{"id": "call_1"}])
+    chunks = [StreamDelta("a"), StreamDelta("b"), tool_chunk]
+    merged = list(coalesce_stream(iter(chunks)))
+
+    assert [m.content for m in merged[:2]] == ["a", "b"]
+    assert merged[2] is tool_chunk
@@ -2,28 +2,22 @@
 
 import json
 import os
-import sys
-from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-# Add mcp directory to path so imports match server.py's import style
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 
 @pytest.fixture
-def client():
+def client(tmp_path):
     """Create test client with auth configured."""
-    os.environ["VAULT_PATH"] = "/tmp/test-vault"
+    os.environ["VAULT_PATH"] = str(tmp_path)
     os.environ["AUTH_TOKEN"] = "test-token"
 
     # Use local imports to match server.py's import style
     import security
     from server import app
 
-    Path("/tmp/test-vault").mkdir(exist_ok=True)
-    security.init_security(Path("/tmp/test-vault"), "test-token")
+    security.init_security(tmp_path, "test-token")
 
     app.config["TESTING"] = True
     with app.test_client() as client:
@@ -0,0 +1,134 @@
+"""Tests for the /tools and status endpoints."""
+
+import pytest
+
+AUTH = {"Authorization": "Bearer test-token"}
+
+
+@pytest.fixture
+def client(tmp_path):
+    """Create test client with auth configured."""
+    import security
+    import server
+
+    security.init_security(tmp_path, "test-token")
+    server.invalidate_tools_cache()
+
+    server.app.config["TESTING"] = True
+    with server.app.test_client() as client:
+        yield client
+
+
+def test_tools_lists_definitions(client):
+    """GET /tools returns the tool definitions with an ETag."""
+    response = client.get("/tools", headers=AUTH)
+
+    assert response.status_code == 200
+    names = {t["name"] for t in response.get_json()["tools"]}
+    assert "read_file" in names
+    assert response.headers.get("ETag")
+
+
+def test_tools_returns_304_when_unchanged(client):
+    """Matching If-None-Match yields 304 Not Modified."""
+    etag = client.get("/tools", headers=AUTH).headers["ETag"]
+
+    response = client.get("/tools", headers={**AUTH, "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
+
+
+def test_status_summarizes_tools(client):
+    """GET /status lists tool names from the cached summary."""
+    import server
+
+    data = client.get("/status", headers=AUTH).get_json()
+
+    assert data["status"] == "ok"
+    assert data["version"] == server.VERSION
+    assert "read_file" in {t["name"] for t in data["tools"]}
+
+
+def test_health_tracks_vault_changes(client, tmp_path):
+    """Cached /health payload is rebuilt when the vault changes."""
+    import security
+
+    assert client.get("/health", headers=AUTH).get_json()["vault"] == str(tmp_path.resolve())
+
+    other = tmp_path / "other"
+    other.mkdir()
+    security.init_security(other, "test-token")
+
+    assert client.get("/health", headers=AUTH).get_json()["vault"] == str(other.resolve())
+
+
+def test_root_reports_version(client):
+    """GET / returns server info without auth."""
+    import server
+
+    data = client.get("/").get_json()
+
+    assert data == {"name": "Ludolph MCP Server", "version": server.VERSION, "status": "running"}
+
+
+def test_call_batch_returns_results_in_order(client, tmp_path):
+    """POST /tools/call_batch runs every call and keeps request order."""
+    (tmp_path / "a.txt").write_text("alpha")
+    (tmp_path / "b.txt").write_text("beta")
+
+    response = client.post(
+        "/tools/call_batch",
+        headers=AUTH,
+        json={
+            "calls": [
+                {"name": "read_file", "arguments": {"path": "b.txt"}},
+                {"name": "read_file", "arguments": {"path": "a.txt"}},
+                {"name": "no_such_tool", "arguments": {}},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert "beta" in results[0]["content"]
+    assert "alpha" in results[1]["content"]
+    assert "Unknown tool" in results[2]["error"]
+
+
+def test_call_batch_rejects_non_list(client):
+    """calls must be a list."""
+    response = client.post("/tools/call_batch", headers=AUTH, json={"calls": "read_file"})
+
+    assert response.status_code == 400
+
+
+def test_call_streams_large_files(client, tmp_path, monkeypatch):
+    """read_file for files over the threshold streams the same JSON body."""
+    import tools.files
+
+    monkeypatch.setattr(tools.files, "READ_STREAM_THRESHOLD", 16)
+    monkeypatch.setattr(tools.files, "READ_CHUNK_SIZE", 8)
+    text = 'line one\nline "two"\nünïcode\n' * 4
+    (tmp_path / "big.md").write_text(text)
+
+    response = client.post(
+        "/tools/call", headers=AUTH, json={"name": "read_file", "arguments": {"path": "big.md"}}
+    )
+
+    assert response.is_streamed
+    assert response.get_json() == {"content": text, "error": None}
+
+
+def test_call_reports_bad_read_file_arguments(client, monkeypatch):
+    """A non-string path gets the normal JSON error, not a broken stream."""
+    import tools.files
+
+    monkeypatch.setattr(tools.files, "READ_STREAM_THRESHOLD", 0)
+    response = client.post(
+        "/tools/call", headers=AUTH, json={"name": "read_file", "arguments": {"path": 42}}
+    )
+
+    assert response.status_code == 200
+    assert response.get_json()["content"] == ""
+    assert response.get_json()["error"]
@@ -1,31 +1,63 @@
 """Unit tests for MCP tools."""
 
-# Add parent to path for imports
-import sys
+import os
+import shutil
 import tempfile
 import unittest
+import warnings
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+import pytest
 
-from mcp.security import init_security, safe_path
+from mcp.security import get_vault_path, init_security, is_git_repo, refresh_vault_state, safe_path
 from mcp.tools import call_tool
 
 
-class TestSafePath(unittest.TestCase):
-    """Tests for path validation."""
+class VaultTestCase(unittest.TestCase):
+    """Base class sharing one temp vault across a test class.
 
-    def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        init_security(Path(self.tmpdir), "test_token")
-        # Create test structure
-        (Path(self.tmpdir) / "notes").mkdir()
-        (Path(self.tmpdir) / "notes" / "test.md").write_text("test content")
+    The vault comes from pytest's tmp_path_factory, once per class, so
+    pytest cleans it up in bulk instead of each class calling rmtree.
+    Fixture files listed in ``files`` (and directories in ``dirs``) are
+    recreated before every test so tests that modify or delete them stay
+    isolated.
+    """
 
-    def tearDown(self):
-        import shutil
+    files: dict[str, str] = {}
+    dirs: tuple[str, ...] = ()
+
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def _class_vault(cls, tmp_path_factory):
+        # Use resolve() to handle /var -> /private/var symlink on macOS
+        cls.vault = tmp_path_factory.mktemp(cls.__name__).resolve()
+        init_security(cls.vault, "test_token")
+
+    def setUp(self):
+        # Tests may point security at a sub-vault; restore the shared one
+        if get_vault_path() != self.vault:
+            init_security(self.vault, "test_token")
+        for rel in self.dirs:
+            (self.vault / rel).mkdir(parents=True, exist_ok=True)
+        for rel, content in self.files.items():
+            path = self.vault / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+
+    def make_vault(self, name: str) -> Path:
+        """Create an isolated sub-vault for tests that change git state."""
+        path = self.vault / name
+        path.mkdir()
+        init_security(path, "test_token")
+        return path
+
+
+class TestSafePath(VaultTestCase):
+    """Tests for path validation."""
 
-        shutil.rmtree(self.tmpdir)
+    files = {
+        "notes/test.md": "test content",
+    }
 
     def test_safe_path_accepts_valid_paths(self):
         """Valid paths within vault should resolve."""
@@ -43,29 +75,57 @@ class TestSafePath(unittest.TestCase):
         """Empty path returns vault root."""
         result = safe_path("")
         self.assertIsNotNone(result)
-        # Use resolve() to handle /var -> /private/var symlink on macOS
-        self.assertEqual(result, Path(self.tmpdir).resolve())
+        self.assertEqual(result, self.vault)
 
     def test_safe_path_handles_dot(self):
         """Single dot returns vault root."""
         result = safe_path(".")
         self.assertIsNotNone(result)
-        # Use resolve() to handle /var -> /private/var symlink on macOS
-        self.assertEqual(result, Path(self.tmpdir).resolve())
-
-
-class TestReadFile(unittest.TestCase):
+        self.assertEqual(result, self.vault)
+
+    def test_safe_path_rejects_absolute_outside_vault(self):
+        """Absolute paths outside the vault are rejected."""
+        self.assertIsNone(safe_path("/etc/passwd"))
+
+    def test_safe_path_rejects_symlink_escape(self):
+        """Symlinks pointing outside the vault are rejected."""
+        outside = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, outside)
+        link = self.vault / "escape"
+        link.symlink_to(outside)
+        self.addCleanup(link.unlink)
+        self.assertIsNone(safe_path("escape/secret.txt"))
+
+    def test_safe_path_sees_symlinks_created_later(self):
+        """A symlink added after a path was first checked is still caught."""
+        outside = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, outside)
+        (outside / "secret.txt").write_text("TOP SECRET")
+        self.assertIsNotNone(safe_path("later/secret.txt"))
+
+        link = self.vault / "later"
+        link.symlink_to(outside)
+        self.addCleanup(link.unlink)
+        self.assertIsNone(safe_path("later/secret.txt"))
+        result = call_tool("read_file", {"path": "later/secret.txt"})
+        self.assertEqual(result["error"], "Invalid path")
+
+    def test_is_git_repo_cached_until_refresh(self):
+        """Git repo detection is computed at init and on refresh only."""
+        vault = self.make_vault("repo")
+        self.assertFalse(is_git_repo())
+        (vault / ".git").mkdir()
+        self.assertFalse(is_git_repo())
+        refresh_vault_state()
+        self.assertTrue(is_git_repo())
+
+
+class TestReadFile(VaultTestCase):
     """Tests for read_file tool."""
 
-    def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        init_security(Path(self.tmpdir), "test_token")
-        (Path(self.tmpdir) / "test.txt").write_text("hello world")
-
-    def tearDown(self):
-        import shutil
-
-        shutil.rmtree(self.tmpdir)
+    files = {
+        "test.txt": "hello world",
+    }
 
     def test_read_existing_file(self):
         """Should read existing file content."""
@@ -79,98 +139,123 @@ class TestReadFile(unittest.TestCase):
         self.assertIsNotNone(result["error"])
         self.assertIn("not found", result["error"])
 
+    def test_read_directory(self):
+        """Should reject a path that exists but isn't a regular file."""
+        (self.vault / "folder").mkdir(exist_ok=True)
+        result = call_tool("read_file", {"path": "folder"})
+        self.assertEqual(result["error"], "Path is not a file")
+
     def test_read_invalid_path(self):
         """Should reject path traversal."""
         result = call_tool("read_file", {"path": "../etc/passwd"})
         self.assertIsNotNone(result["error"])
         self.assertIn("Invalid", result["error"])
 
+    def test_read_rejects_schema_violation(self):
+        """Arguments are checked against input_schema when fastjsonschema is installed."""
+        import tools
 
-class TestWriteFile(unittest.TestCase):
-    """Tests for write_file tool."""
+        if tools.fastjsonschema is None:
+            self.skipTest("fastjsonschema not installed")
+        result = call_tool("read_file", {"path": 42})
+        self.assertIn("Invalid input", result["error"])
 
-    def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        init_security(Path(self.tmpdir), "test_token")
 
-    def tearDown(self):
-        import shutil
+class TestReadFiles(VaultTestCase):
+    """Tests for read_files tool."""
+
+    files = {
+        "a.md": "first",
+        "b.md": "zweite Stra\u00dfe",
+    }
+
+    def test_read_files_in_order(self):
+        """Should return each file's content or error, keyed in request order."""
+        import json
+
+        result = call_tool("read_files", {"paths": ["b.md", "missing.md", "a.md"]})
+        self.assertIsNone(result["error"])
+        data = json.loads(result["content"])
+        self.assertEqual(list(data), ["b.md", "missing.md", "a.md"])
+        self.assertEqual(data["b.md"], {"content": "zweite Stra\u00dfe"})
+        self.assertEqual(data["missing.md"], {"error": "File not found"})
+
+    def test_read_files_same_output_without_orjson(self):
+        """The stdlib fallback should format output exactly like orjson."""
+        from unittest.mock import patch
+
+        import tools.batch
 
-        shutil.rmtree(self.tmpdir)
+        if tools.batch.orjson is None:
+            self.skipTest("orjson not installed")
+        args = {"paths": ["a.md", "b.md", "../outside.md"]}
+        fast = call_tool("read_files", args)
+        with patch.object(tools.batch, "orjson", None):
+            slow = call_tool("read_files", args)
+        self.assertEqual(fast, slow)
+
+
+class TestWriteFile(VaultTestCase):
+    """Tests for write_file tool."""
 
     def test_write_new_file(self):
         """Should create new file."""
         result = call_tool("write_file", {"path": "new.txt", "content": "hello"})
         self.assertIsNone(result["error"])
-        self.assertTrue((Path(self.tmpdir) / "new.txt").exists())
-        self.assertEqual((Path(self.tmpdir) / "new.txt").read_text(), "hello")
+        self.assertTrue((self.vault / "new.txt").exists())
+        self.assertEqual((self.vault / "new.txt").read_text(), "hello")
 
     def test_write_creates_directories(self):
         """Should create parent directories."""
         result = call_tool("write_file", {"path": "a/b/c/file.txt", "content": "deep"})
         self.assertIsNone(result["error"])
-        self.assertTrue((Path(self.tmpdir) / "a" / "b" / "c" / "file.txt").exists())
+        self.assertTrue((self.vault / "a" / "b" / "c" / "file.txt").exists())
 
     def test_write_overwrites_existing(self):
         """Should overwrite existing file."""
-        (Path(self.tmpdir) / "existing.txt").write_text("old")
+        (self.vault / "existing.txt").write_text("old")
         result = call_tool("write_file", {"path": "existing.txt", "content": "new"})
         self.assertIsNone(result["error"])
-        self.assertEqual((Path(self.tmpdir) / "existing.txt").read_text(), "new")
+        self.assertEqual((self.vault / "existing.txt").read_text(), "new")
 
 
-class TestAppendFile(unittest.TestCase):
+class TestAppendFile(VaultTestCase):
     """Tests for append_file tool."""
 
-    def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        init_security(Path(self.tmpdir), "test_token")
-
-    def tearDown(self):
-        import shutil
-
-        shutil.rmtree(self.tmpdir)
-
     def test_append_to_existing(self):
         """Should append to existing file."""
-        (Path(self.tmpdir) / "test.txt").write_text("hello")
+        (self.vault / "test.txt").write_text("hello")
         result = call_tool("append_file", {"path": "test.txt", "content": " world"})
         self.assertIsNone(result["error"])
-        self.assertEqual((Path(self.tmpdir) / "test.txt").read_text(), "hello\n world")
+        self.assertEqual((self.vault / "test.txt").read_text(), "hello\n world")
 
     def test_append_creates_file(self):
         """Should create file if missing."""
         result = call_tool("append_file", {"path": "new.txt", "content": "hello"})
         self.assertIsNone(result["error"])
-        self.assertEqual((Path(self.tmpdir) / "new.txt").read_text(), "hello")
+        self.assertEqual((self.vault / "new.txt").read_text(), "hello")
 
     def test_append_newline_handling(self):
         """Should add newline before appended content if needed."""
-        (Path(self.tmpdir) / "test.txt").write_text("line1\n")
+        (self.vault / "test.txt").write_text("line1\n")
         result = call_tool("append_file", {"path": "test.txt", "content": "line2"})
         self.assertIsNone(result["error"])
         # File already ends with newline, so no extra newline added
-        self.assertEqual((Path(self.tmpdir) / "test.txt").read_text(), "line1\nline2")
+        self.assertEqual((self.vault / "test.txt").read_text(), "line1\nline2")
 
 
-class TestDeleteFile(unittest.TestCase):
+class TestDeleteFile(VaultTestCase):
     """Tests for delete_file tool."""
 
-    def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        init_security(Path(self.tmpdir), "test_token")
-        (Path(self.tmpdir) / "delete_me.txt").write_text("goodbye")
-
-    def tearDown(self):
-        import shutil
-
-        shutil.rmtree(self.tmpdir)
+    files = {
+        "delete_me.txt": "goodbye",
+    }
 
     def test_delete_existing_file(self):
         """Should delete existing file."""
         result = call_tool("delete_file", {"path": "delete_me.txt"})
         self.assertIsNone(result["error"])
-        self.assertFalse((Path(self.tmpdir) / "delete_me.txt").exists())
+        self.assertFalse((self.vault / "delete_me.txt").exists())
 
     def test_delete_missing_file(self):
         """Should return error for missing file."""
@@ -179,49 +264,90 @@ class TestDeleteFile(unittest.TestCase):
         self.assertIn("not found", result["error"])
 
 
-class TestMoveFile(unittest.TestCase):
+class TestMoveFile(VaultTestCase):
     """Tests for move_file tool."""
 
-    def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        init_security(Path(self.tmpdir), "test_token")
-        (Path(self.tmpdir) / "source.txt").write_text("move me")
-
-    def tearDown(self):
-        import shutil
-
-        shutil.rmtree(self.tmpdir)
+    files = {
+        "source.txt": "move me",
+    }
 
     def test_move_file(self):
         """Should move file to new location."""
         result = call_tool("move_file", {"source": "source.txt", "destination": "dest.txt"})
         self.assertIsNone(result["error"])
-        self.assertFalse((Path(self.tmpdir) / "source.txt").exists())
-        self.assertTrue((Path(self.tmpdir) / "dest.txt").exists())
-        self.assertEqual((Path(self.tmpdir) / "dest.txt").read_text(), "move me")
+        self.assertFalse((self.vault / "source.txt").exists())
+        self.assertTrue((self.vault / "dest.txt").exists())
+        self.assertEqual((self.vault / "dest.txt").read_text(), "move me")
 
     def test_move_creates_directories(self):
         """Should create destination directories."""
         result = call_tool("move_file", {"source": "source.txt", "destination": "new/dir/file.txt"})
         self.assertIsNone(result["error"])
-        self.assertTrue((Path(self.tmpdir) / "new" / "dir" / "file.txt").exists())
+        self.assertTrue((self.vault / "new" / "dir" / "file.txt").exists())
 
+    def test_move_overwrites_existing_file(self):
+        """Should replace an existing destination file."""
+        (self.vault / "taken.txt").write_text("old")
+        result = call_tool("move_file", {"source": "source.txt", "destination": "taken.txt"})
+        self.assertIsNone(result["error"])
+        self.assertEqual((self.vault / "taken.txt").read_text(), "move me")
 
-class TestListDirectory(unittest.TestCase):
-    """Tests for list_directory tool."""
+    def test_move_into_directory(self):
+        """Should move into an existing directory, keeping the name."""
+        (self.vault / "archive").mkdir(exist_ok=True)
+        result = call_tool("move_file", {"source": "source.txt", "destination": "archive"})
+        self.assertIsNone(result["error"])
+        self.assertEqual((self.vault / "archive" / "source.txt").read_text(), "move me")
+
+
+class TestCopyFile(VaultTestCase):
+    """Tests for copy_file tool."""
+
+    files = {
+        "source.txt": "copy me",
+    }
 
     def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        init_security(Path(self.tmpdir), "test_token")
-        (Path(self.tmpdir) / "file1.txt").write_text("a")
-        (Path(self.tmpdir) / "file2.txt").write_text("b")
-        (Path(self.tmpdir) / "subdir").mkdir()
-        (Path(self.tmpdir) / ".hidden").write_text("hidden")
+        super().setUp()
+        os.utime(self.vault / "source.txt", (1_000_000_000, 1_000_000_000))
 
-    def tearDown(self):
-        import shutil
+    def test_copy_preserves_content_and_mtime(self):
+        """Should copy data and metadata, like shutil.copy2."""
+        result = call_tool("copy_file", {"source": "source.txt", "destination": "out/copy.txt"})
+        self.assertIsNone(result["error"])
+        copy = self.vault / "out" / "copy.txt"
+        self.assertEqual(copy.read_text(), "copy me")
+        self.assertEqual(copy.stat().st_mtime, 1_000_000_000)
+
+    def test_copy_without_kernel_fast_path(self):
+        """Should fall back to shutil.copy2 when no fast path is supported."""
+        from unittest.mock import patch
+
+        import tools.files
+
+        with patch.object(tools.files, "_copy_in_kernel", return_value=False):
+            result = call_tool("copy_file", {"source": "source.txt", "destination": "slow.txt"})
+        self.assertIsNone(result["error"])
+        self.assertEqual((self.vault / "slow.txt").read_text(), "copy me")
+        self.assertEqual((self.vault / "slow.txt").stat().st_mtime, 1_000_000_000)
+
+    def test_copy_onto_itself_keeps_source(self):
+        """Copying a file onto itself must not truncate it."""
+        result = call_tool("copy_file", {"source": "source.txt", "destination": "source.txt"})
+        self.assertIsNotNone(result["error"])
+        self.assertEqual((self.vault / "source.txt").read_text(), "copy me")
 
-        shutil.rmtree(self.tmpdir)
+
+class TestListDirectory(VaultTestCase):
+    """Tests for list_directory tool."""
+
+    files = {
+        "file1.txt": "a",
+        "file2.txt": "b",
+        ".hidden": "hidden",
+    }
+
+    dirs = ("subdir",)
 
     def test_list_root(self):
         """Should list root directory."""
@@ -231,52 +357,147 @@ class TestListDirectory(unittest.TestCase):
         self.assertIn("file: file2.txt", result["content"])
         self.assertIn("dir: subdir", result["content"])
 
+    def test_list_file_rejected(self):
+        """Should reject a path that is a file."""
+        result = call_tool("list_directory", {"path": "file1.txt"})
+        self.assertEqual(result["error"], "Path is not a directory")
+
     def test_list_hides_dotfiles(self):
         """Should hide dotfiles."""
         result = call_tool("list_directory", {"path": ""})
         self.assertNotIn(".hidden", result["content"])
 
 
-class TestCreateDirectory(unittest.TestCase):
-    """Tests for create_directory tool."""
+class TestFileTree(VaultTestCase):
+    """Tests for file_tree tool."""
 
-    def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        init_security(Path(self.tmpdir), "test_token")
+    files = {
+        "b.md": "b",
+        "a/inner.md": "inner",
+        "a/deep/leaf.md": "leaf",
+        ".hidden/x.md": "x",
+    }
 
-    def tearDown(self):
-        import shutil
+    def test_tree_sorted_without_hidden(self):
+        """Should draw a sorted tree, skipping dot-entries."""
+        result = call_tool("file_tree", {"path": "", "max_depth": 2})
+        self.assertIsNone(result["error"])
+        lines = result["content"].splitlines()[1:]
+        self.assertEqual(lines, ["├── a", "│   ├── deep", "│   └── inner.md", "└── b.md"])
+
+    def test_tree_directories_only(self):
+        """Should list only directories when include_files is false."""
+        result = call_tool("file_tree", {"path": "", "include_files": False})
+        self.assertEqual(result["content"].splitlines()[1:], ["└── a", "    └── deep"])
 
-        shutil.rmtree(self.tmpdir)
+
+class TestCreateDirectory(VaultTestCase):
+    """Tests for create_directory tool."""
 
     def test_create_single_directory(self):
         """Should create directory."""
         result = call_tool("create_directory", {"path": "newdir"})
         self.assertIsNone(result["error"])
-        self.assertTrue((Path(self.tmpdir) / "newdir").is_dir())
+        self.assertTrue((self.vault / "newdir").is_dir())
 
     def test_create_nested_directories(self):
         """Should create nested directories."""
         result = call_tool("create_directory", {"path": "a/b/c"})
         self.assertIsNone(result["error"])
-        self.assertTrue((Path(self.tmpdir) / "a" / "b" / "c").is_dir())
+        self.assertTrue((self.vault / "a" / "b" / "c").is_dir())
 
 
-class TestSearch(unittest.TestCase):
-    """Tests for search tool."""
+class TestDeleteDirectory(VaultTestCase):
+    """Tests for delete_directory tool."""
 
-    def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        init_security(Path(self.tmpdir), "test_token")
-        (Path(self.tmpdir) / "apple.md").write_text("This is an apple")
-        (Path(self.tmpdir) / "banana.md").write_text("This is a banana")
-        (Path(self.tmpdir) / "docs").mkdir()
-        (Path(self.tmpdir) / "docs" / "guide.md").write_text("Apple guide content")
+    files = {
+        "full/note.md": "content",
+    }
+    dirs = ("empty",)
+
+    def test_delete_empty_directory(self):
+        """Should remove an empty directory."""
+        result = call_tool("delete_directory", {"path": "empty"})
+        self.assertIsNone(result["error"])
+        self.assertFalse((self.vault / "empty").exists())
+
+    def test_refuses_non_empty_directory(self):
+        """Should keep a non-empty directory unless recursive is set."""
+        result = call_tool("delete_directory", {"path": "full"})
+        self.assertIn("not empty", result["error"])
+        self.assertTrue((self.vault / "full" / "note.md").exists())
+
+        result = call_tool("delete_directory", {"path": "full", "recursive": True})
+        self.assertIsNone(result["error"])
+        self.assertFalse((self.vault / "full").exists())
+
+
+class TestPrependFile(VaultTestCase):
+    """Tests for prepend_file tool."""
+
+    files = {
+        "plain.md": "body\n",
+        "meta.md": "---\ntitle: Café\n---\nbody\n",
+    }
 
-    def tearDown(self):
-        import shutil
+    def test_prepend_plain(self):
+        """Should insert content and a newline at the start."""
+        result = call_tool("prepend_file", {"path": "plain.md", "content": "top"})
+        self.assertIsNone(result["error"])
+        self.assertEqual((self.vault / "plain.md").read_text(), "top\nbody\n")
+
+    def test_prepend_after_frontmatter(self):
+        """Should insert after multi-byte frontmatter, leaving it intact."""
+        call_tool("prepend_file", {"path": "meta.md", "content": "über"})
+        self.assertEqual(
+            (self.vault / "meta.md").read_text(encoding="utf-8"),
+            "---\ntitle: Café\n---\nüber\nbody\n",
+        )
+
+    def test_prepend_creates_file(self):
+        """Should create a missing file with just the content."""
+        call_tool("prepend_file", {"path": "new/fresh.md", "content": "only"})
+        self.assertEqual((self.vault / "new/fresh.md").read_text(), "only")
+
+
+class TestPatchFile(VaultTestCase):
+    """Tests for patch_file tool."""
+
+    files = {
+        "note.md": "# Top\n\n## Plan\nold\n### Detail\nkept? no\n## Next\nstays\n",
+    }
+
+    def test_patch_replaces_section_up_to_same_level(self):
+        """Should replace everything until the next heading of the same or higher level."""
+        result = call_tool("patch_file", {"path": "note.md", "heading": "plan", "content": "new"})
+        self.assertIsNone(result["error"])
+        self.assertEqual(
+            (self.vault / "note.md").read_text(), "# Top\n\n## Plan\n\nnew\n\n## Next\nstays\n"
+        )
+
+    def test_patch_creates_missing_section(self):
+        """Should append a new section when create_if_missing is set."""
+        result = call_tool(
+            "patch_file",
+            {"path": "note.md", "heading": "Later", "content": "x", "create_if_missing": True},
+        )
+        self.assertIsNone(result["error"])
+        self.assertTrue((self.vault / "note.md").read_text().endswith("stays\n\n## Later\n\nx\n"))
 
-        shutil.rmtree(self.tmpdir)
+    def test_patch_missing_heading(self):
+        """Should report a missing heading unless asked to create it."""
+        result = call_tool("patch_file", {"path": "note.md", "heading": "Nope", "content": "x"})
+        self.assertEqual(result["error"], "Heading not found: Nope")
+
+
+class TestSearch(VaultTestCase):
+    """Tests for search tool."""
+
+    files = {
+        "apple.md": "This is an apple",
+        "banana.md": "This is a banana",
+        "docs/guide.md": "Apple guide content",
+    }
 
     def test_search_filename(self):
         """Should find files by name."""
@@ -296,20 +517,49 @@ class TestSearch(unittest.TestCase):
         self.assertIsNone(result["error"])
         self.assertIn("apple", result["content"].lower())
 
+    def test_search_context_ascii_and_unicode(self):
+        """ASCII and non-ASCII notes report the same context around a hit."""
+        (self.vault / "ascii.md").write_text("before\nKIWI after")
+        (self.vault / "unicode.md").write_text("\u0130 before\nkIwI after")
+        result = call_tool("search", {"query": "kiwi", "context_length": 7})
+        self.assertIn("match: ascii.md\n  ...before KIWI after...", result["content"])
+        self.assertIn("match: unicode.md\n  ...before kIwI after...", result["content"])
 
-class TestSearchAdvanced(unittest.TestCase):
-    """Tests for search_advanced tool."""
+    def test_search_reads_only_ripgrep_candidates(self):
+        """Content is only checked in files ripgrep reported."""
+        from unittest.mock import patch
+
+        import tools.search
+
+        with patch.object(tools.search, "_rg_matching_files", return_value=set()):
+            result = call_tool("search", {"query": "a banana"})
+        self.assertEqual(result["content"], "No matches found")
+
+        with patch.object(
+            tools.search, "_rg_matching_files", return_value={str(self.vault / "banana.md")}
+        ):
+            result = call_tool("search", {"query": "a banana"})
+        self.assertIn("match: banana.md", result["content"])
+
+    def test_search_stops_at_limit(self):
+        """Should return at most SEARCH_LIMIT hits."""
+        import tools.search
+
+        for i in range(tools.search.SEARCH_LIMIT + 10):
+            (self.vault / f"fruit{i}.md").write_text("apple")
+        result = call_tool("search", {"query": "apple"})
+        lines = result["content"].splitlines()
+        hits = [line for line in lines if line.startswith(("file:", "match:"))]
+        self.assertEqual(len(hits), tools.search.SEARCH_LIMIT)
 
-    def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        init_security(Path(self.tmpdir), "test_token")
-        (Path(self.tmpdir) / "test.py").write_text("def hello():\n    pass")
-        (Path(self.tmpdir) / "test.md").write_text("# Hello World")
 
-    def tearDown(self):
-        import shutil
+class TestSearchAdvanced(VaultTestCase):
+    """Tests for search_advanced tool."""
 
-        shutil.rmtree(self.tmpdir)
+    files = {
+        "test.py": "def hello():\n    pass",
+        "test.md": "# Hello World",
+    }
 
     def test_regex_search(self):
         """Should support regex patterns."""
@@ -324,19 +574,506 @@ class TestSearchAdvanced(unittest.TestCase):
         self.assertIn("test.md", result["content"])
         self.assertNotIn("test.py", result["content"])
 
+    def test_double_star_glob_skips_hidden(self):
+        """ "**" globs skip files under dot-directories and dotfiles."""
+        for rel in ("notes/.hidden/a.md", "notes/.b.md", "notes/ok.md", "notes/x.y/c.md"):
+            (self.vault / rel).parent.mkdir(parents=True, exist_ok=True)
+            (self.vault / rel).write_text("Hello")
+        try:
+            result = call_tool("search_advanced", {"pattern": "Hello", "glob": "**/*.md"})
+        finally:
+            shutil.rmtree(self.vault / "notes")
+        self.assertIn("notes/ok.md", result["content"])
+        self.assertIn("notes/x.y/c.md", result["content"])
+        self.assertNotIn(".hidden", result["content"])
+        self.assertNotIn(".b.md", result["content"])
+
+    def test_glob_with_directory(self):
+        """A glob with "/" matches trailing path parts, as rglob would."""
+        (self.vault / "docs" / "api").mkdir(parents=True, exist_ok=True)
+        (self.vault / "docs" / "api" / "ref.md").write_text("Hello API")
+        (self.vault / "api.md").write_text("Hello root")
+        try:
+            result = call_tool("search_advanced", {"pattern": "Hello", "glob": "api/*.md"})
+            scoped = call_tool(
+                "search_advanced", {"pattern": "Hello", "glob": "api/*.md", "path": "docs/api"}
+            )
+        finally:
+            (self.vault / "docs" / "api" / "ref.md").unlink()
+            (self.vault / "api.md").unlink()
+        self.assertIn("docs/api/ref.md", result["content"])
+        self.assertNotIn("api.md:", result["content"])
+        # Matching is relative to the search path, not the vault
+        self.assertEqual(scoped["content"], "No matches found")
+
+    def test_crlf_notes_match_as_text(self):
+        """CRLF notes match and report offsets as on their text-mode contents."""
+        (self.vault / "crlf.md").write_bytes(b"one\r\nfoo\r\nbar")
+        self.addCleanup((self.vault / "crlf.md").unlink)
+        result = call_tool("search_advanced", {"pattern": "foo$", "content_only": True})
+        self.assertIn("match: crlf.md:4\n  ...one foo bar...", result["content"])
+
+        from tools.walk import read_text_if_match
+
+        path = str(self.vault / "crlf.md")
+        self.assertEqual(read_text_if_match(path, lambda data: True), "one\nfoo\nbar")
+
+    def test_literal_pattern_screened_without_prefilters(self):
+        """Literal patterns still match case-insensitively when only the byte screen runs."""
+        from unittest.mock import patch
+
+        import tools.search
+
+        with (
+            patch.object(tools.search, "hyperscan", None),
+            patch.object(tools.search, "RG_PATH", None),
+        ):
+            result = call_tool("search_advanced", {"pattern": "hello", "content_only": True})
+        self.assertEqual(result["content"].count("match: "), 2)
+
+    def test_ripgrep_skipped_where_it_disagrees(self):
+        """Patterns ripgrep's engine reads differently aren't prefiltered with it."""
+        from unittest.mock import patch
+
+        import tools.search
+
+        with patch.object(tools.search, "_rg_matching_files", return_value=set()) as rg:
+            # re warns that these may change meaning in future versions
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", FutureWarning)
+                for pattern in ("[[:alpha:]]", "[a&&b]", "x[a[b]"):
+                    call_tool("search_advanced", {"pattern": pattern})
+            rg.assert_not_called()
+            result = call_tool("search_advanced", {"pattern": "Hel+o"})
+        rg.assert_called_once()
+        self.assertEqual(result["content"], "No matches found")
+
+    def test_user_patterns_use_re2_only_where_it_agrees(self):
+        """RE2 takes patterns it reads like re; the rest stay on re."""
+        import re
+
+        import tools.search
+
+        if tools.search.re2 is None:
+            self.skipTest("google-re2 not installed")
+        compiled = tools.search._compile_user_pattern(r"(a+)+$")
+        self.assertNotIsInstance(compiled, re.Pattern)
+        self.assertIsNone(compiled.search("a" * 40 + "b"))
+        for pattern in (r"\w+", r"(a)\1", "x?", "a{,2}"):
+            self.assertIsInstance(tools.search._compile_user_pattern(pattern), re.Pattern, pattern)
+
+    def test_hyperscan_prefilter_keeps_matches(self):
+        """Hyperscan screening must not drop files re would match."""
+        import tools.search
+
+        if tools.search.hyperscan is None:
+            self.skipTest("hyperscan not installed")
+        may_match = tools.search._hyperscan_prefilter(r"def [a-z]+\(\)")
+        self.assertTrue(may_match(b"DEF hello():"))
+        self.assertFalse(may_match(b"# Hello World"))
+        # Backreferences are unsupported; fall back to plain re
+        self.assertIsNone(tools.search._hyperscan_prefilter(r"(a)\1"))
+        # PCRE reads {,3} literally, where re reads it as 0 to 3 repeats
+        self.assertIsNone(tools.search._hyperscan_prefilter("ab{,3}c"))
+        (self.vault / "a.md").write_text("abbc")
+        self.addCleanup((self.vault / "a.md").unlink)
+        result = call_tool("search_advanced", {"pattern": "ab{,3}c", "content_only": True})
+        self.assertIn("match: a.md:0", result["content"])
+
+
+class TestFindReplace(VaultTestCase):
+    """Tests for find_replace tool."""
+
+    files = {"note.md": "a.b and axb"}
+
+    def test_literal_and_regex(self):
+        """Literal finds are escaped, regex finds aren't, bad regexes are reported."""
+        result = call_tool("find_replace", {"find": "a.b", "replace": "-"})
+        self.assertIn("note.md: 1 match(es)", result["content"])
+        result = call_tool("find_replace", {"find": "a.b", "replace": "-", "regex": True})
+        self.assertIn("note.md: 2 match(es)", result["content"])
+        result = call_tool("find_replace", {"find": "(", "replace": "-", "regex": True})
+        self.assertTrue(result["error"].startswith("Invalid regex"))
+
+    def test_only_text_extensions(self):
+        """Files outside the allowed extensions are never searched."""
+        (self.vault / "image.png").write_text("a.b")
+        (self.vault / "data.yml").write_text("a.b")
+        result = call_tool("find_replace", {"find": "a.b", "replace": "-"})
+        self.assertIn("data.yml: 1 match(es)", result["content"])
+        self.assertNotIn("image.png", result["content"])
+
+    def test_required_literal(self):
+        """Regex finds are screened on a literal every match must contain."""
+        from tools.text import _required_literal
+
+        self.assertEqual(_required_literal("fo+(bar).*", True), "bar")
+        self.assertEqual(_required_literal("one\ntwos", False), "twos")
+        self.assertIsNone(_required_literal("(?i)abc", True))
+        self.assertIsNone(_required_literal("a|b", True))
+        result = call_tool("find_replace", {"find": "a.b|ax(b)", "replace": "-", "regex": True})
+        self.assertIn("note.md: 2 match(es)", result["content"])
+
+    def test_identical_replacement_leaves_file_alone(self):
+        """Files whose text wouldn't change aren't rewritten."""
+        path = self.vault / "note.md"
+        os.utime(path, ns=(0, 0))
+        result = call_tool("find_replace", {"find": "a.b", "replace": "a.b", "dry_run": False})
+        self.assertIn("note.md: 1 match(es)", result["content"])
+        self.assertEqual(path.stat().st_mtime_ns, 0)
+
+    def test_literal_screen_keeps_translated_newlines(self):
+        """Literal finds across a CRLF newline still match, as in text mode."""
+        (self.vault / "crlf.md").write_bytes(b"one\r\ntwo")
+        result = call_tool("find_replace", {"find": "one\ntwo", "replace": "-"})
+        self.assertIn("crlf.md: 1 match(es)", result["content"])
+        result = call_tool("find_replace", {"find": "two", "replace": "-", "regex": True})
+        self.assertIn("crlf.md: 1 match(es)", result["content"])
+        self.assertNotIn("note.md", result["content"])
+
+
+class TestExtractTasks(VaultTestCase):
+    """Tests for extract_tasks tool."""
+
+    files = {f"n{i}.md": f"- [ ] task {i}\n* [x] done {i}" for i in range(30)}
+
+    def test_tasks_in_walk_order(self):
+        """Tasks from notes read in parallel still come back in walk order."""
+        (self.vault / "bad.md").write_bytes(b"- [ ] \xff")
+        result = call_tool("extract_tasks", {"status": "open"})
+        walk = [entry.name for entry in os.scandir(self.vault) if entry.name != "bad.md"]
+        expected = [f"- [ ] task {name[1:-3]} ({name})" for name in walk]
+        self.assertEqual(result["content"].splitlines(), expected)
+
+    def test_tasks_follow_edits(self):
+        """Cached tasks are reparsed once a note changes, and dropped once it's gone."""
+        note = self.vault / "edited.md"
+        note.write_text("- [ ] before")
+        try:
+            call_tool("extract_tasks", {"path": "edited.md"})
+            note.write_text("- [x] after edit")
+            result = call_tool("extract_tasks", {})
+            self.assertIn("- [x] after edit (edited.md)", result["content"])
+            self.assertNotIn("before", result["content"])
+        finally:
+            note.unlink()
+        result = call_tool("extract_tasks", {})
+        self.assertNotIn("edited.md", result["content"])
+
+
+class TestExtractQuotes(VaultTestCase):
+    """Tests for extract_quotes tool."""
+
+    files = {"note.md": "> first\n>second\n>\ntext > not\n>  last"}
+
+    def test_extract_quotes(self):
+        """Consecutive quoted lines form one quote, stripped of their "> " prefix."""
+        result = call_tool("extract_quotes", {"path": "note.md"})
+        self.assertEqual(
+            result["content"], "--- note.md ---\nfirst\nsecond\n\n\n--- note.md ---\nlast"
+        )
+
+    def test_extract_quotes_old_mac_newlines(self):
+        """A ">" after a lone "\r" starts a line, as in text mode."""
+        (self.vault / "mac.md").write_bytes(b"text\r> quoted")
+        result = call_tool("extract_quotes", {"path": "mac.md"})
+        self.assertEqual(result["content"], "--- mac.md ---\nquoted")
+
+
+class TestExtractCodeBlocks(VaultTestCase):
+    """Tests for extract_code_blocks tool."""
+
+    files = {"code.md": "```py\nprint(1)\n```\n", "plain.md": "no fences"}
+
+    def test_extract_code_blocks(self):
+        """Only notes with fences contribute blocks, CRLF notes included."""
+        (self.vault / "crlf.md").write_bytes(b"```sh\r\nls\r\n```\r\n")
+        result = call_tool("extract_code_blocks", {"path": ""})
+        self.assertIn("--- code.md (py) ---\nprint(1)", result["content"])
+        self.assertIn("--- crlf.md (sh) ---\nls", result["content"])
+        self.assertNotIn("plain.md", result["content"])
+
+
+class TestTags(VaultTestCase):
+    """Tests for list_tags and find_by_tag."""
+
+    files = {
+        "plain.md": "no tags here",
+        "work.md": "#project/work and #todo",
+        "joined.md": "#pro`code`ject",
+        "big.md": "filler\n" * 20000 + "#project",
+    }
+
+    def test_list_tags_counts(self):
+        """Should count each note's tags once and skip notes without any."""
+        result = call_tool("list_tags", {})
+        self.assertEqual(
+            result["content"].splitlines(),
+            ["#project (2)", "#project/work (1)", "#todo (1)"],
+        )
+
+    def test_list_tags_limit(self):
+        """limit keeps the most used tags, or the first ones alphabetically."""
+        result = call_tool("list_tags", {"limit": 2})
+        self.assertEqual(result["content"].splitlines(), ["#project (2)", "#project/work (1)"])
+        result = call_tool("list_tags", {"limit": 1, "show_counts": False})
+        self.assertEqual(result["content"], "#project")
+
+    def test_extract_tags_skips_code(self):
+        """Tags inside fenced or inline code are ignored."""
+        from tools.tags import extract_tags
+
+        content = "```\n#fenced\n```\n`#inline` #kept"
+        self.assertEqual(extract_tags(content), {"kept"})
+        self.assertEqual(extract_tags("#a and #b #a"), {"a", "b"})
+
+    def test_find_by_tag_hierarchical(self):
+        """Should match child tags and tags only formed once code is removed."""
+        result = call_tool("find_by_tag", {"tag": "project"})
+        self.assertEqual(result["content"].splitlines(), ["big.md", "joined.md", "work.md"])
+
+    def test_find_by_tag_screen_leaves_cache_exact(self):
+        """Notes screened out for one tag still report all their tags later."""
+        result = call_tool("find_by_tag", {"tag": "todo"})
+        self.assertEqual(result["content"].splitlines(), ["work.md"])
+        result = call_tool("list_tags", {})
+        self.assertIn("#project (2)", result["content"])
+
+    def test_tags_follow_edits(self):
+        """Cached tags are reparsed once a note changes."""
+        call_tool("list_tags", {})
+        (self.vault / "plain.md").write_text("now #todo and #fresh")
+        result = call_tool("list_tags", {})
+        self.assertIn("#fresh (1)", result["content"])
+        self.assertIn("#todo (2)", result["content"])
+        result = call_tool("find_by_tag", {"tag": "fresh"})
+        self.assertEqual(result["content"].splitlines(), ["plain.md"])
+
+
+class TestHiddenDirsSkipped(VaultTestCase):
+    """Vault walks prune dot-directories and skip dotfiles."""
+
+    files = {
+        "notes/visible.md": "needle #tagged",
+        "notes/.draft.md": "needle #tagged",
+        ".obsidian/workspace.md": "needle #tagged",
+    }
+
+    def test_search_skips_hidden(self):
+        """search only reports visible files, with vault-relative paths."""
+        result = call_tool("search", {"query": "needle"})
+        self.assertIn("match: notes/visible.md", result["content"])
+        self.assertNotIn(".draft", result["content"])
+        self.assertNotIn(".obsidian", result["content"])
+
+    def test_find_by_tag_skips_hidden(self):
+        """find_by_tag lists only the visible note."""
+        result = call_tool("find_by_tag", {"tag": "tagged"})
+        self.assertEqual(result["content"].strip().splitlines(), ["notes/visible.md"])
+
+
+class TestThreadMap(unittest.TestCase):
+    """Tests for the ordered thread-pool map used by vault scans."""
+
+    def test_keeps_order_and_stops_early(self):
+        """Results come back in input order and unconsumed items aren't run."""
+        from tools.walk import thread_map
+
+        seen = []
+
+        def work(n):
+            seen.append(n)
+            return n * n
+
+        results = []
+        for result in thread_map(work, range(1000), workers=2):
+            results.append(result)
+            if len(results) == 5:
+                break
+
+        self.assertEqual(results, [0, 1, 4, 9, 16])
+        self.assertLess(len(seen), 20)
+
+
+class TestScanCache(VaultTestCase):
+    """Tests for the per-file parse cache shared by vault scans."""
+
+    def test_reloads_changed_files_and_caps_size(self):
+        """Changed files are reloaded, None isn't kept, and the oldest entry goes first."""
+        from tools.walk import ScanCache
+
+        cache = ScanCache(max_entries=2)
+        paths = []
+        for name in ("a", "b", "c"):
+            path = self.vault / f"{name}.md"
+            path.write_text(name)
+            paths.append(str(path))
+            self.assertEqual(cache.get(str(path), path.stat(), lambda n=name: n), name)
+
+        self.assertEqual(len(cache), 2)
+        a, b, c = paths
+        self.assertEqual(cache.get(b, os.stat(b), lambda: "reloaded"), "b")
+        self.assertEqual(cache.get(a, os.stat(a), lambda: "reloaded"), "reloaded")
+
+        Path(c).write_text("changed")
+        self.assertIsNone(cache.get(c, os.stat(c), lambda: None))
+        self.assertEqual(cache.get(c, os.stat(c), lambda: "new"), "new")
+
+        cache.prune(str(self.vault), {c})
+        self.assertEqual(len(cache), 1)
+
+    def test_prune_while_other_threads_insert(self):
+        """Pruning doesn't trip over entries other threads add mid-iteration."""
+        import threading
+
+        from tools.walk import ScanCache
+
+        cache = ScanCache()
+        st = os.stat(self.vault)
+        stop = threading.Event()
+
+        def fill():
+            n = 0
+            while not stop.is_set():
+                n += 1
+                cache.get(f"{self.vault}/n{n}.md", st, lambda n=n: n)
 
-class TestFileInfo(unittest.TestCase):
-    """Tests for file_info tool."""
+        filler = threading.Thread(target=fill)
+        filler.start()
+        try:
+            for _ in range(200):
+                cache.prune(str(self.vault), set())
+        finally:
+            stop.set()
+            filler.join()
 
-    def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        init_security(Path(self.tmpdir), "test_token")
-        (Path(self.tmpdir) / "test.txt").write_text("hello")
 
-    def tearDown(self):
-        import shutil
+class TestReadTextIfMatch(VaultTestCase):
+    """Tests for the bytes-screened file reader."""
+
+    def test_screens_large_files_through_mmap(self):
+        """Large files are decoded only when the screen matches."""
+        import re
+
+        from tools.walk import MMAP_THRESHOLD, read_text_if_match
+
+        path = self.vault / "big.md"
+        path.write_text("é" * MMAP_THRESHOLD + "needle", encoding="utf-8")
 
-        shutil.rmtree(self.tmpdir)
+        self.assertTrue(
+            read_text_if_match(str(path), re.compile(b"needle").search).endswith("needle")
+        )
+        self.assertIsNone(read_text_if_match(str(path), re.compile(b"missing").search))
+
+    def test_read_text_matches_text_mode(self):
+        """read_text translates newlines like text mode and rejects non-UTF-8."""
+        from tools.walk import read_text
+
+        path = self.vault / "crlf.md"
+        path.write_bytes("a\r\nb\rc\n\u00e9".encode())
+        self.assertEqual(read_text(str(path)), path.read_text(encoding="utf-8"))
+        path.write_bytes(b"\xff")
+        self.assertIsNone(read_text(str(path)))
+
+    def test_literal_screen_ignores_case(self):
+        """literal_screen matches ASCII queries in any case and skips non-ASCII ones."""
+        from tools.walk import literal_screen
+
+        screen = literal_screen("Banana Split")
+        self.assertTrue(screen(b"a BANANA split"))
+        self.assertFalse(screen(b"banana-split"))
+        self.assertTrue(literal_screen("2024-01")(b"on 2024-01-05"))
+        self.assertIsNone(literal_screen("café"))
+
+    def test_literal_screen_passes_unicode_folds(self):
+        """Letters that fold to ASCII (Kelvin sign, dotless i, long s) must not be screened out."""
+        from tools.walk import literal_screen
+
+        for query, text in (("kelvin", "\u212aelvin"), ("pin", "p\u0131n"), ("ask", "a\u017fk")):
+            self.assertTrue(literal_screen(query)(text.encode()), query)
+        self.assertFalse(literal_screen("kelvin")(b"celsius"))
+
+
+class TestDocumentOutline(VaultTestCase):
+    """Tests for document_outline tool."""
+
+    files = {
+        "note.md": "# Title\n\nintro\n## Part one\ntext\n#not a heading\n\n### Deep   \n",
+    }
+
+    def test_outline_with_line_numbers(self):
+        """Should list headings, indented by level, with their line numbers."""
+        result = call_tool("document_outline", {"path": "note.md"})
+        self.assertIsNone(result["error"])
+        self.assertEqual(
+            result["content"], "Title (line 1)\n  Part one (line 4)\n    Deep (line 8)"
+        )
+
+    def test_outline_without_line_numbers(self):
+        """Should omit line numbers when asked."""
+        result = call_tool("document_outline", {"path": "note.md", "include_line_numbers": False})
+        self.assertEqual(result["content"], "Title\n  Part one\n    Deep")
+
+
+class TestBacklinks(VaultTestCase):
+    """Tests for get_backlinks tool."""
+
+    files = {
+        "target.md": "# Target",
+        "linker.md": "Café notes point to [[Target|the target]].",
+        "other.md": "Mentions target without a link.",
+    }
+
+    def test_finds_linking_notes(self):
+        """Only notes with a wikilink to the target are listed, case-insensitively."""
+        result = call_tool("get_backlinks", {"path": "target.md", "include_context": False})
+        self.assertEqual(result["content"], "linker.md")
+
+    def test_reparses_changed_notes(self):
+        """Cached link info is refreshed when a note's content changes."""
+        call_tool("get_backlinks", {"path": "target.md"})
+        (self.vault / "other.md").write_text("Now links [[target]] too, at last.")
+
+        result = call_tool("get_backlinks", {"path": "target.md", "include_context": False})
+        self.assertEqual(set(result["content"].split("\n\n")), {"linker.md", "other.md"})
+
+
+class TestVaultStats(VaultTestCase):
+    """Tests for vault_stats tool."""
+
+    files = {
+        "a.md": "Links to [[b]] and [[#Top]] with #one and #two",
+        "b.md": "no links here",
+    }
+
+    def test_counts_links_and_tags(self):
+        """Links and tags are counted in one scan, tags inside links included."""
+        result = call_tool("vault_stats", {})
+        self.assertIn("Total links: 2", result["content"])
+        self.assertIn("Total tags: 3", result["content"])
+        self.assertIn("Orphan notes: 1", result["content"])
+
+    def test_orphans_match_by_stem(self):
+        """A link reaches notes of that name in any folder, with or without .md."""
+        (self.vault / "sub").mkdir(exist_ok=True)
+        (self.vault / "sub" / "a.md").write_text("[[c.md]]")
+        (self.vault / "c.md").write_text("")
+        (self.vault / "d.md").write_text("")
+        try:
+            result = call_tool("vault_stats", {})
+        finally:
+            for rel in ("sub/a.md", "c.md", "d.md"):
+                (self.vault / rel).unlink()
+        self.assertIn("Orphan notes: 3", result["content"])
+        self.assertIn("  a.md\n  d.md\n  sub/a.md", result["content"])
+
+
+class TestFileInfo(VaultTestCase):
+    """Tests for file_info tool."""
+
+    files = {
+        "test.txt": "hello",
+    }
 
     def test_file_info(self):
         """Should return file metadata."""
@@ -347,6 +1084,261 @@ class TestFileInfo(unittest.TestCase):
         self.assertIn("size: 5", result["content"])
         self.assertIn("modified:", result["content"])
 
+    def test_file_info_reports_git_ignored(self):
+        """Should flag files matched by .gitignore."""
+        vault = self.make_vault("repo")
+        (vault / ".git").mkdir()
+        (vault / ".gitignore").write_text("*.log\n")
+        (vault / "debug.log").write_text("noise")
+        (vault / "test.txt").write_text("hello")
+        (vault / "sub").mkdir()
+        (vault / "sub" / ".gitignore").write_text("!keep.log\n")
+        (vault / "sub" / "keep.log").write_text("kept")
+        (vault / ".git" / "info").mkdir()
+        (vault / ".git" / "info" / "exclude").write_text("scratch.txt\n")
+        (vault / "scratch.txt").write_text("local")
+        refresh_vault_state()
+
+        ignored = call_tool("file_info", {"path": "debug.log"})
+        kept = call_tool("file_info", {"path": "test.txt"})
+        self.assertIn("git: ignored", ignored["content"])
+        self.assertNotIn("git: ignored", kept["content"])
+        # A deeper .gitignore's negation overrides the root pattern
+        negated = call_tool("file_info", {"path": "sub/keep.log"})
+        self.assertNotIn("git: ignored", negated["content"])
+        excluded = call_tool("file_info", {"path": "scratch.txt"})
+        self.assertIn("git: ignored", excluded["content"])
+
+    def test_file_info_git_ignored_via_libgit2(self):
+        """Should consult libgit2 when pygit2 is installed."""
+        try:
+            import pygit2
+        except ImportError:
+            self.skipTest("pygit2 not installed")
+
+        vault = self.make_vault("libgit2-repo")
+        pygit2.init_repository(str(vault))
+        (vault / ".gitignore").write_text("build/\n")
+        (vault / "build").mkdir()
+        (vault / "build" / "out.txt").write_text("artifact")
+        refresh_vault_state()
+
+        result = call_tool("file_info", {"path": "build/out.txt"})
+        self.assertIn("git: ignored", result["content"])
+
+
+class TestGetFrontmatter(VaultTestCase):
+    """Tests for get_frontmatter tool."""
+
+    files = {
+        "meta.md": "---\ntitle: Hello\n---\nbody",
+        "plain.md": "just a body\n---\nnot: frontmatter\n---\n",
+    }
+
+    def test_get_frontmatter(self):
+        """Should parse frontmatter only at the very start of a note."""
+        result = call_tool("get_frontmatter", {"path": "meta.md"})
+        self.assertIn('"title": "Hello"', result["content"])
+        result = call_tool("get_frontmatter", {"path": "plain.md"})
+        self.assertEqual(result["content"], "(no frontmatter)")
+
+
+class TestAppendPeriodic(VaultTestCase):
+    """Tests for append_periodic tool."""
+
+    def test_creates_then_appends(self):
+        """Should write frontmatter only when creating the note."""
+        args = {"period": "daily", "date": "2024-04-05", "content": "first"}
+        result = call_tool("append_periodic", args)
+        self.assertTrue(result["content"].startswith("Created "))
+        result = call_tool("append_periodic", {**args, "content": "second"})
+        self.assertTrue(result["content"].startswith("Appended to "))
+
+        text = (self.vault / result["content"].removeprefix("Appended to ")).read_text()
+        self.assertTrue(text.startswith("---\ntitle: 2024-04-05\n"))
+        self.assertEqual(text.count("---\n"), 2)
+        self.assertTrue(text.endswith("\n\nfirst\nsecond"))
+
+
+class TestSaveConversation(VaultTestCase):
+    """Tests for save_conversation tool."""
+
+    def test_appends_under_one_date_header(self):
+        """Should group messages by date and write the header only once."""
+        from tools.memory import CONVERSATIONS_DIR
+
+        msg = {"role": "user", "content": "hi", "timestamp": "2024-01-02T10:00:00Z"}
+        for _ in range(2):
+            result = call_tool("save_conversation", {"messages": [msg], "user_id": 1})
+            self.assertIsNone(result["error"])
+
+        text = (self.vault / CONVERSATIONS_DIR / "2024-01-02.md").read_text()
+        self.assertEqual(text.count("## 2024-01-02"), 1)
+        self.assertEqual(text.count("### 10:00 AM\n**User**: hi\n"), 2)
+
+    def test_list_dates_newest_first(self):
+        """Should list each saved day once, newest first."""
+        msgs = [
+            {"role": "user", "content": "a", "timestamp": f"2023-03-0{day}T09:00:00Z"}
+            for day in (1, 3, 2)
+        ]
+        call_tool("save_conversation", {"messages": msgs, "user_id": 1})
+
+        result = call_tool("list_conversation_dates", {})
+        lines = result["content"].splitlines()[1:]
+        dates = [line for line in lines if line.startswith("- 2023-03")]
+        self.assertEqual(dates, ["- 2023-03-03", "- 2023-03-02", "- 2023-03-01"])
+
+    def test_search_finds_saved_sections(self):
+        """Should return matching sections and skip files without the query."""
+        msgs = [
+            {"role": "user", "content": "Plan the Garden", "timestamp": "2024-02-01T09:00:00Z"},
+            {"role": "user", "content": "unrelated", "timestamp": "2024-02-02T09:00:00Z"},
+        ]
+        call_tool("save_conversation", {"messages": msgs, "user_id": 1})
+
+        result = call_tool("search_conversations", {"query": "garden"})
+        self.assertIsNone(result["error"])
+        self.assertIn("**2024-02-01**", result["content"])
+        self.assertNotIn("2024-02-02", result["content"])
+
+    def test_get_conversation_tail(self):
+        """Should return only the last lines fitting in tail_bytes."""
+        from tools.memory import CONVERSATIONS_DIR
+
+        (self.vault / CONVERSATIONS_DIR).mkdir(parents=True, exist_ok=True)
+        (self.vault / CONVERSATIONS_DIR / "2024-03-01.md").write_text(
+            "one\ntwo\nthree\n", encoding="utf-8"
+        )
+        args = {"date": "2024-03-01"}
+        self.assertEqual(call_tool("get_conversation", args)["content"], "one\ntwo\nthree\n")
+        for tail, expected in [
+            (6, "three\n"),
+            (7, "three\n"),
+            (10, "two\nthree\n"),
+            (99, "one\ntwo\nthree\n"),
+        ]:
+            result = call_tool("get_conversation", {**args, "tail_bytes": tail})
+            self.assertEqual(result["content"], expected, tail)
+
+    def test_search_sees_appended_messages(self):
+        """Should search a day's file again after it changes."""
+        msg = {"role": "user", "content": "first", "timestamp": "2024-02-03T09:00:00Z"}
+        call_tool("save_conversation", {"messages": [msg], "user_id": 1})
+        result = call_tool("search_conversations", {"query": "first"})
+        self.assertIn("**2024-02-03**", result["content"])
+
+        msg = {"role": "user", "content": "orchard", "timestamp": "2024-02-03T10:00:00Z"}
+        call_tool("save_conversation", {"messages": [msg], "user_id": 1})
+        result = call_tool("search_conversations", {"query": "orchard"})
+        self.assertIn("**2024-02-03**", result["content"])
+
+
+class TestSkills(unittest.TestCase):
+    """Tests for skill discovery in ~/.ludolph/skills/."""
+
+    @pytest.fixture(autouse=True)
+    def _home(self, tmp_path, monkeypatch):
+        import sys
+
+        import tools
+
+        self.skills_dir = tmp_path / ".ludolph" / "skills"
+        self.skills_dir.mkdir(parents=True)
+        monkeypatch.setattr(Path, "home", classmethod(lambda cls: tmp_path))
+        yield
+        monkeypatch.undo()
+        tools.reload_tools()
+        for name in [m for m in sys.modules if m.startswith("ludolph_skill_")]:
+            del sys.modules[name]
+
+    def write_skill(self, name: str, tools_src: str) -> None:
+        (self.skills_dir / f"{name}.py").write_text(
+            f"TOOLS = {tools_src}\n"
+            "HANDLERS = {'greet': lambda args: {'content': 'hi', 'error': None}}\n"
+        )
+
+    def test_literal_skill_imported_on_first_call(self):
+        """Skills with a literal TOOLS list are only executed when called."""
+        import sys
+
+        import tools
+
+        self.write_skill("greeter", "[{'name': 'greet', 'input_schema': {'type': 'object'}}]")
+        tools.reload_tools()
+
+        self.assertIn("greet", [t["name"] for t in tools.get_tool_definitions()])
+        self.assertNotIn("ludolph_skill_greeter", sys.modules)
+
+        result = call_tool("greet", {})
+        self.assertEqual(result, {"content": "hi", "error": None})
+        self.assertIn("ludolph_skill_greeter", sys.modules)
+
+    def test_failed_lazy_import_keeps_reporting_its_error(self):
+        """A lazy skill that raises on import reports that error on every call."""
+        import tools
+
+        (self.skills_dir / "broken.py").write_text(
+            "TOOLS = [{'name': 'boom'}]\nraise RuntimeError('kaboom')\n"
+        )
+        tools.reload_tools()
+
+        for _ in range(2):
+            result = call_tool("boom", {})
+            self.assertEqual(result["error"], "Failed to load skill for boom: kaboom")
+
+    def test_computed_skill_imported_up_front(self):
+        """Skills that build TOOLS in code are still imported at load time."""
+        import sys
+
+        import tools
+
+        self.write_skill("greeter", "[dict(name='greet')]")
+        tools.reload_tools()
+
+        self.assertIn("ludolph_skill_greeter", sys.modules)
+        self.assertEqual(call_tool("greet", {})["content"], "hi")
+
+    def test_list_skills_recounts_changed_files(self):
+        """list_skills should pick up edits to a skill it listed before."""
+        from unittest.mock import patch
+
+        import tools.meta
+
+        with patch.object(tools.meta, "SKILLS_DIR", self.skills_dir):
+            self.write_skill("greeter", "[{'name': 'greet'}]")
+            self.assertIn("- greeter (1 tool(s))", call_tool("list_skills", {})["content"])
+            self.write_skill("greeter", "[{'name': 'greet'}, {\"name\": 'wave'}]")
+            self.assertIn("- greeter (2 tool(s))", call_tool("list_skills", {})["content"])
+
+    def test_validate_skill_code_checks_syntax_tree(self):
+        """Forbidden constructs are found however they're spelled, mentions aren't."""
+        from tools.meta import _validate_skill_code
+
+        header = "TOOLS = [{'name': 'x', 'input_schema': {}}]\nHANDLERS = {}\n"
+        self.assertIsNone(
+            _validate_skill_code(header + "# no eval() here\nopen(p).read()\nre.compile('x')\n")
+        )
+        for body in ("Path(p).open()", "Path(p).open('rb')", "io.open(p)", "io.open('data.txt')"):
+            self.assertIsNone(_validate_skill_code(header + body), body)
+        for body in (
+            "import os\nos.system('ls')",
+            "import subprocess as sp",
+            "f = eval",
+            "import builtins\nbuiltins.exec('1')",
+            "import importlib\nimportlib.import_module('subprocess')",
+            "open(p, 'a')",
+            "open(p, mode=m)",
+            "Path(p).open('w')",
+            "Path(p).open(mode='a')",
+            "io.open(p, 'w')",
+            "io.open(p, m)",
+        ):
+            error = _validate_skill_code(header + body)
+            self.assertIsNotNone(error, body)
+            self.assertTrue(error.startswith("Forbidden pattern detected: "), error)
+        self.assertTrue(_validate_skill_code(header + "return 1").startswith("Syntax error"))
+
 
 if __name__ == "__main__":
     unittest.main()
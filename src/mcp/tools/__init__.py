@@ -3,14 +3,23 @@
 Aggregates tools from all domain-specific modules and provides
 a unified interface for tool definitions and execution.
 
-Skills in ~/.ludolph/skills/ are auto-discovered and loaded.
+Skills in ~/.ludolph/skills/ are auto-discovered; those declaring TOOLS
+as a plain literal are imported on first use.
 """
 
+import ast
 import importlib.util
 import sys
+import threading
+from itertools import chain
 from pathlib import Path
 from typing import Any
 
+try:
+    import fastjsonschema
+except ImportError:  # Optional; arguments go to handlers unvalidated without it
+    fastjsonschema = None
+
 from . import (
     analysis,
     analytics,
@@ -40,68 +49,87 @@ from . import (
     text,
 )
 
-# Aggregate core tool definitions
-_CORE_TOOLS = (
-    files.TOOLS
-    + directories.TOOLS
-    + search.TOOLS
-    + metadata.TOOLS
-    + editing.TOOLS
-    + history.TOOLS
-    + index.TOOLS
-    + periodic.TOOLS
-    + batch.TOOLS
-    + tags.TOOLS
-    + analysis.TOOLS
-    + tasks.TOOLS
-    + text.TOOLS
-    + backlinks.TOOLS
-    + analytics.TOOLS
-    + learn.TOOLS
-    + memory.TOOLS
-    + obligations.TOOLS
-    + observations.TOOLS
-    + publish.TOOLS
-    + schedules.TOOLS
-    + meta.TOOLS
-    + semantic.TOOLS
-    + teach.TOOLS
-    + telegram.TOOLS
-    + conversation.TOOLS
+# Core tool modules, in the order their tools are listed
+_CORE_MODULES = (
+    files,
+    directories,
+    search,
+    metadata,
+    editing,
+    history,
+    index,
+    periodic,
+    batch,
+    tags,
+    analysis,
+    tasks,
+    text,
+    backlinks,
+    analytics,
+    learn,
+    memory,
+    obligations,
+    observations,
+    publish,
+    schedules,
+    meta,
+    semantic,
+    teach,
+    telegram,
+    conversation,
 )
 
-# Aggregate core handlers
-_CORE_HANDLERS = {
-    **files.HANDLERS,
-    **directories.HANDLERS,
-    **search.HANDLERS,
-    **metadata.HANDLERS,
-    **editing.HANDLERS,
-    **history.HANDLERS,
-    **index.HANDLERS,
-    **periodic.HANDLERS,
-    **batch.HANDLERS,
-    **tags.HANDLERS,
-    **analysis.HANDLERS,
-    **tasks.HANDLERS,
-    **text.HANDLERS,
-    **backlinks.HANDLERS,
-    **analytics.HANDLERS,
-    **learn.HANDLERS,
-    **memory.HANDLERS,
-    **obligations.HANDLERS,
-    **observations.HANDLERS,
-    **publish.HANDLERS,
-    **schedules.HANDLERS,
-    **meta.HANDLERS,
-    **semantic.HANDLERS,
-    **teach.HANDLERS,
-    **telegram.HANDLERS,
-    **conversation.HANDLERS,
-}
-
-
-def _load_skills() -> tuple[list[dict], dict[str, Any]]:
+# Aggregate core tool definitions and handlers
+_CORE_TOOLS = tuple(chain.from_iterable(m.TOOLS for m in _CORE_MODULES))
+_CORE_HANDLERS = dict(chain.from_iterable(m.HANDLERS.items() for m in _CORE_MODULES))
+
+
+def _declared_tools(py_file: Path) -> list[dict] | None:
+    """
+    Read a skill's TOOLS list from its source without executing it.
+
+    Returns:
+        The TOOLS literal, or None if the file doesn't bind TOOLS exactly
+        once to a literal list of named tool dicts (the skill is then
+        imported up front instead)
+    """
+    try:
+        tree = ast.parse(py_file.read_text(encoding="utf-8"), filename=str(py_file))
+    except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+        return None
+
+    # Any other use of the name (TOOLS += ..., TOOLS.append) may change it
+    uses = [node for node in ast.walk(tree) if isinstance(node, ast.Name) and node.id == "TOOLS"]
+    if len(uses) != 1:
+        return None
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and node.targets == [uses[0]]:
+            try:
+                tools = ast.literal_eval(node.value)
+            except ValueError:
+                return None
+            if isinstance(tools, list) and all(
+                isinstance(t, dict) and isinstance(t.get("name"), str) for t in tools
+            ):
+                return tools
+    return None
+
+
+def _exec_skill(py_file: Path):
+    """Import a skill file as module ludolph_skill_<stem>, or return None."""
+    module_name = f"ludolph_skill_{py_file.stem}"
+    spec = importlib.util.spec_from_file_location(module_name, py_file)
+    if spec is None or spec.loader is None:
+        return None
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_skills() -> tuple[list[dict], dict[str, Any], dict[str, Path]]:
     """
     Load user-created skills from ~/.ludolph/skills/.
 
@@ -109,13 +137,19 @@ def _load_skills() -> tuple[list[dict], dict[str, Any]]:
     - TOOLS: list of tool definitions (dicts)
     - HANDLERS: dict mapping tool names to handler functions
 
+    Skills whose TOOLS is a plain literal are not imported here: their
+    definitions are read with ast, and the module (with whatever it
+    imports) is only executed on the first call to one of its tools.
+
     Returns:
-        Tuple of (tools_list, handlers_dict)
+        Tuple of (tools_list, handlers_dict, lazy_skills) where lazy_skills
+        maps tool names to the not-yet-imported skill file providing them
     """
     skills_dir = Path.home() / ".ludolph" / "skills"
     legacy_dir = Path.home() / ".ludolph" / "custom_tools"
     tools: list[dict] = []
     handlers: dict[str, Any] = {}
+    lazy: dict[str, Path] = {}
 
     # Migration: rename custom_tools/ to skills/
     if legacy_dir.exists() and not skills_dir.exists():
@@ -123,22 +157,23 @@ def _load_skills() -> tuple[list[dict], dict[str, Any]]:
         print("Migrated custom_tools/ to skills/")
 
     if not skills_dir.exists():
-        return tools, handlers
+        return tools, handlers, lazy
 
     for py_file in sorted(skills_dir.glob("*.py")):
         if py_file.name.startswith("_"):
             continue
 
-        module_name = f"ludolph_skill_{py_file.stem}"
+        declared = _declared_tools(py_file)
+        if declared is not None:
+            tools.extend(declared)
+            lazy.update((tool["name"], py_file) for tool in declared)
+            continue
+
         try:
-            spec = importlib.util.spec_from_file_location(module_name, py_file)
-            if spec is None or spec.loader is None:
+            module = _exec_skill(py_file)
+            if module is None:
                 continue
 
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[module_name] = module
-            spec.loader.exec_module(module)
-
             if hasattr(module, "TOOLS"):
                 tools.extend(module.TOOLS)
             if hasattr(module, "HANDLERS"):
@@ -148,34 +183,88 @@ def _load_skills() -> tuple[list[dict], dict[str, Any]]:
             # Log warning but don't crash - skills shouldn't break core
             print(f"Warning: Failed to load skill {py_file.name}: {e}")
 
-    return tools, handlers
+    return tools, handlers, lazy
 
 
 # Load skills and combine with core
-_skills, _skill_handlers = _load_skills()
+_skills, _skill_handlers, _LAZY_SKILLS = _load_skills()
 TOOLS = list(_CORE_TOOLS) + _skills
 HANDLERS = {**_CORE_HANDLERS, **_skill_handlers}
 
+# Held while a lazy skill is imported, so concurrent calls import it once
+_LAZY_LOCK = threading.Lock()
+
+# Compiled input_schema validators by tool name, built on first call
+_VALIDATORS: dict[str, Any] = {}
+
 
 def reload_tools() -> None:
     """Reload skills without restarting the server.
 
     Called by SIGHUP handler to hot-reload skills.
     """
-    global TOOLS, HANDLERS
+    global TOOLS, HANDLERS, _LAZY_SKILLS
 
-    _skills, _skill_handlers = _load_skills()
+    _skills, _skill_handlers, _LAZY_SKILLS = _load_skills()
     TOOLS = list(_CORE_TOOLS) + _skills
     HANDLERS = {**_CORE_HANDLERS, **_skill_handlers}
+    _VALIDATORS.clear()
 
     print(f"Reloaded tools: {len(TOOLS)} total ({len(_skills)} skills)")
 
 
+def _import_lazy_skill(name: str):
+    """
+    Import the skill providing tool name and register its handlers.
+
+    Returns:
+        The tool's handler, or None if the skill doesn't define one
+
+    Raises:
+        Exception: Whatever executing the skill file raised
+    """
+    with _LAZY_LOCK:
+        py_file = _LAZY_SKILLS.get(name)
+        if py_file is None:
+            # Another call imported it while we waited
+            return HANDLERS.get(name)
+
+        # Entries go only once the skill ran: if it raises, later calls
+        # retry and report its error rather than "Unknown tool"
+        module = _exec_skill(py_file)
+        HANDLERS.update(getattr(module, "HANDLERS", {}))
+        for tool_name in [n for n, f in _LAZY_SKILLS.items() if f == py_file]:
+            del _LAZY_SKILLS[tool_name]
+        return HANDLERS.get(name)
+
+
 def get_tool_definitions() -> list[dict]:
     """Return all tool definitions."""
     return TOOLS
 
 
+def _get_validator(name: str):
+    """
+    Return the compiled input_schema validator for a tool.
+
+    fastjsonschema generates Python code specialized to each schema, so
+    compiling once and reusing it keeps validation cheap per call. Tools
+    without a schema, or whose schema fails to compile, get None.
+    """
+    if name in _VALIDATORS:
+        return _VALIDATORS[name]
+
+    validator = None
+    schema = next((t.get("input_schema") for t in TOOLS if t.get("name") == name), None)
+    if schema:
+        try:
+            validator = fastjsonschema.compile(schema, use_default=False)
+        except fastjsonschema.JsonSchemaDefinitionException as e:
+            print(f"Warning: Invalid input_schema for {name}: {e}")
+    _VALIDATORS[name] = validator
+    return validator
+
+
 def call_tool(name: str, arguments: dict[str, Any]) -> dict[str, Any]:
     """
     Execute a tool and return the result.
@@ -184,9 +273,22 @@ def call_tool(name: str, arguments: dict[str, Any]) -> dict[str, Any]:
         Dict with 'content' (str) and 'error' (str|None) keys
     """
     handler = HANDLERS.get(name)
+    if not handler and name in _LAZY_SKILLS:
+        try:
+            handler = _import_lazy_skill(name)
+        except Exception as e:
+            return {"content": "", "error": f"Failed to load skill for {name}: {e}"}
     if not handler:
         return {"content": "", "error": f"Unknown tool: {name}"}
 
+    if fastjsonschema is not None:
+        validator = _get_validator(name)
+        if validator is not None:
+            try:
+                validator(arguments)
+            except fastjsonschema.JsonSchemaValueException as e:
+                return {"content": "", "error": f"Invalid input: {e.message}"}
+
     try:
         return handler(arguments)
     except Exception as e:
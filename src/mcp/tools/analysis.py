@@ -1,14 +1,17 @@
 """Document analysis operations module."""
 
 import re
+import stat
 
-from security import safe_path
+from security import safe_path, stat_path
 
 # Regex for wikilinks: [[target]] or [[target|alias]]
 WIKILINK_RE = re.compile(r"\[\[([^\]|]+)(?:\|[^\]]+)?\]\]")
 
-# Regex for external URLs (markdown links or bare URLs)
-URL_RE = re.compile(r"\[([^\]]+)\]\((https?://[^\)]+)\)|(?<!\()https?://[^\s\)]+")
+# Regex for external URLs (markdown links or bare URLs). The bare-URL
+# lookbehind sits after the "h" so the pattern starts with a literal,
+# letting the scan skip ahead instead of trying every position.
+URL_RE = re.compile(r"\[([^\]]+)\]\((https?://[^\)]+)\)|h(?<!\(h)ttps?://[^\s\)]+")
 
 # Regex for embeds: ![[file]] or ![[file|display]]
 EMBED_RE = re.compile(r"!\[\[([^\]|]+)(?:\|[^\]]+)?\]\]")
@@ -17,6 +20,9 @@ EMBED_RE = re.compile(r"!\[\[([^\]|]+)(?:\|[^\]]+)?\]\]")
 FOOTNOTE_DEF_RE = re.compile(r"^\[\^([^\]]+)\]:\s*(.+)$", re.MULTILINE)
 FOOTNOTE_REF_RE = re.compile(r"\[\^([^\]]+)\]")
 
+# Regex for ATX headings; [^\S\n] keeps the whitespace run on one line
+HEADING_RE = re.compile(r"^(#{1,6})[^\S\n]+(.+)$", re.MULTILINE)
+
 TOOLS = [
     {
         "name": "document_outline",
@@ -75,30 +81,32 @@ def _document_outline(args: dict) -> dict:
     path = safe_path(args.get("path", ""))
     if not path:
         return {"content": "", "error": "Invalid path"}
-    if not path.exists():
+    st = stat_path(path)
+    if st is None:
         return {"content": "", "error": f"File not found: {args.get('path')}"}
-    if not path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         return {"content": "", "error": "Path is not a file"}
 
     include_line_numbers = args.get("include_line_numbers", True)
 
     content = path.read_text(encoding="utf-8")
-    lines = content.split("\n")
 
     outline = []
-    heading_pattern = re.compile(r"^(#{1,6})\s+(.+)$")
-
-    for i, line in enumerate(lines, 1):
-        match = heading_pattern.match(line)
-        if match:
-            level = len(match.group(1))
-            text = match.group(2).strip()
-            indent = "  " * (level - 1)
-
-            if include_line_numbers:
-                outline.append(f"{indent}{text} (line {i})")
-            else:
-                outline.append(f"{indent}{text}")
+    # Scan the whole text at once; line numbers come from counting the
+    # newlines between consecutive headings instead of splitting lines
+    line_no, pos = 1, 0
+
+    for match in HEADING_RE.finditer(content):
+        level = len(match.group(1))
+        text = match.group(2).strip()
+        indent = "  " * (level - 1)
+
+        if include_line_numbers:
+            line_no += content.count("\n", pos, match.start())
+            pos = match.start()
+            outline.append(f"{indent}{text} (line {line_no})")
+        else:
+            outline.append(f"{indent}{text}")
 
     if not outline:
         return {"content": "(no headings found)", "error": None}
@@ -111,9 +119,10 @@ def _get_links(args: dict) -> dict:
     path = safe_path(args.get("path", ""))
     if not path:
         return {"content": "", "error": "Invalid path"}
-    if not path.exists():
+    st = stat_path(path)
+    if st is None:
         return {"content": "", "error": f"File not found: {args.get('path')}"}
-    if not path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         return {"content": "", "error": "Path is not a file"}
 
     link_type = args.get("link_type", "all")
@@ -160,9 +169,10 @@ def _get_footnotes(args: dict) -> dict:
     path = safe_path(args.get("path", ""))
     if not path:
         return {"content": "", "error": "Invalid path"}
-    if not path.exists():
+    st = stat_path(path)
+    if st is None:
         return {"content": "", "error": f"File not found: {args.get('path')}"}
-    if not path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         return {"content": "", "error": "Path is not a file"}
 
     content = path.read_text(encoding="utf-8")
@@ -204,9 +214,10 @@ def _get_embeds(args: dict) -> dict:
     path = safe_path(args.get("path", ""))
     if not path:
         return {"content": "", "error": "Invalid path"}
-    if not path.exists():
+    st = stat_path(path)
+    if st is None:
         return {"content": "", "error": f"File not found: {args.get('path')}"}
-    if not path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         return {"content": "", "error": "Path is not a file"}
 
     content = path.read_text(encoding="utf-8")
@@ -1,10 +1,10 @@
 """Vault analytics operations module."""
 
-from datetime import datetime
+from datetime import date, datetime
 
 from security import get_vault_path, safe_path
-from .analysis import WIKILINK_RE
-from .tags import TAG_PATTERN
+from .notes import note_info, prune_note_cache
+from .walk import thread_map, walk_visible
 
 TOOLS = [
     {
@@ -64,57 +64,45 @@ def _vault_stats(args: dict) -> dict:
     total_links = 0
     total_tags = 0
 
-    all_files = set()
-    linked_files = set()
-
-    for path in search_path.rglob("*"):
-        if any(p.startswith(".") for p in path.parts):
-            continue
-
-        if path.is_dir():
+    # Note stems -> rel paths (a stem can repeat across folders), and the
+    # stems wikilinks point at; orphans are the difference
+    notes_by_stem: dict[str, list[str]] = {}
+    linked_stems = set()
+
+    def read(item: tuple) -> tuple:
+        entry, rel_path = item
+        is_dir = entry.is_dir()
+        md = not is_dir and entry.name.endswith(".md")
+        return entry.path, rel_path, is_dir, md, note_info(entry) if md else None
+
+    # Notes are parsed on worker threads (or come from the note cache)
+    seen = set()
+    walk = walk_visible(search_path, get_vault_path(), include_dirs=True)
+    for path, rel_path, is_dir, md, info in thread_map(read, walk):
+        if is_dir:
             total_dirs += 1
-        elif path.is_file():
-            total_files += 1
-            rel_path = path.relative_to(get_vault_path())
-            all_files.add(str(rel_path))
-
-            if path.suffix == ".md":
-                markdown_files += 1
-
-                try:
-                    content = path.read_text(encoding="utf-8")
-
-                    # Count words
-                    words = len(content.split())
-                    total_words += words
+            continue
 
-                    # Count wikilinks
-                    links = WIKILINK_RE.findall(content)
-                    total_links += len(links)
+        total_files += 1
+        if not md:
+            continue
 
-                    # Track linked files for orphan detection
-                    for link in links:
-                        # Check both with and without .md extension
-                        linked_files.add(f"{link}.md")
-                        linked_files.add(link)
+        markdown_files += 1
+        seen.add(path)
+        notes_by_stem.setdefault(rel_path.rpartition("/")[2][:-3], []).append(rel_path)
+        if info is None:
+            continue
 
-                    # Count tags
-                    tags = TAG_PATTERN.findall(content)
-                    total_tags += len(tags)
+        total_words += info.words
+        total_tags += info.tags
+        total_links += len(info.links)
+        # [[note]] and [[note.md]] both link to note.md
+        linked_stems.update(link[:-3] if link.endswith(".md") else link for link in info.links)
 
-                except Exception:
-                    pass
+    prune_note_cache(str(search_path), seen)
 
     # Find orphan notes (markdown files with no incoming links)
-    orphans = []
-    for file_path in all_files:
-        if file_path.endswith(".md"):
-            name = file_path.split("/")[-1]
-            stem = name[:-3] if name.endswith(".md") else name
-
-            # Check if any file links to this one
-            if name not in linked_files and stem not in linked_files:
-                orphans.append(file_path)
+    orphans = [rel for stem in notes_by_stem.keys() - linked_stems for rel in notes_by_stem[stem]]
 
     lines = [
         f"Files: {total_files:,}",
@@ -168,28 +156,16 @@ def _date_range(args: dict) -> dict:
         search_path = get_vault_path()
 
     results = []
+    ts_attr = "st_ctime" if date_type == "created" else "st_mtime"
 
-    for path in search_path.rglob("*"):
-        if not path.is_file():
-            continue
-        if any(p.startswith(".") for p in path.parts):
-            continue
-
+    # entry.stat() is cached on the DirEntry, so each file costs one stat
+    for entry, rel_path in walk_visible(search_path, get_vault_path()):
         try:
-            stat = path.stat()
-
-            if date_type == "created":
-                file_ts = stat.st_ctime
-            else:
-                file_ts = stat.st_mtime
-
-            if start_ts <= file_ts <= end_ts:
-                rel_path = path.relative_to(get_vault_path())
-                file_date = datetime.fromtimestamp(file_ts).strftime("%Y-%m-%d")
-                results.append((file_ts, f"{file_date} {rel_path}"))
-
-        except Exception:
-            pass
+            file_ts = getattr(entry.stat(), ts_attr)
+        except OSError:
+            continue
+        if start_ts <= file_ts <= end_ts:
+            results.append((file_ts, rel_path))
 
     # Sort by date, newest first
     results.sort(reverse=True)
@@ -197,7 +173,12 @@ def _date_range(args: dict) -> dict:
     if not results:
         return {"content": "(no files found in date range)", "error": None}
 
-    lines = [item[1] for item in results[:50]]
+    # Only the listed files need their dates formatted; date's ISO form is
+    # YYYY-MM-DD without going through strftime
+    lines = [
+        f"{date.fromtimestamp(file_ts).isoformat()} {rel_path}"
+        for file_ts, rel_path in results[:50]
+    ]
     if len(results) > 50:
         lines.append(f"... and {len(results) - 50} more")
 
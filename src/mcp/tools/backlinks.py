@@ -1,9 +1,14 @@
 """Backlinks and recent files operations module."""
 
+import functools
 import re
+import time
 from datetime import datetime
+from itertools import islice
 
 from security import get_vault_path, safe_path
+from tools.notes import note_info, prune_note_cache
+from tools.walk import read_text, thread_map, walk_visible
 
 TOOLS = [
     {
@@ -46,6 +51,12 @@ TOOLS = [
 ]
 
 
+@functools.lru_cache(maxsize=256)
+def _backlink_pattern(target_name: str) -> re.Pattern:
+    """Pattern matching [[target]] or [[target|alias]], case-insensitively."""
+    return re.compile(rf"\[\[{re.escape(target_name)}(?:\|[^\]]+)?\]\]", re.IGNORECASE)
+
+
 def _get_backlinks(args: dict) -> dict:
     """Find all files that link to a specific file."""
     target_path = args.get("path", "")
@@ -59,39 +70,44 @@ def _get_backlinks(args: dict) -> dict:
     if target_name.endswith(".md"):
         target_name = target_name[:-3]
 
-    # Build pattern to match wikilinks to this file
-    # Matches [[target]] or [[target|alias]]
-    pattern = re.compile(rf"\[\[{re.escape(target_name)}(?:\|[^\]]+)?\]\]", re.IGNORECASE)
+    pattern = _backlink_pattern(target_name)
 
     vault = get_vault_path()
     results = []
 
-    for file_path in vault.rglob("*.md"):
-        if any(p.startswith(".") for p in file_path.parts):
-            continue
+    # The note cache answers "does this note link to the target?" from
+    # its parsed wikilinks; only linking notes are read for context
+    target_key = target_name.lower()
+    seen = set()
 
-        try:
-            content = file_path.read_text(encoding="utf-8")
-            matches = list(pattern.finditer(content))
+    def read(item: tuple) -> tuple:
+        entry, rel_path = item
+        return entry.path, rel_path, note_info(entry)
 
-            if matches:
-                rel_path = file_path.relative_to(vault)
+    for path, rel_path, info in thread_map(read, walk_visible(vault, suffix=".md")):
+        seen.add(path)
+        if info is None or target_key not in info.link_keys:
+            continue
 
-                if include_context:
-                    # Extract context around each match (limit to 3)
-                    contexts = []
-                    for match in matches[:3]:
-                        start = max(0, match.start() - 40)
-                        end = min(len(content), match.end() + 40)
-                        ctx = content[start:end].replace("\n", " ")
-                        contexts.append(f"  ...{ctx}...")
+        content = read_text(path)
+        # Only the first 3 matches are shown, so stop scanning there
+        matches = list(islice(pattern.finditer(content), 3)) if content is not None else []
 
-                    results.append(f"{rel_path}:\n" + "\n".join(contexts))
-                else:
-                    results.append(str(rel_path))
+        if matches:
+            if include_context:
+                # Extract context around each match
+                contexts = []
+                for match in matches:
+                    start = max(0, match.start() - 40)
+                    end = min(len(content), match.end() + 40)
+                    ctx = content[start:end].replace("\n", " ")
+                    contexts.append(f"  ...{ctx}...")
 
-        except Exception:
-            pass
+                results.append(f"{rel_path}:\n" + "\n".join(contexts))
+            else:
+                results.append(rel_path)
+
+    prune_note_cache(str(vault), seen)
 
     if not results:
         return {"content": f"No files link to {target_path}", "error": None}
@@ -115,19 +131,13 @@ def _recent_files(args: dict) -> dict:
 
     files_with_mtime = []
 
-    for file_path in search_path.rglob("*"):
-        if not file_path.is_file():
-            continue
-        if any(p.startswith(".") for p in file_path.parts):
-            continue
-
+    for entry, rel_path in walk_visible(search_path, get_vault_path()):
         try:
-            mtime = file_path.stat().st_mtime
+            mtime = entry.stat().st_mtime
 
             if cutoff and mtime < cutoff:
                 continue
 
-            rel_path = file_path.relative_to(get_vault_path())
             files_with_mtime.append((mtime, rel_path))
         except Exception:
             pass
@@ -143,7 +153,8 @@ def _recent_files(args: dict) -> dict:
 
     lines = []
     for mtime, rel_path in files_with_mtime:
-        timestamp = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M")
+        # time.strftime skips building a datetime per line
+        timestamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime))
         lines.append(f"{timestamp} {rel_path}")
 
     return {"content": "\n".join(lines), "error": None}
@@ -1,8 +1,15 @@
 """Batch operations module."""
 
 import json
+import stat
 
-from security import safe_path
+from security import safe_path, stat_path
+from tools.walk import thread_map
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is the fallback
+    orjson = None
 
 TOOLS = [
     {
@@ -23,6 +30,23 @@ TOOLS = [
 ]
 
 
+def _read_one(rel_path: str) -> dict:
+    """Read one file for read_files, as {"content": ...} or {"error": ...}."""
+    path = safe_path(rel_path)
+
+    if not path:
+        return {"error": "Invalid path"}
+    st = stat_path(path)
+    if st is None:
+        return {"error": "File not found"}
+    if not stat.S_ISREG(st.st_mode):
+        return {"error": "Not a file"}
+    try:
+        return {"content": path.read_text(encoding="utf-8")}
+    except Exception as e:
+        return {"error": str(e)}
+
+
 def _read_files(args: dict) -> dict:
     """Read multiple files in a single request."""
     paths = args.get("paths", [])
@@ -33,25 +57,16 @@ def _read_files(args: dict) -> dict:
     # Limit to 20 files to prevent resource exhaustion
     paths = paths[:20]
 
-    results = {}
-
-    for rel_path in paths:
-        path = safe_path(rel_path)
-
-        if not path:
-            results[rel_path] = {"error": "Invalid path"}
-        elif not path.exists():
-            results[rel_path] = {"error": "File not found"}
-        elif not path.is_file():
-            results[rel_path] = {"error": "Not a file"}
-        else:
-            try:
-                content = path.read_text(encoding="utf-8")
-                results[rel_path] = {"content": content}
-            except Exception as e:
-                results[rel_path] = {"error": str(e)}
-
-    return {"content": json.dumps(results, indent=2), "error": None}
+    # Reads overlap on a thread pool; results keep the order of paths
+    results = dict(zip(paths, thread_map(_read_one, paths), strict=True))
+
+    # Both encoders emit non-ASCII text as-is, so output doesn't depend on
+    # whether orjson is installed
+    if orjson is not None:
+        content = orjson.dumps(results, option=orjson.OPT_INDENT_2).decode("utf-8")
+    else:
+        content = json.dumps(results, indent=2, ensure_ascii=False)
+    return {"content": content, "error": None}
 
 
 HANDLERS = {
@@ -26,8 +26,10 @@ def _get_state_path(conversation_id: str) -> Path:
 def _load_state(conversation_id: str) -> dict:
     """Load conversation state, creating if needed."""
     path = _get_state_path(conversation_id)
-    if path.exists():
+    try:
         return json.loads(path.read_text())
+    except FileNotFoundError:
+        pass
     return {
         "id": conversation_id,
         "created": datetime.now(timezone.utc).isoformat(),
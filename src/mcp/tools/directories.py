@@ -1,8 +1,12 @@
 """Directory operations module."""
 
+import errno
+import io
+import os
 import shutil
+import stat
 
-from security import safe_path
+from security import safe_path, stat_path
 
 TOOLS = [
     {
@@ -75,17 +79,20 @@ def _list_directory(args: dict) -> dict:
     path = safe_path(args.get("path", ""))
     if not path:
         return {"content": "", "error": "Invalid path"}
-    if not path.exists():
+    st = stat_path(path)
+    if st is None:
         return {"content": "", "error": f"Directory not found: {args.get('path', '.')}"}
-    if not path.is_dir():
+    if not stat.S_ISDIR(st.st_mode):
         return {"content": "", "error": "Path is not a directory"}
 
-    entries = []
-    for entry in sorted(path.iterdir()):
-        if entry.name.startswith("."):
-            continue
-        kind = "dir" if entry.is_dir() else "file"
-        entries.append(f"{kind}: {entry.name}")
+    # scandir's cached d_type answers is_dir() without a stat per entry;
+    # dotfiles are dropped before sorting so they're never kept around.
+    # Names are unique, so sorting never compares the picked prefixes.
+    with os.scandir(path) as it:
+        listing = sorted(
+            (e.name, "dir: " if e.is_dir() else "file: ") for e in it if not e.name.startswith(".")
+        )
+    entries = [prefix + name for name, prefix in listing]
 
     content = "\n".join(entries) if entries else "(empty directory)"
     return {"content": content, "error": None}
@@ -106,25 +113,27 @@ def _delete_directory(args: dict) -> dict:
     path = safe_path(args.get("path", ""))
     if not path:
         return {"content": "", "error": "Invalid path"}
-    if not path.exists():
+    st = stat_path(path)
+    if st is None:
         return {"content": "", "error": f"Directory not found: {args.get('path')}"}
-    if not path.is_dir():
+    if not stat.S_ISDIR(st.st_mode):
         return {"content": "", "error": "Path is not a directory"}
 
     recursive = args.get("recursive", False)
 
-    # Check if directory is empty
-    contents = list(path.iterdir())
-    if contents and not recursive:
-        return {
-            "content": "",
-            "error": "Directory is not empty. Use recursive=true to delete.",
-        }
-
     if recursive:
         shutil.rmtree(str(path))
     else:
-        path.rmdir()
+        # rmdir(2) refuses non-empty directories itself, so nothing is listed
+        try:
+            path.rmdir()
+        except OSError as e:
+            if e.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+                raise
+            return {
+                "content": "",
+                "error": "Directory is not empty. Use recursive=true to delete.",
+            }
 
     return {"content": f"Deleted directory: {args.get('path')}", "error": None}
 
@@ -134,44 +143,63 @@ def _file_tree(args: dict) -> dict:
     path = safe_path(args.get("path", ""))
     if not path:
         return {"content": "", "error": "Invalid path"}
-    if not path.exists():
+    st = stat_path(path)
+    if st is None:
         return {"content": "", "error": f"Directory not found: {args.get('path', '.')}"}
-    if not path.is_dir():
+    if not stat.S_ISDIR(st.st_mode):
         return {"content": "", "error": "Path is not a directory"}
 
     max_depth = args.get("max_depth", 3)
     include_files = args.get("include_files", True)
 
-    lines = [path.name or "."]
-
-    def walk(directory, prefix, depth):
-        if depth >= max_depth:
-            return
+    # Lines go straight into one buffer rather than a list of line strings
+    buf = io.StringIO()
+    buf.write(path.name or ".")
+    write = buf.write
 
+    def scan(directory: str) -> list[tuple[str, str, bool]]:
+        # Filter hidden files, and files too if not including them, before
+        # sorting. DirEntry.is_dir() answers from scandir's d_type and caches
+        # the result; only symlinks need a stat, to see what they point at.
         try:
-            entries = sorted(directory.iterdir())
+            with os.scandir(directory) as it:
+                return sorted(
+                    (e.name, e.path, e.is_dir())
+                    for e in it
+                    if not e.name.startswith(".") and (include_files or e.is_dir())
+                )
         except PermissionError:
-            return
-
-        # Filter hidden files
-        entries = [e for e in entries if not e.name.startswith(".")]
-
-        # Filter to directories only if not including files
-        if not include_files:
-            entries = [e for e in entries if e.is_dir()]
-
-        for i, entry in enumerate(entries):
-            is_last = i == len(entries) - 1
-            connector = "└── " if is_last else "├── "
-            lines.append(f"{prefix}{connector}{entry.name}")
+            return []
+
+    # Depth-first with an explicit stack of (entries, index of last entry,
+    # prefix, depth) per open directory, instead of recursing
+    entries = scan(os.fspath(path)) if max_depth > 0 else []
+    stack = [(iter(enumerate(entries)), len(entries) - 1, "", 0)]
+
+    while stack:
+        level, last, prefix, depth = stack[-1]
+        item = next(level, None)
+        if item is None:
+            stack.pop()
+            continue
 
-            if entry.is_dir():
+        i, (name, entry_path, is_dir) = item
+        is_last = i == last
+        connector = "└── " if is_last else "├── "
+        write("\n")
+        write(prefix)
+        write(connector)
+        write(name)
+
+        if is_dir and depth + 1 < max_depth:
+            children = scan(entry_path)
+            if children:
                 extension = "    " if is_last else "│   "
-                walk(entry, prefix + extension, depth + 1)
-
-    walk(path, "", 0)
+                stack.append(
+                    (iter(enumerate(children)), len(children) - 1, prefix + extension, depth + 1)
+                )
 
-    return {"content": "\n".join(lines), "error": None}
+    return {"content": buf.getvalue(), "error": None}
 
 
 HANDLERS = {
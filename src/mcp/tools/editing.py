@@ -1,10 +1,21 @@
 """Smart editing operations module."""
 
+import functools
+import os
 import re
+import stat
 
-from security import safe_path
+from security import safe_path, stat_path
+from .files import O_BINARY, write_all
 from .metadata import FRONTMATTER_RE
 
+# Start of the next heading at level 1..N, indexed by N - 1: where a
+# patched section of level N ends
+NEXT_HEADING_RES = tuple(re.compile(rf"^#{{1,{level}}}\s+", re.MULTILINE) for level in range(1, 7))
+
+# Whitespace run, matched at a position as str.lstrip() would strip it
+LEADING_SPACE_RE = re.compile(r"\s*")
+
 TOOLS = [
     {
         "name": "prepend_file",
@@ -52,34 +63,46 @@ def _prepend_file(args: dict) -> dict:
     # Create parent directories if needed
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    if path.exists():
-        existing = path.read_text(encoding="utf-8")
-
-        # Check for frontmatter
-        match = FRONTMATTER_RE.match(existing)
-        if match:
-            # Insert after frontmatter
-            frontmatter = existing[: match.end()]
-            body = existing[match.end() :]
-            combined = frontmatter + new_content + "\n" + body
-        else:
-            combined = new_content + "\n" + existing
-
-        path.write_text(combined, encoding="utf-8")
-    else:
+    try:
+        fd = os.open(path, os.O_RDWR | O_BINARY)
+    except FileNotFoundError:
         path.write_text(new_content, encoding="utf-8")
+    else:
+        try:
+            data = bytearray()
+            while chunk := os.read(fd, 1 << 20):
+                data += chunk
+            existing = data.decode("utf-8")
+
+            # Insert after frontmatter if present. Bytes before the insert
+            # point stay as they are, so only the rest is written back.
+            match = FRONTMATTER_RE.match(existing)
+            offset = len(existing[: match.end()].encode("utf-8")) if match else 0
+            os.lseek(fd, offset, os.SEEK_SET)
+            write_all(fd, (new_content + "\n").encode("utf-8"))
+            write_all(fd, memoryview(data)[offset:])
+        finally:
+            os.close(fd)
 
     return {"content": f"Prepended content to {args.get('path')}", "error": None}
 
 
+@functools.lru_cache(maxsize=256)
+def _heading_pattern(heading: str) -> re.Pattern:
+    """Pattern matching a heading line with this text, at any level."""
+    # Escape special regex characters in heading text
+    return re.compile(rf"^(#{{1,6}})\s+{re.escape(heading)}\s*$", re.IGNORECASE | re.MULTILINE)
+
+
 def _patch_file(args: dict) -> dict:
     """Replace content under a specific markdown heading."""
     path = safe_path(args.get("path", ""))
     if not path:
         return {"content": "", "error": "Invalid path"}
-    if not path.exists():
+    st = stat_path(path)
+    if st is None:
         return {"content": "", "error": f"File not found: {args.get('path')}"}
-    if not path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         return {"content": "", "error": "Path is not a file"}
 
     heading = args.get("heading", "")
@@ -88,22 +111,19 @@ def _patch_file(args: dict) -> dict:
 
     content = path.read_text(encoding="utf-8")
 
-    # Build pattern to find the heading
-    # Escape special regex characters in heading text
-    escaped_heading = re.escape(heading)
-    heading_pattern = re.compile(
-        rf"^(#{1,6})\s+{escaped_heading}\s*$", re.IGNORECASE | re.MULTILINE
-    )
-
-    match = heading_pattern.search(content)
+    match = _heading_pattern(heading).search(content)
 
     if not match:
         if create_if_missing:
-            # Append new section at end
+            # Append new section at end; only the new bytes are written
+            section = f"\n## {heading}\n\n{new_section_content}\n"
             if not content.endswith("\n"):
-                content += "\n"
-            content += f"\n## {heading}\n\n{new_section_content}\n"
-            path.write_text(content, encoding="utf-8")
+                section = "\n" + section
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | O_BINARY)
+            try:
+                write_all(fd, section.encode("utf-8"))
+            finally:
+                os.close(fd)
             return {
                 "content": f"Created new section '{heading}' in {args.get('path')}",
                 "error": None,
@@ -116,20 +136,27 @@ def _patch_file(args: dict) -> dict:
 
     # Find the end of this section (next heading of same or higher level)
     section_start = match.end()
-    next_heading = re.compile(rf"^#{{{1},{heading_level}}}\s+", re.MULTILINE)
-    next_match = next_heading.search(content, section_start)
+    next_match = NEXT_HEADING_RES[heading_level - 1].search(content, section_start)
 
     if next_match:
         section_end = next_match.start()
     else:
         section_end = len(content)
 
-    # Build new content
-    before = content[: match.end()]
-    after = content[section_end:]
+    # Build new content in one join; the following text starts after its
+    # leading whitespace, found without an lstrip() copy
+    after_start = LEADING_SPACE_RE.match(content, section_end).end()
 
     # Ensure proper spacing
-    new_content = before + "\n\n" + new_section_content.strip() + "\n\n" + after.lstrip()
+    new_content = "".join(
+        (
+            content[: match.end()],
+            "\n\n",
+            new_section_content.strip(),
+            "\n\n",
+            content[after_start:],
+        )
+    )
 
     path.write_text(new_content, encoding="utf-8")
     return {"content": f"Updated section '{heading}' in {args.get('path')}", "error": None}
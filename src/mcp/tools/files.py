@@ -1,8 +1,30 @@
 """Core file operations module."""
 
+import errno
+import os
 import shutil
+import stat
+from collections.abc import Iterator
+from pathlib import Path
 
-from security import safe_path
+from security import safe_path, stat_path
+
+try:
+    import fcntl
+except ImportError:  # Not on Windows; copy_file falls back to shutil.copy2
+    fcntl = None
+
+# read_file targets above this size are streamed by the HTTP layer
+READ_STREAM_THRESHOLD = 1 << 20
+READ_CHUNK_SIZE = 64 * 1024
+
+# Linux ioctl making dst share src's extents (reflink on btrfs, XFS, ...)
+FICLONE = 0x40049409
+# Bytes per os.copy_file_range() call; it returns 0 once src is exhausted
+COPY_RANGE_CHUNK = 1 << 30
+
+# Keeps os.open() from translating newlines on Windows; 0 elsewhere
+O_BINARY = getattr(os, "O_BINARY", 0)
 
 TOOLS = [
     {
@@ -89,15 +111,57 @@ def _read_file(args: dict) -> dict:
     path = safe_path(args.get("path", ""))
     if not path:
         return {"content": "", "error": "Invalid path"}
-    if not path.exists():
+    st = stat_path(path)
+    if st is None:
         return {"content": "", "error": f"File not found: {args.get('path')}"}
-    if not path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         return {"content": "", "error": "Path is not a file"}
 
     content = path.read_text(encoding="utf-8")
     return {"content": content, "error": None}
 
 
+def stream_large_file(args: dict) -> Iterator[str] | None:
+    """
+    Stream a read_file target in text chunks if it is large.
+
+    Lets the HTTP layer send big notes without holding the whole file in
+    memory. Small files, and anything read_file would reject, return None
+    so the caller uses the normal handler and its error reporting. The file
+    is opened before returning, so a missing or unreadable file is reported
+    that way too. Invalid UTF-8 is replaced rather than raised, since a
+    stream can't report an error once started.
+
+    Returns:
+        Iterator of decoded text chunks, or None to use _read_file
+    """
+    relative = args.get("path", "")
+    if not isinstance(relative, str):
+        return None
+    path = safe_path(relative)
+    st = stat_path(path) if path else None
+    if st is None or not stat.S_ISREG(st.st_mode) or st.st_size <= READ_STREAM_THRESHOLD:
+        return None
+    try:
+        f = path.open("r", encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+
+    def chunks() -> Iterator[str]:
+        with f:
+            while chunk := f.read(READ_CHUNK_SIZE):
+                yield chunk
+
+    return chunks()
+
+
+def write_all(fd: int, data: bytes) -> None:
+    """write(2) data to fd, looping until short writes have sent all of it."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
 def _write_file(args: dict) -> dict:
     """Create or replace a file."""
     path = safe_path(args.get("path", ""))
@@ -109,10 +173,39 @@ def _write_file(args: dict) -> dict:
     # Create parent directories if needed
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    path.write_text(content, encoding="utf-8")
+    # Encode once and hand the bytes straight to write(2), skipping the
+    # TextIOWrapper/BufferedWriter copies write_text makes
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | O_BINARY, 0o666)
+    try:
+        write_all(fd, content.encode("utf-8"))
+    finally:
+        os.close(fd)
     return {"content": f"Written {len(content)} bytes to {args.get('path')}", "error": None}
 
 
+def append_text(path: Path, content: str) -> str:
+    """
+    Append content to a file, adding a newline first if the file lacks one.
+
+    Only the last byte is read, so appending to a large note doesn't pull
+    the whole file into memory. Creates the file if missing.
+
+    Returns:
+        The text actually written (content plus any separating newline)
+    """
+    # O_APPEND sends every write to the end, wherever the read left off
+    fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT | O_BINARY, 0o666)
+    try:
+        if os.lseek(fd, 0, os.SEEK_END):
+            os.lseek(fd, -1, os.SEEK_END)
+            if os.read(fd, 1) != b"\n":
+                content = "\n" + content
+        write_all(fd, content.encode("utf-8"))
+    finally:
+        os.close(fd)
+    return content
+
+
 def _append_file(args: dict) -> dict:
     """Append content to the end of a file."""
     path = safe_path(args.get("path", ""))
@@ -124,15 +217,7 @@ def _append_file(args: dict) -> dict:
     # Create parent directories if needed
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Append with smart newline handling
-    if path.exists():
-        existing = path.read_text(encoding="utf-8")
-        if existing and not existing.endswith("\n"):
-            content = "\n" + content
-        with path.open("a", encoding="utf-8") as f:
-            f.write(content)
-    else:
-        path.write_text(content, encoding="utf-8")
+    content = append_text(path, content)
 
     return {"content": f"Appended {len(content)} bytes to {args.get('path')}", "error": None}
 
@@ -142,9 +227,10 @@ def _delete_file(args: dict) -> dict:
     path = safe_path(args.get("path", ""))
     if not path:
         return {"content": "", "error": "Invalid path"}
-    if not path.exists():
+    st = stat_path(path)
+    if st is None:
         return {"content": "", "error": f"File not found: {args.get('path')}"}
-    if not path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         return {"content": "", "error": "Path is not a file"}
 
     path.unlink()
@@ -160,16 +246,75 @@ def _move_file(args: dict) -> dict:
         return {"content": "", "error": "Invalid source path"}
     if not destination:
         return {"content": "", "error": "Invalid destination path"}
-    if not source.exists():
+    if stat_path(source) is None:
         return {"content": "", "error": f"Source not found: {args.get('source')}"}
 
     # Create parent directories if needed
     destination.parent.mkdir(parents=True, exist_ok=True)
 
-    shutil.move(str(source), str(destination))
+    if destination.is_dir():
+        # Moving into an existing directory keeps shutil.move's semantics
+        shutil.move(str(source), str(destination))
+    else:
+        # Same filesystem is the norm inside a vault: a single atomic rename
+        try:
+            os.replace(source, destination)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(str(source), str(destination))
     return {"content": f"Moved {args.get('source')} to {args.get('destination')}", "error": None}
 
 
+def _copy_in_kernel(src_fd: int, dst_fd: int) -> bool:
+    """
+    Copy src_fd's data to dst_fd without passing it through userspace.
+
+    Tries a FICLONE reflink, which is O(1) on filesystems that support it,
+    then os.copy_file_range(). Returns False if neither works here.
+    """
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except OSError:
+        pass
+
+    try:
+        while os.copy_file_range(src_fd, dst_fd, COPY_RANGE_CHUNK):
+            pass
+        return True
+    except OSError as e:
+        if e.errno in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+            return False
+        raise
+
+
+def copy_file(source: Path, destination: Path) -> None:
+    """
+    Copy a file with its metadata, like shutil.copy2, via kernel fast paths.
+
+    Falls back to shutil.copy2 where fcntl or os.copy_file_range() is
+    unavailable, or when the filesystem supports neither fast path.
+    """
+    if destination.is_dir():
+        destination = destination / source.name
+    if (
+        fcntl is None
+        or not hasattr(os, "copy_file_range")
+        or (destination.exists() and os.path.samefile(source, destination))
+    ):
+        # copy2 also raises SameFileError before truncating the source
+        shutil.copy2(source, destination)
+        return
+
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        copied = _copy_in_kernel(src.fileno(), dst.fileno())
+    if copied:
+        shutil.copystat(source, destination)
+    else:
+        shutil.copy2(source, destination)
+
+
 def _copy_file(args: dict) -> dict:
     """Copy a file to a new location, preserving metadata."""
     source = safe_path(args.get("source", ""))
@@ -179,15 +324,16 @@ def _copy_file(args: dict) -> dict:
         return {"content": "", "error": "Invalid source path"}
     if not destination:
         return {"content": "", "error": "Invalid destination path"}
-    if not source.exists():
+    st = stat_path(source)
+    if st is None:
         return {"content": "", "error": f"Source not found: {args.get('source')}"}
-    if not source.is_file():
+    if not stat.S_ISREG(st.st_mode):
         return {"content": "", "error": "Source is not a file"}
 
     # Create parent directories if needed
     destination.parent.mkdir(parents=True, exist_ok=True)
 
-    shutil.copy2(str(source), str(destination))
+    copy_file(source, destination)
     return {"content": f"Copied {args.get('source')} to {args.get('destination')}", "error": None}
 
 
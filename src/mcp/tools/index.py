@@ -1,6 +1,7 @@
 """Vault index tools — search pre-chunked content and view vault structure."""
 
 import json
+import os
 import re
 from datetime import UTC, datetime
 from pathlib import Path
@@ -8,10 +9,14 @@ from zoneinfo import ZoneInfo
 
 from security import get_vault_path
 from tools.metadata import parse_frontmatter
+from tools.walk import walk_visible
 
 # Cap vault walks so freshness checks never become expensive on huge vaults.
 _MAX_FRESHNESS_SCAN = 20000
 
+# Directories the freshness walk never enters, on top of dot-dirs.
+_SKIP_DIRS = frozenset({"node_modules"})
+
 # Thresholds for bucketing tasks in live_context (days).
 _ACTIVE_RECENT_DAYS = 2
 _STALLED_IDLE_DAYS = 7
@@ -145,23 +150,11 @@ def _read_manifest() -> dict | None:
         return None
 
 
-def _iter_vault_markdown() -> list[Path]:
+def _iter_vault_markdown() -> list[os.DirEntry]:
     """Walk the vault for .md files, skipping dot-dirs and node_modules."""
-    vault = get_vault_path()
-    results: list[Path] = []
-    for path in vault.rglob("*.md"):
-        try:
-            rel_parts = path.relative_to(vault).parts
-        except ValueError:
-            continue
-        skip = False
-        for part in rel_parts[:-1]:
-            if part == "node_modules" or (part.startswith(".") and len(part) > 1):
-                skip = True
-                break
-        if skip:
-            continue
-        results.append(path)
+    results: list[os.DirEntry] = []
+    for entry, _ in walk_visible(get_vault_path(), suffix=".md", skip_dirs=_SKIP_DIRS):
+        results.append(entry)
         if len(results) >= _MAX_FRESHNESS_SCAN:
             break
     return results
@@ -198,9 +191,9 @@ def _compute_freshness(manifest: dict) -> dict:
     stale = 0
     total = 0
     files = _iter_vault_markdown()
-    for path in files:
+    for entry in files:
         try:
-            mtime = path.stat().st_mtime
+            mtime = entry.stat().st_mtime
         except OSError:
             continue
         total += 1
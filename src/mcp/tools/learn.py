@@ -18,6 +18,25 @@ from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# File types ingested by `lu learn <folder>`
+FOLDER_EXTENSIONS = frozenset({
+    ".md", ".txt", ".rst", ".org", ".csv", ".json", ".yaml", ".yml", ".toml", ".pdf",
+})
+
+# File types and directories considered when learning a cloned repo
+CODE_EXTENSIONS = frozenset({
+    ".rs", ".py", ".js", ".ts", ".jsx", ".tsx", ".go", ".java",
+    ".rb", ".php", ".c", ".cpp", ".h", ".hpp", ".cs", ".swift",
+    ".kt", ".scala", ".sh", ".bash", ".zsh", ".sql", ".r",
+    ".md", ".txt", ".rst", ".toml", ".yaml", ".yml", ".json",
+    ".html", ".css", ".scss", ".less", ".vue", ".svelte",
+})
+
+CODE_SKIP_DIRS = frozenset({
+    ".git", "node_modules", "vendor", "target", "build", "dist",
+    "__pycache__", ".venv", "venv", ".tox", "coverage",
+})
+
 
 def _extract_pdf_text(path: Path) -> str:
     """Extract text from a PDF file.
@@ -186,16 +205,16 @@ def _learn_folder(args: dict[str, Any]) -> dict:
     total_chunks = 0
     errors = []
 
-    extensions = {
-        ".md", ".txt", ".rst", ".org", ".csv", ".json", ".yaml", ".yml", ".toml", ".pdf",
-    }
-
+    prefix_len = len(p.as_posix().rstrip("/")) + 1
     for f in sorted(p.rglob("*")):
-        if not f.is_file():
+        # A hidden component starts the relative path or follows a "/";
+        # checked first, so hidden files are never stat()ed
+        rel = f.as_posix()[prefix_len:]
+        if rel.startswith(".") or "/." in rel:
             continue
-        if f.suffix.lower() not in extensions:
+        if f.suffix.lower() not in FOLDER_EXTENSIONS:
             continue
-        if any(part.startswith(".") for part in f.relative_to(p).parts):
+        if not f.is_file():
             continue
 
         try:
@@ -260,28 +279,15 @@ def _learn_github(args: dict[str, Any]) -> dict:
         total_files = 0
         total_chunks = 0
 
-        code_extensions = {
-            ".rs", ".py", ".js", ".ts", ".jsx", ".tsx", ".go", ".java",
-            ".rb", ".php", ".c", ".cpp", ".h", ".hpp", ".cs", ".swift",
-            ".kt", ".scala", ".sh", ".bash", ".zsh", ".sql", ".r",
-            ".md", ".txt", ".rst", ".toml", ".yaml", ".yml", ".json",
-            ".html", ".css", ".scss", ".less", ".vue", ".svelte",
-        }
-
-        skip_dirs = {
-            ".git", "node_modules", "vendor", "target", "build", "dist",
-            "__pycache__", ".venv", "venv", ".tox", "coverage",
-        }
-
         tmppath = Path(tmpdir)
         for f in sorted(tmppath.rglob("*")):
             if not f.is_file():
                 continue
-            if f.suffix.lower() not in code_extensions:
+            if f.suffix.lower() not in CODE_EXTENSIONS:
                 continue
 
             rel = f.relative_to(tmppath)
-            if any(part in skip_dirs for part in rel.parts):
+            if any(part in CODE_SKIP_DIRS for part in rel.parts):
                 continue
 
             try:
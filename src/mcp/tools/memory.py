@@ -6,15 +6,22 @@ to vault files in .lu/conversations/ directory.
 Supports session-scoped search to filter by conversation context.
 """
 
+import os
 import re
 from datetime import datetime, timedelta
 from pathlib import Path
 
 from security import safe_path
+from tools.files import O_BINARY
+from tools.walk import ScanCache, Screen, literal_screen, read_text_if_match, thread_map
 
 # Conversation storage directory (relative to vault root)
 CONVERSATIONS_DIR = ".lu/conversations"
 
+# [(section, section.lower()), ...] for conversation files
+# search_conversations has read
+_SECTION_CACHE: ScanCache[list[tuple[str, str]]] = ScanCache()
+
 TOOLS = [
     {
         "name": "save_conversation",
@@ -84,6 +91,10 @@ TOOLS = [
                     "type": "string",
                     "description": "Date in YYYY-MM-DD format",
                 },
+                "tail_bytes": {
+                    "type": "integer",
+                    "description": "Only return about this many bytes from the end, starting at a line (default: whole day)",
+                },
             },
             "required": ["date"],
         },
@@ -107,20 +118,64 @@ def _get_conversations_dir() -> Path:
     return path
 
 
-def _format_message(msg: dict, session_id: str | None = None) -> str:
-    """Format a single message for markdown storage.
+def _conversation_files(conv_dir: Path) -> list[tuple[str, str]]:
+    """
+    List (date, path) for each daily .md file, newest date first.
 
-    If session_id is provided, includes it as metadata.
+    One scandir, with no Path objects or fnmatch per entry.
     """
-    role = msg.get("role", "user")
-    content = msg.get("content", "")
-    timestamp = msg.get("timestamp", "")
+    with os.scandir(conv_dir) as it:
+        files = [(e.name[:-3], e.path) for e in it if e.name.endswith(".md") and e.is_file()]
+    files.sort(reverse=True)
+    return files
+
+
+def _conversation_sections(file_path: str, screen: Screen | None) -> list[tuple[str, str]] | None:
+    """
+    Return a conversation file's "---" sections with their lowercased text.
 
-    # Parse timestamp to get time
+    Sections are kept per file until its (st_mtime_ns, st_size) changes,
+    so repeat searches only stat past days' files. A file not in the cache
+    is first screened on its raw bytes, and left uncached if it can't match.
+
+    Returns:
+        List of (section, section.lower()), or None if the file is skipped
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+
+    def load() -> list[tuple[str, str]] | None:
+        # Files without the query in them are skipped before decoding
+        content = read_text_if_match(file_path, screen)
+        if content is None:
+            return None
+        return [(section, section.lower()) for section in content.split("---")]
+
+    return _SECTION_CACHE.get(file_path, st, load)
+
+
+def _parse_timestamp(timestamp: str) -> datetime | None:
+    """Parse a message's ISO timestamp ("Z" suffix allowed), or None if invalid."""
     try:
-        dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-        time_str = dt.strftime("%I:%M %p")
+        return datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
     except (ValueError, AttributeError):
+        return None
+
+
+def _format_message(msg: dict, dt: datetime | None, session_id: str | None = None) -> str:
+    """Format a single message for markdown storage.
+
+    dt is the message's parsed timestamp. If session_id is provided,
+    includes it as metadata.
+    """
+    role = msg.get("role", "user")
+    content = msg.get("content", "")
+    # Same text as strftime("%I:%M %p") in the C locale, without strftime
+    if dt is not None:
+        time_str = f"{dt.hour % 12 or 12:02d}:{dt.minute:02d} {'AM' if dt.hour < 12 else 'PM'}"
+    else:
         time_str = "??:??"
 
     role_label = "User" if role == "user" else "Lu"
@@ -143,43 +198,30 @@ def _save_conversation(args: dict) -> dict:
     if not conv_dir:
         return {"content": "", "error": "Invalid conversations directory"}
 
-    # Group messages by date
-    by_date: dict[str, list] = {}
+    # Group formatted messages by date, parsing each timestamp once
+    by_date: dict[str, list[str]] = {}
     for msg in messages:
-        timestamp = msg.get("timestamp", "")
-        try:
-            dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-            date_str = dt.strftime("%Y-%m-%d")
-        except (ValueError, AttributeError):
-            date_str = datetime.now().strftime("%Y-%m-%d")
-
-        if date_str not in by_date:
-            by_date[date_str] = []
-        by_date[date_str].append(msg)
-
-    # Write to files
-    files_written = []
-    for date_str, date_messages in by_date.items():
-        file_path = conv_dir / f"{date_str}.md"
+        dt = _parse_timestamp(msg.get("timestamp", ""))
+        date_str = (dt or datetime.now()).date().isoformat()
+        by_date.setdefault(date_str, []).append(_format_message(msg, dt, session_id))
 
-        # Build content
-        content_parts = []
-
-        # Add date header if file is new
-        if not file_path.exists():
-            content_parts.append(f"## {date_str}\n")
-
-        for msg in date_messages:
-            content_parts.append(_format_message(msg, session_id))
-
-        content_parts.append("---\n")
-        content = "\n".join(content_parts)
+    def append_day(item: tuple[str, list[str]]) -> str:
+        date_str, formatted = item
+        file_path = conv_dir / f"{date_str}.md"
 
-        # Append to file
+        # Append to file, with a date header if it is new (append mode
+        # opens at the end, so position 0 means empty)
         with file_path.open("a", encoding="utf-8") as f:
-            f.write(content)
+            header = [f"## {date_str}\n"] if f.tell() == 0 else []
+            f.write("\n".join(header + formatted + ["---\n"]))
+        return date_str
 
-        files_written.append(date_str)
+    # Write to files; a backfill spanning several days writes them in
+    # parallel, while the usual single day skips the thread pool
+    if len(by_date) == 1:
+        files_written = [append_day(next(iter(by_date.items())))]
+    else:
+        files_written = list(thread_map(append_day, by_date.items()))
 
     session_info = f" (session: {session_id})" if session_id else ""
     return {
@@ -217,35 +259,36 @@ def _search_conversations(args: dict) -> dict:
         recent_cutoff = datetime.now() - timedelta(days=7)
 
     results = []
+    screen = literal_screen(query)
+    files = _conversation_files(conv_dir)
+    _SECTION_CACHE.prune(os.fspath(conv_dir), {file_path for _, file_path in files})
 
     # Search markdown files (sorted by date, newest first)
-    for file_path in sorted(conv_dir.glob("*.md"), reverse=True):
+    for date_str, file_path in files:
         if len(results) >= limit:
             break
 
         # Apply date filtering for 'recent' scope
         if scope == "recent" and recent_cutoff:
             try:
-                file_date = datetime.strptime(file_path.stem, "%Y-%m-%d")
+                file_date = datetime.strptime(date_str, "%Y-%m-%d")
                 if file_date < recent_cutoff:
                     continue
             except ValueError:
                 continue
 
-        content = file_path.read_text(encoding="utf-8")
+        sections = _conversation_sections(file_path, screen)
+        if sections is None:
+            continue
 
         # Find matching sections
-        sections = content.split("---")
-        for section in sections:
+        for section, lowered in sections:
             # Apply session filtering
             if scope == "session" and session_id:
                 if f"[session:{session_id}]" not in section:
                     continue
 
-            if query in section.lower():
-                # Extract date from filename
-                date_str = file_path.stem
-
+            if query in lowered:
                 # Clean up section for display
                 excerpt = section.strip()[:500]
                 if len(section.strip()) > 500:
@@ -270,6 +313,31 @@ def _search_conversations(args: dict) -> dict:
     }
 
 
+def _read_tail(path: Path, tail_bytes: int) -> str:
+    """
+    Read at most tail_bytes from the end of a UTF-8 file.
+
+    Only the window is read, with one pread. A window that doesn't start
+    the file is moved up to its first line start, or, if it holds no
+    newline, past any split multi-byte character.
+    """
+    fd = os.open(path, os.O_RDONLY | O_BINARY)
+    try:
+        size = os.fstat(fd).st_size
+        offset = max(size - tail_bytes, 0)
+        # Include the byte before the window, to tell if it starts a line
+        start = max(offset - 1, 0)
+        data = os.pread(fd, size - start, start)
+    finally:
+        os.close(fd)
+
+    if offset:
+        # Continuation bytes (0x80-0xBF) are the tail of a split character
+        newline = data.find(b"\n")
+        data = data[newline + 1 :] if newline >= 0 else data[1:].lstrip(bytes(range(0x80, 0xC0)))
+    return data.decode("utf-8")
+
+
 def _get_conversation(args: dict) -> dict:
     """Get conversation for a specific date."""
     date_str = args.get("date", "")
@@ -283,11 +351,15 @@ def _get_conversation(args: dict) -> dict:
         return {"content": "", "error": "Invalid conversations directory"}
 
     file_path = conv_dir / f"{date_str}.md"
+    tail_bytes = args.get("tail_bytes")
 
-    if not file_path.exists():
+    try:
+        if tail_bytes is None:
+            content = file_path.read_text(encoding="utf-8")
+        else:
+            content = _read_tail(file_path, max(tail_bytes, 0))
+    except FileNotFoundError:
         return {"content": f"No conversation found for {date_str}", "error": None}
-
-    content = file_path.read_text(encoding="utf-8")
     return {"content": content, "error": None}
 
 
@@ -297,10 +369,7 @@ def _list_conversation_dates(args: dict) -> dict:
     if not conv_dir or not conv_dir.exists():
         return {"content": "No conversation history found", "error": None}
 
-    dates = sorted(
-        [f.stem for f in conv_dir.glob("*.md")],
-        reverse=True,
-    )
+    dates = [date_str for date_str, _ in _conversation_files(conv_dir)]
 
     if not dates:
         return {"content": "No conversation history found", "error": None}
@@ -4,26 +4,122 @@ Allows Lu to create, list, and delete skills at runtime.
 Skills are stored in ~/.ludolph/skills/ and auto-loaded.
 """
 
+import ast
 import os
 import re
 import signal
 from pathlib import Path
 
+from tools.walk import ScanCache
+
 # Skills directory
 SKILLS_DIR = Path.home() / ".ludolph" / "skills"
 
-# Forbidden patterns in tool code (security)
-FORBIDDEN_PATTERNS = [
-    r"\bos\.system\b",
-    r"\bsubprocess\b",
-    r"\beval\s*\(",
-    r"\bexec\s*\(",
-    r"\b__import__\b",
-    r"\bopen\s*\([^)]*['\"]w",  # open with write mode outside safe context
-    r"\bcompile\s*\(",
-    r"\bglobals\s*\(",
-    r"\blocals\s*\(",
-]
+# Builtins tool code may not reference, called or not (security)
+FORBIDDEN_NAMES = frozenset({"eval", "exec", "compile", "globals", "locals", "__import__"})
+
+# Modules tool code may not import or touch
+FORBIDDEN_MODULES = frozenset({"subprocess"})
+
+# open() modes that write, and every character a mode string can hold
+WRITE_MODE_CHARS = frozenset("wax+")
+MODE_CHARS = frozenset("rwxabt+U")
+
+
+class _ForbiddenVisitor(ast.NodeVisitor):
+    """
+    Find the first forbidden construct in a skill's syntax tree.
+
+    Matching the tree instead of the source text means comments and
+    strings that merely mention a name don't count, while spellings a
+    regex misses (builtins.eval, f = eval, "subprocess" passed to
+    importlib) do.
+    """
+
+    def __init__(self):
+        self.error: str | None = None
+
+    def visit(self, node: ast.AST) -> None:
+        if self.error is None:
+            super().visit(node)
+
+    def _flag(self, node: ast.AST, what: str) -> None:
+        if self.error is None:
+            self.error = f"Forbidden pattern detected: {what} (line {node.lineno})"
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            if alias.name.partition(".")[0] in FORBIDDEN_MODULES:
+                self._flag(node, f"import {alias.name}")
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if (node.module or "").partition(".")[0] in FORBIDDEN_MODULES:
+            self._flag(node, f"from {node.module} import")
+        for alias in node.names:
+            if alias.name in FORBIDDEN_NAMES or (node.module == "os" and alias.name == "system"):
+                self._flag(node, f"import {alias.name}")
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if node.id in FORBIDDEN_NAMES or node.id in FORBIDDEN_MODULES:
+            self._flag(node, node.id)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        value = node.value
+        if isinstance(value, ast.Name) and value.id == "os" and node.attr == "system":
+            self._flag(node, "os.system")
+        elif node.attr in FORBIDDEN_MODULES or (
+            node.attr in FORBIDDEN_NAMES
+            and isinstance(value, ast.Name)
+            and value.id in ("builtins", "__builtins__")
+        ):
+            self._flag(node, node.attr)
+        self.generic_visit(node)
+
+    def visit_Constant(self, node: ast.Constant) -> None:
+        # Names handed to getattr or importlib as strings
+        if node.value in FORBIDDEN_NAMES or node.value in FORBIDDEN_MODULES:
+            self._flag(node, repr(node.value))
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        if isinstance(func, ast.Name) and func.id == "open":
+            mode = node.args[1] if len(node.args) > 1 else None
+            self._check_open_mode(node, mode)
+        elif isinstance(func, ast.Attribute) and func.attr == "open":
+            # io.open(path, mode) and the like take the mode second, but
+            # Path(path).open(mode) takes it first. A lone argument counts
+            # as a mode only if it's a string made of mode characters, so
+            # io.open(path) and io.open("data.txt") still read
+            mode = node.args[1] if len(node.args) > 1 else None
+            if mode is None and node.args:
+                first = node.args[0]
+                if (
+                    isinstance(first, ast.Constant)
+                    and isinstance(first.value, str)
+                    and MODE_CHARS.issuperset(first.value)
+                ):
+                    mode = first
+            self._check_open_mode(node, mode)
+        self.generic_visit(node)
+
+    def _check_open_mode(self, node: ast.Call, mode: ast.expr | None) -> None:
+        """Flag an open() call whose mode (positional or mode=) may write."""
+        for keyword in node.keywords:
+            if keyword.arg == "mode":
+                mode = keyword.value
+        # A mode only known at runtime might write too
+        if mode is not None and not (
+            isinstance(mode, ast.Constant)
+            and isinstance(mode.value, str)
+            and WRITE_MODE_CHARS.isdisjoint(mode.value)
+        ):
+            self._flag(node, "open() in write mode")
+
+
+SKILL_NAME_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9_]*$")
+
+# Tool count per skill file list_skills read
+_TOOL_COUNTS: ScanCache[int] = ScanCache()
 
 TOOLS = [
     {
@@ -95,7 +191,7 @@ def _validate_skill_name(name: str) -> str | None:
     """Validate skill name. Returns error message or None if valid."""
     if not name:
         return "Skill name is required"
-    if not re.match(r"^[a-zA-Z][a-zA-Z0-9_]*$", name):
+    if not SKILL_NAME_RE.match(name):
         return "Skill name must start with a letter and contain only alphanumeric characters and underscores"
     if name.startswith("_"):
         return "Skill name cannot start with underscore"
@@ -157,38 +253,64 @@ def _validate_skill_code(code: str) -> str | None:
             "}]"
         )
 
-    # Check for forbidden patterns
-    for pattern in FORBIDDEN_PATTERNS:
-        if re.search(pattern, code):
-            return f"Forbidden pattern detected: {pattern}"
+    # One parse feeds both the forbidden-construct scan and the syntax
+    # check; compiling the tree only adds checks like 'return' outside
+    # a function, without reparsing the source
+    try:
+        tree = ast.parse(code, "<skill>")
+    except SyntaxError as e:
+        return f"Syntax error: {e}"
+
+    visitor = _ForbiddenVisitor()
+    visitor.visit(tree)
+    if visitor.error:
+        return visitor.error
 
-    # Try to compile (syntax check)
     try:
-        compile(code, "<skill>", "exec")
+        compile(tree, "<skill>", "exec")
     except SyntaxError as e:
         return f"Syntax error: {e}"
 
     return None
 
 
+def _count_tools(py_file: Path) -> int:
+    """
+    Count the tools a skill file defines, re-reading it only if it changed.
+
+    Raises:
+        OSError, UnicodeDecodeError: If the file can't be read
+    """
+
+    def load() -> int:
+        content = py_file.read_text(encoding="utf-8")
+        # Two C-level count() scans beat one regex alternation several times over
+        return content.count('"name":') + content.count("'name':")
+
+    return _TOOL_COUNTS.get(os.fspath(py_file), py_file.stat(), load)
+
+
 def _list_skills(args: dict) -> dict:
     """List all skills."""
     skills_dir = _ensure_skills_dir()
 
     skills = []
+    seen = set()
     for py_file in sorted(skills_dir.glob("*.py")):
         if py_file.name.startswith("_"):
             continue
+        seen.add(os.fspath(py_file))
 
         # Try to get basic info
         try:
-            content = py_file.read_text(encoding="utf-8")
-            # Count tools defined
-            tool_count = content.count('"name":') + content.count("'name':")
+            tool_count = _count_tools(py_file)
             skills.append(f"- {py_file.stem} ({tool_count} tool(s))")
         except Exception:
             skills.append(f"- {py_file.stem} (error reading)")
 
+    # Forget deleted skills
+    _TOOL_COUNTS.prune(os.fspath(skills_dir), seen)
+
     if not skills:
         return {
             "content": f"No skills found in {skills_dir}\n\nUse create_skill to add one.",
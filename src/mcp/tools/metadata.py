@@ -2,9 +2,10 @@
 
 import json
 import re
+import stat
 from datetime import datetime
 
-from security import is_git_ignored, safe_path
+from security import is_git_ignored, safe_path, stat_path
 
 # Regex to match YAML frontmatter block
 FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n?", re.DOTALL)
@@ -73,14 +74,14 @@ def parse_frontmatter(content: str) -> tuple[dict, str]:
             continue
 
         # Check for key: value
-        if ":" in line and not line.startswith(" ") and not line.startswith("\t"):
+        if ":" in line and not line.startswith((" ", "\t")):
             # Save previous key if exists
             if current_key is not None:
                 frontmatter[current_key] = _parse_yaml_value("\n".join(current_value))
 
-            parts = line.split(":", 1)
-            current_key = parts[0].strip()
-            value = parts[1].strip() if len(parts) > 1 else ""
+            key, _, value = line.partition(":")
+            current_key = key.strip()
+            value = value.strip()
 
             if value:
                 current_value = [value]
@@ -105,22 +106,27 @@ def _parse_yaml_value(value: str):
         return None
 
     # Boolean
-    if value.lower() in ("true", "yes"):
+    lowered = value.lower()
+    if lowered in ("true", "yes"):
         return True
-    if value.lower() in ("false", "no"):
+    if lowered in ("false", "no"):
         return False
 
+    # Shape checks below only look at the first and last characters
+    first = value[0]
+    last = value[-1]
+
     # Integer
-    if value.isdigit() or (value.startswith("-") and value[1:].isdigit()):
+    if value.isdigit() or (first == "-" and value[1:].isdigit()):
         return int(value)
 
     # List (bracket notation)
-    if value.startswith("[") and value.endswith("]"):
+    if first == "[" and last == "]":
         items = value[1:-1].split(",")
         return [item.strip().strip("\"'") for item in items if item.strip()]
 
     # List (dash notation)
-    if value.startswith("-"):
+    if first == "-":
         items = []
         for line in value.split("\n"):
             line = line.strip()
@@ -129,9 +135,7 @@ def _parse_yaml_value(value: str):
         return items
 
     # Quoted string
-    if (value.startswith('"') and value.endswith('"')) or (
-        value.startswith("'") and value.endswith("'")
-    ):
+    if first == last and first in "\"'":
         return value[1:-1]
 
     return value
@@ -174,22 +178,22 @@ def _file_info(args: dict) -> dict:
     path = safe_path(args.get("path", ""))
     if not path:
         return {"content": "", "error": "Invalid path"}
-    if not path.exists():
+    st = stat_path(path)
+    if st is None:
         return {"content": "", "error": f"File not found: {args.get('path')}"}
-
-    stat = path.stat()
+    is_dir = stat.S_ISDIR(st.st_mode)
 
     info_lines = [
         f"path: {args.get('path')}",
-        f"type: {'directory' if path.is_dir() else 'file'}",
-        f"size: {stat.st_size} bytes",
-        f"created: {datetime.fromtimestamp(stat.st_ctime).isoformat()}",
-        f"modified: {datetime.fromtimestamp(stat.st_mtime).isoformat()}",
-        f"permissions: {oct(stat.st_mode)[-3:]}",
+        f"type: {'directory' if is_dir else 'file'}",
+        f"size: {st.st_size} bytes",
+        f"created: {datetime.fromtimestamp(st.st_ctime).isoformat()}",
+        f"modified: {datetime.fromtimestamp(st.st_mtime).isoformat()}",
+        f"permissions: {oct(st.st_mode)[-3:]}",
     ]
 
     # Add git status if in a git repo
-    if not path.is_dir() and is_git_ignored(path):
+    if not is_dir and is_git_ignored(path, is_dir=False):
         info_lines.append("git: ignored")
 
     return {"content": "\n".join(info_lines), "error": None}
@@ -200,12 +204,19 @@ def _get_frontmatter(args: dict) -> dict:
     path = safe_path(args.get("path", ""))
     if not path:
         return {"content": "", "error": "Invalid path"}
-    if not path.exists():
+    st = stat_path(path)
+    if st is None:
         return {"content": "", "error": f"File not found: {args.get('path')}"}
-    if not path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         return {"content": "", "error": "Path is not a file"}
 
-    content = path.read_text(encoding="utf-8")
+    # Only a note opening with "---" can have frontmatter, so other notes
+    # are answered from their first bytes without a full read and decode
+    with open(path, "rb") as f:
+        head = f.read(3)
+        if head != b"---":
+            return {"content": "(no frontmatter)", "error": None}
+        content = (head + f.read()).decode("utf-8")
     frontmatter, _ = parse_frontmatter(content)
 
     if not frontmatter:
@@ -219,9 +230,10 @@ def _update_frontmatter(args: dict) -> dict:
     path = safe_path(args.get("path", ""))
     if not path:
         return {"content": "", "error": "Invalid path"}
-    if not path.exists():
+    st = stat_path(path)
+    if st is None:
         return {"content": "", "error": f"File not found: {args.get('path')}"}
-    if not path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         return {"content": "", "error": "Path is not a file"}
 
     updates = args.get("updates", {})
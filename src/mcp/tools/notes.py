@@ -0,0 +1,89 @@
+"""Per-note metadata cache for vault-wide scans.
+
+get_backlinks and vault_stats used to read and parse every note on each
+call. The parsed results are kept per file, keyed on the file's
+(st_mtime_ns, st_size), so repeat scans of an unchanged vault only stat
+notes instead of reading them.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+
+from .analysis import WIKILINK_RE
+from .tags import TAG_PATTERN
+from .walk import ScanCache, read_text
+
+# Wikilinks and tags in one scan: group 1 is a link target, otherwise a tag
+LINK_OR_TAG_RE = re.compile(f"{WIKILINK_RE.pattern}|{TAG_PATTERN.pattern}")
+
+
+@dataclass(slots=True, frozen=True)
+class NoteInfo:
+    """What vault-wide scans need from one note's content."""
+
+    words: int
+    tags: int
+    links: tuple[str, ...]  # wikilink targets, in order of appearance
+    link_keys: frozenset[str]  # lowercased targets, for backlink lookups
+
+
+# Each note's NoteInfo; unreadable notes get EMPTY_NOTE, so they're cached too
+_NOTE_CACHE: ScanCache[NoteInfo] = ScanCache()
+
+
+def parse_note(content: str) -> NoteInfo:
+    """Count words and tags and collect wikilink targets in a single pass."""
+    tags = 0
+    links = []
+    for match in LINK_OR_TAG_RE.finditer(content):
+        link = match.group(1)
+        if link is None:
+            tags += 1
+            continue
+
+        links.append(link)
+        # Tags inside link text (e.g. [[#Heading]]) count too
+        if "#" in match.group(0):
+            tags += len(TAG_PATTERN.findall(match.group(0)))
+
+    return NoteInfo(
+        words=len(content.split()),
+        tags=tags,
+        links=tuple(links),
+        link_keys=frozenset(link.lower() for link in links),
+    )
+
+
+# What scans see for a note that can't be read as UTF-8: no words, tags or links
+EMPTY_NOTE = parse_note("")
+
+
+def note_info(entry: os.DirEntry) -> NoteInfo | None:
+    """
+    Return parsed info for a note, reading it only if it changed.
+
+    Returns:
+        NoteInfo (EMPTY_NOTE if it can't be read as UTF-8), or None if the
+        note is gone
+    """
+    try:
+        st = entry.stat()
+    except OSError:
+        return None
+
+    def load() -> NoteInfo:
+        content = read_text(entry.path)
+        return parse_note(content) if content is not None else EMPTY_NOTE
+
+    return _NOTE_CACHE.get(entry.path, st, load)
+
+
+def prune_note_cache(root: str, seen: set[str]) -> None:
+    """Drop cached notes under root that a full walk of root no longer found."""
+    _NOTE_CACHE.prune(root, seen)
+
+
+def clear_note_cache() -> None:
+    """Forget all cached note metadata."""
+    _NOTE_CACHE.clear()
@@ -1,8 +1,11 @@
 """Periodic notes operations module."""
 
-from datetime import datetime
+import functools
+import os
+from datetime import date, datetime
 
 from security import safe_path
+from tools.files import O_BINARY, append_text, write_all
 
 TOOLS = [
     {
@@ -55,36 +58,48 @@ TOOLS = [
 ]
 
 
-def _get_periodic_path(period: str, date_str: str | None, folder: str) -> tuple[str, str]:
-    """
-    Get the path for a periodic note.
+@functools.lru_cache(maxsize=64)
+def _parse_date(date_str: str) -> date | None:
+    """Parse a YYYY-MM-DD date as strptime does, or None if it isn't one."""
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
+    except ValueError:
+        return None
 
-    Returns:
-        Tuple of (relative_path, filename_without_extension)
-    """
-    # Parse date or use today
-    if date_str:
-        try:
-            date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        except ValueError:
-            date = datetime.now().date()
-    else:
-        date = datetime.now().date()
 
-    # Generate filename based on period
+@functools.lru_cache(maxsize=64)
+def _periodic_filename(period: str, day: date) -> str:
+    """Filename (without extension) of the periodic note covering day."""
     if period == "daily":
-        filename = date.strftime("%Y-%m-%d")
+        return day.strftime("%Y-%m-%d")
     elif period == "weekly":
         # ISO week format: YYYY-Wnn
-        year, week, _ = date.isocalendar()
-        filename = f"{year}-W{week:02d}"
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
     elif period == "monthly":
-        filename = date.strftime("%Y-%m")
+        return day.strftime("%Y-%m")
     elif period == "yearly":
-        filename = date.strftime("%Y")
+        return day.strftime("%Y")
     else:
-        filename = date.strftime("%Y-%m-%d")
+        return day.strftime("%Y-%m-%d")
+
+
+def _get_periodic_path(period: str, date_str: str | None, folder: str) -> tuple[str, str]:
+    """
+    Get the path for a periodic note.
+
+    Date parsing and filename formatting are memoized; both are pure, and
+    most calls ask about today or a handful of recent dates.
 
+    Returns:
+        Tuple of (relative_path, filename_without_extension)
+    """
+    # Parse date or use today
+    day = _parse_date(date_str) if date_str else None
+    if day is None:
+        day = date.today()
+
+    filename = _periodic_filename(period, day)
     return f"{folder}/{filename}.md", filename
 
 
@@ -126,20 +141,23 @@ def _append_periodic(args: dict) -> dict:
     # Create parent directories if needed
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    if path.exists():
+    # O_EXCL folds the existence check into the create, so two appends
+    # racing on a new note can't both write frontmatter
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | O_BINARY, 0o666)
+    except FileExistsError:
         # Append to existing file with smart newline handling
-        existing = path.read_text(encoding="utf-8")
-        if existing and not existing.endswith("\n"):
-            content = "\n" + content
-        with path.open("a", encoding="utf-8") as f:
-            f.write(content)
+        append_text(path, content)
         return {"content": f"Appended to {rel_path}", "error": None}
-    else:
-        # Create new file with frontmatter
+
+    # Create new file with frontmatter
+    try:
         now = datetime.now().isoformat()
         frontmatter = f"---\ntitle: {filename}\ncreated: {now}\n---\n\n"
-        path.write_text(frontmatter + content, encoding="utf-8")
-        return {"content": f"Created {rel_path}", "error": None}
+        write_all(fd, (frontmatter + content).encode("utf-8"))
+    finally:
+        os.close(fd)
+    return {"content": f"Created {rel_path}", "error": None}
 
 
 HANDLERS = {
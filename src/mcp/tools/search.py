@@ -1,8 +1,52 @@
 """Search operations module."""
 
+import fnmatch
+import functools
+import os
 import re
+import shutil
+import subprocess
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path, PurePosixPath
 
 from security import get_vault_path, safe_path
+from tools.walk import (
+    _translate_newlines,
+    literal_screen,
+    read_text_if_match,
+    thread_map,
+    walk_visible,
+)
+
+try:
+    import hyperscan
+except ImportError:  # Optional speedup; Python re scans every file without it
+    hyperscan = None
+
+try:
+    import re2
+except ImportError:  # Optional; search_advanced runs user patterns on re without it
+    re2 = None
+
+# ripgrep, if installed, prefilters which files need their content read
+RG_PATH = shutil.which("rg")
+RG_TIMEOUT = 30
+
+# Result lines search returns before it stops scanning
+SEARCH_LIMIT = 50
+
+# Syntax that re and RE2 both accept but read differently: RE2 keeps \w,
+# \d, \s and \b ASCII-only, has POSIX [[:classes:]], and takes {,n}
+# literally. Patterns using any of it stay on re.
+RE2_DIVERGENT_RE = re.compile(r"\\[wWbBdDsS]|\[:|\{,")
+
+# ripgrep's Rust engine diverges the same ways, and also reads "&&", "--"
+# and "~~" in a class as set operations and a "[" in a class as a nested
+# class, where re sees literals. Patterns using any of it skip ripgrep.
+RG_DIVERGENT_RE = re.compile(rf"{RE2_DIVERGENT_RE.pattern}|&&|--|~~|\[[^\]]*\[")
+
+SEARCH_SUFFIXES = frozenset({".md", ".txt", ".json", ".yaml", ".yml", ".py", ".js", ".ts", ".rs"})
 
 TOOLS = [
     {
@@ -47,6 +91,198 @@ TOOLS = [
 ]
 
 
+def _rg_matching_files(
+    pattern: str, root: Path, *, fixed: bool, glob: str | None = None
+) -> set[str] | None:
+    """
+    Ask ripgrep which files under root contain a case-insensitive match.
+
+    The result only narrows which files Python reads; matching and context
+    extraction stay in Python, so output is unchanged. Hidden, ignored and
+    binary files are included so the set is never narrower than the walk.
+
+    Returns:
+        Set of matching file path strings (as walk_visible's entry.path
+        spells them), or None if rg is unavailable or failed
+        (e.g. a pattern ripgrep's regex engine can't compile)
+    """
+    if RG_PATH is None:
+        return None
+
+    cmd = [
+        RG_PATH,
+        "--files-with-matches",
+        "--null",
+        "--ignore-case",
+        "--hidden",
+        "--no-ignore",
+        "--text",
+        "--no-messages",
+    ]
+    if fixed:
+        cmd.append("--fixed-strings")
+    else:
+        # Python matches on text with "\r\n" and "\r" turned into "\n",
+        # which ripgrep never sees, so any file with a "\r" is kept
+        cmd += ["--multiline", "--regexp", r"\r"]
+    if glob:
+        cmd += ["--glob", glob]
+    cmd += ["--regexp", pattern, "--", str(root)]
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=RG_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+    # 0 = matches, 1 = none; 2 = error, usable only if some files matched
+    if result.returncode == 1:
+        return set()
+    if result.returncode not in (0, 2) or not result.stdout:
+        return None
+    return {p for p in result.stdout.decode("utf-8", "surrogateescape").split("\0") if p}
+
+
+def _hyperscan_prefilter(pattern: str):
+    """
+    Compile a regex into a Hyperscan database for yes/no file screening.
+
+    Hyperscan has no backreferences or lookarounds and rejects patterns
+    that match the empty string; those return None and every file is
+    scanned with re as before. So do patterns using RE2_DIVERGENT_RE
+    syntax, which Hyperscan's PCRE dialect reads like RE2 does.
+
+    Returns:
+        A function bytes -> bool (True if the text may match), or None
+    """
+    if hyperscan is None or RE2_DIVERGENT_RE.search(pattern):
+        return None
+
+    flags = (
+        hyperscan.HS_FLAG_CASELESS
+        | hyperscan.HS_FLAG_MULTILINE
+        | hyperscan.HS_FLAG_SINGLEMATCH
+        | hyperscan.HS_FLAG_UTF8
+        | hyperscan.HS_FLAG_UCP
+    )
+    db = hyperscan.Database()
+    try:
+        db.compile(expressions=[pattern.encode("utf-8")], ids=[0], flags=[flags])
+    except hyperscan.error:
+        return None
+
+    def stop(*_args):
+        return True  # First hit answers the question; halt the scan
+
+    def may_match(data: bytes) -> bool:
+        # re matches the text with "\r\n" and "\r" turned into "\n", which
+        # the raw bytes only equal when they hold no "\r"
+        if b"\r" in data:
+            return True
+        # Under HS_FLAG_UTF8 invalid UTF-8 gets no particular answer; such
+        # files fail to decode afterwards and are skipped either way
+        try:
+            db.scan(data, match_event_handler=stop)
+        except hyperscan.ScanTerminated:
+            return True
+        return False
+
+    return may_match
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(pattern: str, flags: int) -> re.Pattern:
+    """Compiled pattern, kept apart from re's shared cache that other modules churn."""
+    return re.compile(pattern, flags)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_re2(pattern: str):
+    """Compile a pattern case-insensitively with RE2, or None if RE2 rejects it."""
+    options = re2.Options()
+    options.case_sensitive = False
+    options.log_errors = False
+    try:
+        return re2.compile(f"(?m){pattern}", options)
+    except re2.error:
+        return None
+
+
+def _compile_user_pattern(pattern: str):
+    """
+    Compile a search_advanced pattern, on RE2 when it's installed and fits.
+
+    RE2 matches in linear time, so patterns like (a+)+$ can't backtrack
+    for minutes over a large note. Backreferences, lookarounds, the
+    syntax in RE2_DIVERGENT_RE and patterns that match the empty string
+    (whose finditer steps differ in the re2 module) stay on re. The re
+    compile runs first either way, so invalid patterns fail with re's
+    error messages.
+
+    Raises:
+        re.error: If the pattern doesn't compile
+    """
+    compiled = _compile_pattern(pattern, re.IGNORECASE | re.MULTILINE)
+    if re2 is None or RE2_DIVERGENT_RE.search(pattern) or compiled.search(""):
+        return compiled
+    return _compile_re2(pattern) or compiled
+
+
+def _iter_search_hits(search_path: Path, query: str, context_length: int) -> Iterator[str]:
+    """
+    Yield search result lines lazily, in walk order.
+
+    Consumers stop after SEARCH_LIMIT hits; closing the generator then
+    stops the walk and cancels file reads that haven't started.
+    """
+    pattern = _compile_pattern(re.escape(query), re.IGNORECASE)
+    candidates = _rg_matching_files(query, search_path, fixed=True)
+    # Files without the query bytes are skipped without decoding
+    screen = literal_screen(query) if candidates is None else None
+    needle = query.lower() if query.isascii() else None
+
+    def wanted(item: tuple) -> bool:
+        # Filename hits, or text files that may contain the query
+        name = item[0].name
+        return pattern.search(name) is not None or (
+            os.path.splitext(name)[1] in SEARCH_SUFFIXES
+            and (candidates is None or item[0].path in candidates)
+        )
+
+    def check(item: tuple) -> str | None:
+        entry, rel_path = item
+
+        # Check filename match
+        if pattern.search(entry.name):
+            return f"file: {rel_path}"
+
+        # Check content for text files
+        content = read_text_if_match(entry.path, screen)
+        if content is None:
+            return None
+        if needle is not None and content.isascii():
+            # lower() keeps ASCII offsets, and case-folding ASCII can't
+            # match anything IGNORECASE wouldn't: find() beats the regex
+            # scan several times over
+            pos = content.lower().find(needle)
+            span = (pos, pos + len(needle)) if pos >= 0 else None
+        else:
+            match = pattern.search(content)
+            span = match.span() if match else None
+        if span:
+            # Extract context around match
+            start = max(0, span[0] - context_length)
+            end = min(len(content), span[1] + context_length)
+            context = content[start:end].replace("\n", " ")
+            return f"match: {rel_path}\n  ...{context}..."
+        return None
+
+    # thread_map keeps walk order, so hits match a sequential scan
+    files = filter(wanted, walk_visible(search_path, get_vault_path()))
+    for line in thread_map(check, files):
+        if line:
+            yield line
+
+
 def _search(args: dict) -> dict:
     """Simple text search across file names and content."""
     query = args.get("query", "")
@@ -59,43 +295,7 @@ def _search(args: dict) -> dict:
 
     context_length = args.get("context_length", 50)
 
-    results = []
-    pattern = re.compile(re.escape(query), re.IGNORECASE)
-
-    for path in search_path.rglob("*"):
-        if path.is_file() and not any(p.startswith(".") for p in path.parts):
-            rel_path = path.relative_to(get_vault_path())
-
-            # Check filename match
-            if pattern.search(path.name):
-                results.append(f"file: {rel_path}")
-
-            # Check content for text files
-            elif path.suffix in (
-                ".md",
-                ".txt",
-                ".json",
-                ".yaml",
-                ".yml",
-                ".py",
-                ".js",
-                ".ts",
-                ".rs",
-            ):
-                try:
-                    content = path.read_text(encoding="utf-8")
-                    match = pattern.search(content)
-                    if match:
-                        # Extract context around match
-                        start = max(0, match.start() - context_length)
-                        end = min(len(content), match.end() + context_length)
-                        context = content[start:end].replace("\n", " ")
-                        results.append(f"match: {rel_path}\n  ...{context}...")
-                except Exception:
-                    pass
-
-        if len(results) >= 50:
-            break
+    results = list(islice(_iter_search_hits(search_path, query, context_length), SEARCH_LIMIT))
 
     content = "\n".join(results) if results else "No matches found"
     return {"content": content, "error": None}
@@ -108,37 +308,100 @@ def _search_advanced(args: dict) -> dict:
         return {"content": "", "error": "Pattern required"}
 
     try:
-        pattern = re.compile(pattern_str, re.IGNORECASE | re.MULTILINE)
+        pattern = _compile_user_pattern(pattern_str)
     except re.error as e:
         return {"content": "", "error": f"Invalid regex: {e}"}
 
+    vault = get_vault_path()
     search_path = safe_path(args.get("path", ""))
     if not search_path:
-        search_path = get_vault_path()
+        search_path = vault
 
     glob_pattern = args.get("glob", "*")
     content_only = args.get("content_only", False)
 
     results = []
+    # rg's glob matches basenames like rglob does only for slash-free patterns
+    rg_glob = glob_pattern if glob_pattern != "*" and "/" not in glob_pattern else None
+    candidates = None
+    if not RG_DIVERGENT_RE.search(pattern_str):
+        candidates = _rg_matching_files(pattern_str, search_path, fixed=False, glob=rg_glob)
+    may_match = _hyperscan_prefilter(pattern_str) if candidates is None else None
+    # Without either, a pattern re.escape leaves as-is is a plain literal,
+    # and files lacking its bytes are dropped before any decode or regex
+    screen = None
+    if candidates is None and may_match is None and re.escape(pattern_str) == pattern_str:
+        screen = literal_screen(pattern_str)
+
+    if "**" in glob_pattern:
+        # "**" spans directories, which needs rglob; filter hidden parts after.
+        # rglob yields paths under vault, so rel is a plain prefix strip.
+        vault_len = len(vault.as_posix()) + 1
+
+        def rglob_files() -> Iterator[tuple[str, str, str]]:
+            for path in search_path.rglob(glob_pattern):
+                rel = path.as_posix()[vault_len:]
+                # A hidden component starts rel or follows a "/"
+                if not (rel.startswith(".") or "/." in rel) and path.is_file():
+                    yield str(path), rel, path.name
+
+        files = rglob_files()
+    else:
+        # Like rglob, a glob with "/" matches the trailing parts of the path
+        # below search_path, and a slash-free glob matches the basename
+        skip = 0 if search_path == vault else len(search_path.relative_to(vault).as_posix()) + 1
+
+        # "*" plus a literal tail, like "*.md", is a plain suffix test the
+        # walk applies itself, before any per-entry glob matching
+        tail = glob_pattern[1:]
+        suffix = None
+        if glob_pattern.startswith("*") and not any(c in tail for c in "*?[/"):
+            suffix = tail
+
+        def glob_matches(entry: os.DirEntry, rel: str) -> bool:
+            if suffix is not None:
+                return True
+            if "/" in glob_pattern:
+                return PurePosixPath(rel[skip:]).match(glob_pattern)
+            return fnmatch.fnmatchcase(entry.name, glob_pattern)
+
+        files = (
+            (entry.path, rel, entry.name)
+            for entry, rel in walk_visible(search_path, vault, suffix=suffix or None)
+            if glob_matches(entry, rel)
+        )
 
-    for path in search_path.rglob(glob_pattern):
-        if path.is_file() and not any(p.startswith(".") for p in path.parts):
-            rel_path = path.relative_to(get_vault_path())
+    def read(item: tuple) -> tuple:
+        # Content is only needed for files ripgrep didn't rule out
+        if candidates is not None and item[0] not in candidates:
+            return item, None
+        try:
+            with open(item[0], "rb") as f:
+                data = f.read()
+        except OSError:
+            return item, None
+        if screen is not None and not screen(data):
+            return item, None
+        return item, data
 
-            # Check filename match (unless content_only)
-            if not content_only and pattern.search(path.name):
-                results.append(f"file: {rel_path}")
+    for (_file_path, rel_path, name), data in thread_map(read, files):
+        # Check filename match (unless content_only)
+        if not content_only and pattern.search(name):
+            results.append(f"file: {rel_path}")
 
-            # Check content
+        # Check content, skipping files ripgrep or Hyperscan ruled out
+        # before decoding them
+        if data is not None and (may_match is None or may_match(data)):
             try:
-                content = path.read_text(encoding="utf-8")
-                matches = list(pattern.finditer(content))
-                if matches:
-                    for match in matches[:3]:  # Limit matches per file
-                        start = max(0, match.start() - 30)
-                        end = min(len(content), match.end() + 30)
-                        context = content[start:end].replace("\n", " ")
-                        results.append(f"match: {rel_path}:{match.start()}\n  ...{context}...")
+                # Newlines translated as text mode would, so "$" matches
+                # before "\r\n" and offsets count it as one character
+                content = _translate_newlines(data.decode("utf-8"))
+                # Limit matches per file; finditer stops after the third
+                for match in islice(pattern.finditer(content), 3):
+                    start = max(0, match.start() - 30)
+                    end = min(len(content), match.end() + 30)
+                    context = content[start:end].replace("\n", " ")
+                    results.append(f"match: {rel_path}:{match.start()}\n  ...{context}...")
             except Exception:
                 pass
 
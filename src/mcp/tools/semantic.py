@@ -17,6 +17,7 @@ from pathlib import Path
 from typing import Any
 
 from security import get_vault_path
+from tools.walk import walk_visible
 
 logger = logging.getLogger(__name__)
 
@@ -387,10 +388,8 @@ def _rebuild_semantic_index(args: dict) -> dict[str, Any]:
     documents = []
     skipped = 0
 
-    for md_file in vault_path.rglob("*.md"):
-        if any(part.startswith(".") for part in md_file.parts):
-            continue
-
+    for entry, rel_path in walk_visible(vault_path, suffix=".md"):
+        md_file = Path(entry.path)
         try:
             content = md_file.read_text(errors="ignore")
         except OSError as e:
@@ -403,7 +402,7 @@ def _rebuild_semantic_index(args: dict) -> dict[str, Any]:
             continue
 
         try:
-            mtime = md_file.stat().st_mtime
+            mtime = entry.stat().st_mtime
             modified_at = datetime.fromtimestamp(mtime).isoformat()
         except OSError:
             modified_at = datetime.now().isoformat()
@@ -427,7 +426,7 @@ def _rebuild_semantic_index(args: dict) -> dict[str, Any]:
 
         documents.append(
             {
-                "path": str(md_file.relative_to(vault_path)),
+                "path": rel_path,
                 "title": title,
                 "excerpt": excerpt,
                 "embedding": embedding.tolist(),
@@ -1,18 +1,27 @@
 """Tag management operations module."""
 
+import heapq
+import mmap
+import os
 import re
 from collections import Counter
 
 from security import get_vault_path, safe_path
+from tools.walk import ScanCache, Screen, read_text_if_match, thread_map, walk_visible
 
 # Pattern for hashtags, avoiding matches inside code or words
-# Negative lookbehind prevents matching inside words or after backticks
-TAG_PATTERN = re.compile(r"(?<![`\w])#([\w\-/]+)", re.UNICODE)
+# Negative lookbehind prevents matching inside words or after backticks;
+# it follows the "#" so the scan can jump from one "#" to the next
+TAG_PATTERN = re.compile(r"#(?<![`\w]#)([\w\-/]+)", re.UNICODE)
 
 # Patterns for removing code blocks before tag extraction
 FENCED_CODE_RE = re.compile(r"```.*?```", re.DOTALL)
 INLINE_CODE_RE = re.compile(r"`[^`]+`")
 
+# Each note's tags, so repeat tag scans of an unchanged vault only stat
+# notes instead of reading them
+_TAG_CACHE: ScanCache[frozenset[str]] = ScanCache()
+
 TOOLS = [
     {
         "name": "list_tags",
@@ -28,6 +37,13 @@ TOOLS = [
                     "type": "boolean",
                     "description": "Show usage counts for each tag (default true)",
                 },
+                "limit": {
+                    "type": "integer",
+                    "description": (
+                        "Maximum number of tags to list: the most used, or the first "
+                        "alphabetically without counts (default all)"
+                    ),
+                },
             },
             "required": [],
         },
@@ -53,19 +69,78 @@ TOOLS = [
 ]
 
 
-def extract_tags(content: str) -> list[str]:
+def extract_tags(content: str) -> set[str]:
     """
     Extract tags from content, ignoring those inside code blocks.
 
     Returns:
-        List of unique tags (without # prefix)
+        Set of unique tags (without # prefix)
     """
-    # Remove code blocks to avoid false positives
-    clean_content = FENCED_CODE_RE.sub("", content)
-    clean_content = INLINE_CODE_RE.sub("", clean_content)
+    # Remove code blocks to avoid false positives. Both need a backtick and
+    # fences need three in a row, so most notes skip one or both scans.
+    clean_content = content
+    if "`" in clean_content:
+        if "```" in clean_content:
+            clean_content = FENCED_CODE_RE.sub("", clean_content)
+        clean_content = INLINE_CODE_RE.sub("", clean_content)
+
+    # findall hands back group 1 strings directly, faster than finditer
+    return set(TAG_PATTERN.findall(clean_content))
+
 
-    tags = TAG_PATTERN.findall(clean_content)
-    return list(set(tags))
+def _has_hash(data: bytes | mmap.mmap) -> bool:
+    """Raw-bytes screen for notes that may have any tag."""
+    return data.find(b"#") >= 0
+
+
+def _tag_screen(tag: str) -> Screen:
+    """
+    Raw-bytes screen for notes that may carry tag or one of its children.
+
+    Such a note has "#tag" in its bytes (which "#tag/child" contains too),
+    unless removing code spans joined the tag together, which needs a
+    backtick, so those notes always pass.
+    """
+    needle = f"#{tag}".encode()
+    return lambda data: data.find(needle) >= 0 or data.find(b"`") >= 0
+
+
+def note_tags(entry: os.DirEntry, screen: Screen | None = None) -> frozenset[str] | None:
+    """
+    Return a note's tags, reading it only if it changed.
+
+    On a cache miss, screen can rule the note out from its raw bytes
+    before it's decoded. Notes it rejects return None and aren't cached,
+    since their tags were never parsed. Unreadable notes have no tags.
+    """
+    try:
+        st = entry.stat()
+    except OSError:
+        return frozenset()
+
+    def load() -> frozenset[str] | None:
+        # Notes without a "#" have no tags, so they're never decoded
+        content = read_text_if_match(entry.path, screen or _has_hash)
+        if content is None and screen is not None:
+            return None
+        return frozenset(extract_tags(content)) if content is not None else frozenset()
+
+    return _TAG_CACHE.get(entry.path, st, load)
+
+
+def prune_tag_cache(root: str, seen: set[str]) -> None:
+    """Drop cached notes under root that a full walk of root no longer found."""
+    _TAG_CACHE.prune(root, seen)
+
+
+def clear_tag_cache() -> None:
+    """Forget all cached note tags."""
+    _TAG_CACHE.clear()
+
+
+def _count_order(item: tuple[str, int]) -> tuple[int, str]:
+    """Sort key for (tag, count): count descending, then alphabetically."""
+    return -item[1], item[0]
 
 
 def _list_tags(args: dict) -> dict:
@@ -75,29 +150,35 @@ def _list_tags(args: dict) -> dict:
         search_path = get_vault_path()
 
     show_counts = args.get("show_counts", True)
+    limit = args.get("limit")
 
     tag_counter: Counter = Counter()
 
-    for path in search_path.rglob("*.md"):
-        if any(p.startswith(".") for p in path.parts):
-            continue
+    seen = set()
 
-        try:
-            content = path.read_text(encoding="utf-8")
-            tags = extract_tags(content)
-            tag_counter.update(tags)
-        except Exception:
-            pass
+    def tags(item: tuple) -> frozenset[str]:
+        seen.add(item[0].path)
+        return note_tags(item[0])
+
+    for note in thread_map(tags, walk_visible(search_path, suffix=".md")):
+        tag_counter.update(note)
+    prune_tag_cache(str(search_path), seen)
 
     if not tag_counter:
         return {"content": "(no tags found)", "error": None}
 
+    # With a limit, a k-element heap picks the top tags without sorting them all
     if show_counts:
-        # Sort by count descending, then alphabetically
-        sorted_tags = sorted(tag_counter.items(), key=lambda x: (-x[1], x[0]))
+        if limit is None:
+            sorted_tags = sorted(tag_counter.items(), key=_count_order)
+        else:
+            sorted_tags = heapq.nsmallest(limit, tag_counter.items(), key=_count_order)
         lines = [f"#{tag} ({count})" for tag, count in sorted_tags]
     else:
-        sorted_tags = sorted(tag_counter.keys())
+        if limit is None:
+            sorted_tags = sorted(tag_counter.keys())
+        else:
+            sorted_tags = heapq.nsmallest(limit, tag_counter.keys())
         lines = [f"#{tag}" for tag in sorted_tags]
 
     return {"content": "\n".join(lines), "error": None}
@@ -109,29 +190,25 @@ def _find_by_tag(args: dict) -> dict:
     if not tag:
         return {"content": "", "error": "Tag required"}
 
+    vault = get_vault_path()
     search_path = safe_path(args.get("path", ""))
     if not search_path:
-        search_path = get_vault_path()
+        search_path = vault
 
     results = []
-
-    for path in search_path.rglob("*.md"):
-        if any(p.startswith(".") for p in path.parts):
-            continue
-
-        try:
-            content = path.read_text(encoding="utf-8")
-            tags = extract_tags(content)
-
-            # Check for exact match or hierarchical match
-            # e.g., searching for "project" matches both "project" and "project/work"
-            for file_tag in tags:
-                if file_tag == tag or file_tag.startswith(tag + "/"):
-                    rel_path = path.relative_to(get_vault_path())
-                    results.append(str(rel_path))
-                    break
-        except Exception:
-            pass
+    screen = _tag_screen(tag)
+
+    def tags(item: tuple) -> tuple[str, frozenset[str] | None]:
+        return item[1], note_tags(item[0], screen)
+
+    # thread_map keeps walk order, so the first 100 hits match a sequential scan
+    for rel_path, note in thread_map(tags, walk_visible(search_path, vault, suffix=".md")):
+        # Check for exact match or hierarchical match
+        # e.g., searching for "project" matches both "project" and "project/work"
+        for file_tag in note or ():
+            if file_tag == tag or file_tag.startswith(tag + "/"):
+                results.append(rel_path)
+                break
 
         if len(results) >= 100:
             break
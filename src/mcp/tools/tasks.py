@@ -1,11 +1,38 @@
 """Task extraction operations module."""
 
+import mmap
 import re
 
 from security import get_vault_path, safe_path
+from tools.walk import ScanCache, scan_markdown
+
+# Pattern for markdown checkboxes: - [ ] or * [x] or - [X]. Whitespace
+# before the bullet and bracket is possessive (*+), since neither starts
+# with whitespace; the one before the text isn't, as it may be all the text
+TASK_PATTERN = re.compile(r"^\s*+[-*]\s*+\[([ xX])\]\s*(.+)$", re.MULTILINE)
+
+# Each note's (is_completed, text) tasks, so repeat calls on an unchanged
+# vault only stat notes (see scan_markdown)
+_TASK_CACHE: ScanCache[tuple[tuple[bool, str], ...]] = ScanCache()
+
+
+def _has_checkbox(data: bytes | mmap.mmap) -> bool:
+    """Raw-bytes screen for notes that may have a task: every task has a checkbox."""
+    return data.find(b"[ ]") >= 0 or data.find(b"[x]") >= 0 or data.find(b"[X]") >= 0
+
+
+def _parse_tasks(content: str) -> tuple[tuple[bool, str], ...]:
+    """Return each task in a note as (is_completed, text)."""
+    return tuple(
+        (match.group(1).lower() == "x", match.group(2).strip())
+        for match in TASK_PATTERN.finditer(content)
+    )
+
+
+def clear_task_cache() -> None:
+    """Forget all cached note tasks."""
+    _TASK_CACHE.clear()
 
-# Pattern for markdown checkboxes: - [ ] or * [x] or - [X]
-TASK_PATTERN = re.compile(r"^\s*[-*]\s*\[([ xX])\]\s*(.+)$", re.MULTILINE)
 
 TOOLS = [
     {
@@ -40,48 +67,28 @@ def _extract_tasks(args: dict) -> dict:
     status_filter = args.get("status", "all")
     include_context = args.get("include_context", True)
 
-    search_path = safe_path(path_arg) if path_arg else get_vault_path()
+    vault = get_vault_path()
+    search_path = safe_path(path_arg) if path_arg else vault
     if not search_path:
         return {"content": "", "error": "Invalid path"}
 
     tasks = []
 
-    # Determine files to search
-    if search_path.is_file():
-        files = [search_path]
-    else:
-        files = list(search_path.rglob("*.md"))
-
-    for file_path in files:
-        if any(p.startswith(".") for p in file_path.parts):
-            continue
-
-        try:
-            content = file_path.read_text(encoding="utf-8")
-            rel_path = file_path.relative_to(get_vault_path())
-
-            for match in TASK_PATTERN.finditer(content):
-                checkbox = match.group(1)
-                task_text = match.group(2).strip()
-
-                # Determine completion status
-                is_completed = checkbox.lower() == "x"
-
-                # Apply filter
-                if status_filter == "open" and is_completed:
-                    continue
-                if status_filter == "completed" and not is_completed:
-                    continue
-
-                # Format task
-                marker = "[x]" if is_completed else "[ ]"
-                if include_context:
-                    tasks.append(f"- {marker} {task_text} ({rel_path})")
-                else:
-                    tasks.append(f"- {marker} {task_text}")
-
-        except Exception:
-            pass
+    for rel_path, note_tasks in scan_markdown(
+        search_path, vault, _parse_tasks, _TASK_CACHE, _has_checkbox
+    ):
+        # Formatted once per note rather than once per task
+        context = f" ({rel_path})" if include_context else ""
+        for is_completed, task_text in note_tasks:
+            # Apply filter
+            if status_filter == "open" and is_completed:
+                continue
+            if status_filter == "completed" and not is_completed:
+                continue
+
+            # Format task
+            marker = "[x]" if is_completed else "[ ]"
+            tasks.append(f"- {marker} {task_text}{context}")
 
     if not tasks:
         return {"content": "(no tasks found)", "error": None}
@@ -1,11 +1,75 @@
 """Text operations module."""
 
+import functools
+import mmap
 import re
 
+try:
+    from re import _parser as _re_parser
+except ImportError:  # Optional: private to re; without it regex finds aren't screened
+    _re_parser = None
+
 from security import get_vault_path, safe_path
+from tools.walk import ScanCache, Screen, read_text, scan_markdown, thread_map, walk_visible
+
+# Pattern for fenced code blocks: ```language\ncode\n```. \w never matches
+# the "\n" after it, so the language is possessive (*+): a fence that isn't
+# followed by a newline fails at once instead of backtracking through it
+CODE_BLOCK_RE = re.compile(r"```(\w*+)\n(.*?)```", re.DOTALL)
+
+# Pattern for blockquotes: a run of lines starting with ">". The lookbehind
+# anchors the first ">" to a line start without a leading "^", so the scan
+# can jump from one ">" to the next instead of trying every position. Each
+# line runs to a "\n" or the end, so nothing is gained by backtracking (*+)
+QUOTE_BLOCK_RE = re.compile(r">(?<![^\n]>)[^\n]*+(?:\n>[^\n]*+)*+")
+
+# Each note's (language, code) blocks and quote texts, so repeat extractions
+# on an unchanged vault only stat notes (see scan_markdown)
+_CODE_BLOCK_CACHE: ScanCache[tuple[tuple[str, str], ...]] = ScanCache()
+_QUOTE_CACHE: ScanCache[tuple[str, ...]] = ScanCache()
+
+
+def _literal_bytes_screen(text: str) -> Screen:
+    """Case-sensitive raw-bytes screen for files containing text."""
+    # Decoded notes never hold surrogates, so a needle with one finds nothing
+    needle = text.encode("utf-8", "surrogatepass")
+    return lambda data: data.find(needle) >= 0
+
+
+def _has_fence(data: bytes | mmap.mmap) -> bool:
+    """Raw-bytes screen for notes that may have a fenced code block."""
+    return data.find(b"```") >= 0
+
+
+def _has_quote(data: bytes | mmap.mmap) -> bool:
+    """Raw-bytes screen for notes that may have a ">" at a line start."""
+    return data[:1] == b">" or data.find(b"\n>") >= 0 or data.find(b"\r>") >= 0
+
+
+def _parse_code_blocks(content: str) -> tuple[tuple[str, str], ...]:
+    """Return each fenced code block in a note as (language, code)."""
+    return tuple(
+        (match.group(1) or "text", match.group(2).strip())
+        for match in CODE_BLOCK_RE.finditer(content)
+    )
+
+
+def _parse_quotes(content: str) -> tuple[str, ...]:
+    """Return the text of each blockquote in a note, without its ">" prefixes."""
+    # Each match is a run of consecutive lines starting with ">". Remove the
+    # > prefix and optional space; join() turns a generator into a list
+    # first anyway, so a list comprehension is cheaper
+    return tuple(
+        "\n".join([line[1:].lstrip() for line in match.group(0).split("\n")])
+        for match in QUOTE_BLOCK_RE.finditer(content)
+    )
+
+
+def clear_extract_cache() -> None:
+    """Forget all cached code blocks and quotes."""
+    _CODE_BLOCK_CACHE.clear()
+    _QUOTE_CACHE.clear()
 
-# Pattern for fenced code blocks: ```language\ncode\n```
-CODE_BLOCK_RE = re.compile(r"```(\w*)\n(.*?)```", re.DOTALL)
 
 TOOLS = [
     {
@@ -59,8 +123,59 @@ TOOLS = [
 ]
 
 
-# File extensions allowed for find/replace
-ALLOWED_EXTENSIONS = {".md", ".txt", ".json", ".yaml", ".yml"}
+# File extensions allowed for find/replace; a tuple so the walk can test
+# names with a single str.endswith
+ALLOWED_EXTENSIONS = (".md", ".txt", ".json", ".yaml", ".yml")
+
+
+@functools.lru_cache(maxsize=128)
+def _compile(find_text: str, use_regex: bool) -> re.Pattern:
+    """
+    Compile a find pattern once per process, escaping it unless use_regex.
+
+    Raises:
+        re.error: If the pattern doesn't compile
+    """
+    return re.compile(find_text if use_regex else re.escape(find_text), re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=128)
+def _required_literal(find_text: str, use_regex: bool) -> str | None:
+    """
+    Return the longest literal every match of a find contains, or None.
+
+    For regexes this is the longest run of plain characters in the
+    parsed pattern's top-level sequence, looking into plain groups, e.g.
+    "bar" for "fo+(bar).*". Case-insensitive patterns have none. Runs
+    are split at "\r" and "\n", which read_text translates, so a
+    literal without them is in a file's raw bytes exactly when it's in
+    the text.
+    """
+    if not use_regex:
+        runs = [find_text]
+    else:
+        if _re_parser is None:
+            return None
+        parsed = _re_parser.parse(find_text, re.MULTILINE)
+        if parsed.state.flags & re.IGNORECASE:
+            return None
+
+        runs = [""]
+
+        def collect(items) -> None:
+            for op, av in items:
+                if op is _re_parser.LITERAL:
+                    runs[-1] += chr(av)
+                elif op is _re_parser.SUBPATTERN and not av[1] and not av[2]:
+                    # A group without inline flags matches its contents in place
+                    collect(av[3])
+                else:
+                    runs.append("")
+
+        collect(parsed)
+
+    pieces = [piece for run in runs for piece in re.split("[\r\n]", run)]
+    return max(pieces, key=len) or None
 
 
 def _find_replace(args: dict) -> dict:
@@ -73,41 +188,53 @@ def _find_replace(args: dict) -> dict:
     if not find_text:
         return {"content": "", "error": "Find text required"}
 
+    vault = get_vault_path()
     search_path = safe_path(args.get("path", ""))
     if not search_path:
-        search_path = get_vault_path()
+        search_path = vault
 
     # Build pattern
     try:
-        if use_regex:
-            pattern = re.compile(find_text, re.MULTILINE)
-        else:
-            pattern = re.compile(re.escape(find_text), re.MULTILINE)
+        pattern = _compile(find_text, bool(use_regex))
     except re.error as e:
         return {"content": "", "error": f"Invalid regex: {e}"}
 
     results = []
     total_matches = 0
 
-    for file_path in search_path.rglob("*"):
-        if file_path.suffix not in ALLOWED_EXTENSIONS:
-            continue
-        if any(p.startswith(".") for p in file_path.parts):
+    files = walk_visible(search_path, vault, suffix=ALLOWED_EXTENSIONS)
+
+    # Files without the bytes of a literal every match contains can't
+    # match, so they're never decoded
+    literal = _required_literal(find_text, bool(use_regex))
+    screen = _literal_bytes_screen(literal) if literal else None
+
+    def read(item: tuple) -> tuple:
+        return item, read_text(item[0].path, screen)
+
+    # Files are read on worker threads; matching and writing stay on this one
+    for (entry, rel_path), content in thread_map(read, files):
+        if content is None:
             continue
 
         try:
-            content = file_path.read_text(encoding="utf-8")
-            matches = list(pattern.finditer(content))
-
-            if matches:
-                rel_path = file_path.relative_to(get_vault_path())
-                match_count = len(matches)
+            # Count without building a list of match objects; str.count
+            # counts non-overlapping hits left to right, as finditer would
+            if use_regex:
+                match_count = sum(1 for _ in pattern.finditer(content))
+            else:
+                match_count = content.count(find_text)
+
+            if match_count:
                 total_matches += match_count
                 results.append(f"{rel_path}: {match_count} match(es)")
 
                 if not dry_run:
                     new_content = pattern.sub(replace_text, content)
-                    file_path.write_text(new_content, encoding="utf-8")
+                    # A replacement identical to what it matched changes nothing
+                    if new_content != content:
+                        with open(entry.path, "w", encoding="utf-8") as f:
+                            f.write(new_content)
 
         except Exception:
             pass
@@ -133,34 +260,17 @@ def _extract_code_blocks(args: dict) -> dict:
     if not search_path:
         return {"content": "", "error": "Invalid path"}
 
-    # Determine files to search
-    if search_path.is_file():
-        files = [search_path]
-    else:
-        files = list(search_path.rglob("*.md"))
-
     blocks = []
 
-    for file_path in files:
-        if any(p.startswith(".") for p in file_path.parts):
-            continue
-
-        try:
-            content = file_path.read_text(encoding="utf-8")
-            rel_path = file_path.relative_to(get_vault_path())
+    for rel_path, note_blocks in scan_markdown(
+        search_path, get_vault_path(), _parse_code_blocks, _CODE_BLOCK_CACHE, _has_fence
+    ):
+        for lang, code in note_blocks:
+            # Apply language filter
+            if language_filter and lang.lower() != language_filter:
+                continue
 
-            for match in CODE_BLOCK_RE.finditer(content):
-                lang = match.group(1) or "text"
-                code = match.group(2).strip()
-
-                # Apply language filter
-                if language_filter and lang.lower() != language_filter:
-                    continue
-
-                blocks.append(f"--- {rel_path} ({lang}) ---\n{code}")
-
-        except Exception:
-            pass
+            blocks.append(f"--- {rel_path} ({lang}) ---\n{code}")
 
     if not blocks:
         return {"content": "(no code blocks found)", "error": None}
@@ -176,46 +286,13 @@ def _extract_quotes(args: dict) -> dict:
     if not search_path:
         return {"content": "", "error": "Invalid path"}
 
-    # Determine files to search
-    if search_path.is_file():
-        files = [search_path]
-    else:
-        files = list(search_path.rglob("*.md"))
-
     quotes = []
 
-    for file_path in files:
-        if any(p.startswith(".") for p in file_path.parts):
-            continue
-
-        try:
-            content = file_path.read_text(encoding="utf-8")
-            rel_path = file_path.relative_to(get_vault_path())
-            lines = content.split("\n")
-
-            current_quote = []
-            in_quote = False
-
-            for line in lines:
-                if line.startswith(">"):
-                    in_quote = True
-                    # Remove > prefix and optional space
-                    quote_line = line[1:].lstrip() if len(line) > 1 else ""
-                    current_quote.append(quote_line)
-                else:
-                    if in_quote and current_quote:
-                        quote_text = "\n".join(current_quote)
-                        quotes.append(f"--- {rel_path} ---\n{quote_text}")
-                        current_quote = []
-                    in_quote = False
-
-            # Don't forget trailing quote
-            if current_quote:
-                quote_text = "\n".join(current_quote)
-                quotes.append(f"--- {rel_path} ---\n{quote_text}")
-
-        except Exception:
-            pass
+    for rel_path, note_quotes in scan_markdown(
+        search_path, get_vault_path(), _parse_quotes, _QUOTE_CACHE, _has_quote
+    ):
+        for quote_text in note_quotes:
+            quotes.append(f"--- {rel_path} ---\n{quote_text}")
 
     if not quotes:
         return {"content": "(no blockquotes found)", "error": None}
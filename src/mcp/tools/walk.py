@@ -0,0 +1,324 @@
+"""Shared vault traversal and file reading helpers."""
+
+import mmap
+import os
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Threads reading file contents; read() releases the GIL
+READ_WORKERS = 8
+
+# Files at least this big are screened through mmap instead of read()
+MMAP_THRESHOLD = 64 * 1024
+
+
+# Decides from a file's raw bytes (or its mmap) whether it can match
+Screen = Callable[[bytes | mmap.mmap], object]
+
+
+def walk_visible(
+    root: Path,
+    base: Path | None = None,
+    *,
+    suffix: str | tuple[str, ...] | None = None,
+    include_dirs: bool = False,
+    skip_dirs: frozenset[str] = frozenset(),
+) -> Iterator[tuple[os.DirEntry, str]]:
+    """
+    Walk a directory tree, skipping hidden entries and never entering dot-dirs.
+
+    Unlike rglob("*") followed by a dotfile filter on path.parts, hidden
+    subtrees such as .git or .obsidian are pruned at their parent, and
+    DirEntry's cached d_type answers is_dir()/is_file() without a stat.
+    Symlinked directories are reported but not followed, as with rglob.
+
+    Args:
+        root: Directory to walk
+        base: Directory rel paths are relative to (default: root)
+        suffix: Only yield files whose name ends with this (or one of these)
+        include_dirs: Also yield directories
+        skip_dirs: Directory names to prune in addition to dot-dirs
+
+    Yields:
+        (entry, rel) pairs, rel being the "/"-joined path relative to base
+    """
+    prefix = "" if base is None or root == base else root.relative_to(base).as_posix() + "/"
+    stack = [(os.fspath(root), prefix)]
+
+    while stack:
+        dir_path, rel_prefix = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            if name.startswith("."):
+                continue
+            rel = rel_prefix + name
+            try:
+                is_dir = entry.is_dir()
+                if is_dir:
+                    if name in skip_dirs:
+                        continue
+                    if include_dirs:
+                        yield entry, rel
+                    if not entry.is_symlink():
+                        subdirs.append((entry.path, rel + "/"))
+                # The name test comes first: is_file() may need a stat
+                elif (suffix is None or name.endswith(suffix)) and entry.is_file():
+                    yield entry, rel
+            except OSError:
+                continue
+
+        # Reversed so directories are visited in scandir order
+        stack.extend(reversed(subdirs))
+
+
+def iter_markdown(path: Path, base: Path) -> Iterator[tuple[str, str]]:
+    """
+    Yield (path, rel) for a single file, or for every visible .md file under a directory.
+
+    rel is the "/"-joined path relative to base, as with walk_visible.
+    """
+    if path.is_file():
+        yield os.fspath(path), path.relative_to(base).as_posix()
+        return
+    for entry, rel in walk_visible(path, base, suffix=".md"):
+        yield entry.path, rel
+
+
+def thread_map(
+    fn: Callable[[T], R], items: Iterable[T], workers: int = READ_WORKERS
+) -> Iterator[R]:
+    """
+    Map fn over items on a thread pool, yielding results in input order.
+
+    Meant for I/O-bound per-file work such as reading notes. Only a small
+    window of calls is in flight, so items are pulled lazily (a walk keeps
+    running alongside the reads) and finished contents never pile up
+    ahead of a slow consumer. Abandoning the iterator early, e.g. on a
+    result cap, cancels calls that haven't started.
+    """
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque(pool.submit(fn, item) for item in islice(items, workers * 2))
+        try:
+            while pending:
+                result = pending.popleft().result()
+                for item in islice(items, 1):
+                    pending.append(pool.submit(fn, item))
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def read_text(path: str, screen: Screen | None = None) -> str | None:
+    """
+    Read a UTF-8 file, returning None if it can't be read or decoded.
+
+    The file is read unbuffered in binary and decoded in one go, skipping
+    the isatty() check and extra copy text mode's buffer and wrapper add
+    per file. Newlines are translated as text mode would translate them.
+    With a screen, files whose raw bytes fail it also return None, without
+    being decoded (see read_text_if_match).
+    """
+    if screen is not None:
+        return read_text_if_match(path, screen)
+    try:
+        with open(path, "rb", buffering=0) as f:
+            text = f.read().decode("utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+    return _translate_newlines(text)
+
+
+def _translate_newlines(text: str) -> str:
+    """Turn "\r\n" and lone "\r" into "\n", as text-mode reads do."""
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def read_text_if_match(path: str, screen: Screen | None) -> str | None:
+    """
+    Read a UTF-8 file only if its raw bytes pass screen.
+
+    Most files in a content scan don't match. For those, a bytes-level
+    check on the raw read skips a full-file UTF-8 decode and the second
+    copy it makes. Files of MMAP_THRESHOLD or more are screened through
+    mmap, so a non-matching large file is never copied out of the page
+    cache at all. Files that match are decoded, newlines included, as
+    read_text would decode them; the screen itself sees the raw bytes.
+    With screen None this is plain read_text.
+    """
+    try:
+        with open(path, "rb", buffering=0) as f:
+            if screen is not None and os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if not screen(mm):
+                        return None
+                    data = mm[:]
+            else:
+                data = f.read()
+                if screen is not None and not screen(data):
+                    return None
+    except (OSError, ValueError):
+        return None
+    try:
+        return _translate_newlines(data.decode("utf-8"))
+    except UnicodeDecodeError:
+        return None
+
+
+# Files a ScanCache keeps before dropping the oldest: above any one vault,
+# so a full scan still hits, but bounded when many roots are scanned
+SCAN_CACHE_MAX_ENTRIES = 100_000
+
+
+class ScanCache(Generic[R]):
+    """
+    Parsed results per file, kept until its (st_mtime_ns, st_size) changes.
+
+    Vault-wide scans fill one from worker threads while other requests
+    prune it, so every access to the dict holds a lock. Files are read and
+    parsed outside the lock.
+    """
+
+    def __init__(self, max_entries: int = SCAN_CACHE_MAX_ENTRIES) -> None:
+        self._entries: dict[str, tuple[tuple[int, int], R]] = {}
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: str, st: os.stat_result, load: Callable[[], R | None]) -> R | None:
+        """
+        Return the result cached for path, or load() if the file changed.
+
+        A None from load is returned without being cached, for files a
+        screen ruled out without parsing them.
+        """
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._entries.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        result = load()
+        if result is None:
+            return None
+        with self._lock:
+            self._entries.pop(path, None)
+            if len(self._entries) >= self._max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._entries[path] = (stamp, result)
+        return result
+
+    def prune(self, root: str, seen: set[str]) -> None:
+        """Drop cached files under root that a full walk of root no longer found."""
+        prefix = root.rstrip(os.sep) + os.sep
+        with self._lock:
+            gone = [p for p in self._entries if p.startswith(prefix) and p not in seen]
+            for path in gone:
+                del self._entries[path]
+
+    def clear(self) -> None:
+        """Forget all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+
+def scan_markdown(
+    path: Path,
+    base: Path,
+    parse: Callable[[str], R],
+    cache: ScanCache[R],
+    screen: Screen | None = None,
+) -> Iterator[tuple[str, R]]:
+    """
+    Yield (rel, parse(content)) for each note iter_markdown(path, base) finds.
+
+    Results are kept in cache keyed on each note's (st_mtime_ns, st_size),
+    so a repeat scan of an unchanged vault only stats notes instead of
+    reading and parsing them. Misses are read on a thread pool, in walk
+    order, so callers can format results on the main thread while later
+    reads are in flight.
+
+    Notes that can't be read as UTF-8, or whose raw bytes fail screen, get
+    parse(""): screen must only reject notes parse would find nothing in.
+    Notes with a falsy result aren't yielded. A full scan of a directory
+    also drops cached notes under it that are gone.
+    """
+    empty = parse("")
+    seen: set[str] = set()
+
+    def scan(item: tuple[str, str]) -> tuple[str, R]:
+        file_path, rel = item
+        seen.add(file_path)
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return rel, empty
+
+        def load() -> R:
+            content = read_text(file_path, screen)
+            return parse(content) if content is not None else empty
+
+        return rel, cache.get(file_path, st, load)
+
+    for rel, result in thread_map(scan, iter_markdown(path, base)):
+        if result:
+            yield rel, result
+
+    if path.is_dir():
+        cache.prune(os.fspath(path), seen)
+
+
+# UTF-8 letters that re.IGNORECASE or str.lower() equate with an ASCII
+# letter, which a bytes lower() can't see: İ and ı (i), ſ (s), Kelvin K (k)
+_ASCII_FOLDS = {
+    ord("i"): (b"\xc4\xb0", b"\xc4\xb1"),
+    ord("s"): (b"\xc5\xbf",),
+    ord("k"): (b"\xe2\x84\xaa",),
+}
+
+
+def literal_screen(query: str) -> Screen | None:
+    """
+    Build a case-insensitive substring screen for an ASCII query.
+
+    Lowercasing the bytes and running find() are both C loops, several
+    times faster than an IGNORECASE regex scan. Queries without letters
+    skip the lowercase copy, and even work on an mmap directly.
+    Non-ASCII queries return None, which means no screening.
+
+    The screen may pass files that don't match, never the reverse: files
+    with a non-ASCII letter that folds to one of the query's letters
+    always pass.
+    """
+    if not query.isascii():
+        return None
+    needle = query.lower().encode("ascii")
+    if needle == query.upper().encode("ascii"):
+        return lambda data: data.find(needle) >= 0
+
+    folds = [seq for byte in set(needle) for seq in _ASCII_FOLDS.get(byte, ())]
+    if folds:
+        return lambda data: needle in bytes(data).lower() or any(
+            data.find(seq) >= 0 for seq in folds
+        )
+    return lambda data: needle in bytes(data).lower()